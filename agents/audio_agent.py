@@ -1,23 +1,28 @@
 import os
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
-from agno.tools.mcp import MCPTools
+from config.jobs import media_jobs
+from config.mcp import MCPTools
 
 # Import shared config
 from config.database import db
 from config.knowledge import knowledge
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import DEFAULT_MODEL
+from config.session_summaries import IncrementalSessionSummaryManager
+from config.user_memories import BatchedMemoryManager
 
 audio_agent = Agent(
     name="Audio Specialist",
     role="Generate and process audio for social media content",
-    model=OpenRouter(
-        id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(
+        id=DEFAULT_MODEL,
         api_key=os.getenv("OPENROUTER_API_KEY")
     ),
     tools=[
         MCPTools(
             transport="streamable-http",
             url=os.getenv("OUINHI_MCP_URL", "https://mcp.etugrand.com/mcp"),
+            job_tracker=media_jobs,  # job tools wait briefly for their job, then hand back its id
             include_tools=[
                 "create_speech_job_api_v1_audio_speech_post",
                 "transcribe_audio_api_pollinations_audio_transcribe_post",
@@ -33,7 +38,9 @@ audio_agent = Agent(
     db=db,
     knowledge=knowledge,
     enable_user_memories=True,
+    memory_manager=BatchedMemoryManager(),
     enable_session_summaries=True,
+    session_summary_manager=IncrementalSessionSummaryManager(),
     add_history_to_context=True,
     num_history_runs=3,
     add_datetime_to_context=True,
@@ -45,8 +52,9 @@ audio_agent = Agent(
     3. Transcribe audio files for content analysis
     4. Optimize audio for different social media platforms
     5. Handle asynchronous audio generation jobs properly:
-       - When using create_speech_job_api_v1_audio_speech_post, create the job and immediately check status
-       - Return the status check response directly to the user (contains URL and completion status)
+       - create_speech_job_api_v1_audio_speech_post waits for the job and returns its final status - do not poll check_job_status
+       - Only use check_job_status for a job a tool reported as still running
+       - Return the final job status directly to the user (contains URL and completion status)
        - DO NOT ask users to manually check status or download - just return the API response
        - The status response typically contains the download URL when complete
     6. Use OUINHI Pollinations MCP for:
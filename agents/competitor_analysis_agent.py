@@ -22,19 +22,20 @@ Example queries to try:
 Dependencies: `pip install openai firecrawl-py agno`
 """
 
-import os
 from textwrap import dedent
 
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
-from agno.tools.firecrawl import FirecrawlTools
 from agno.tools.reasoning import ReasoningTools
 
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import DEFAULT_MODEL
+from tools.article_tools import CachedFirecrawlTools
+
 competitor_analysis_agent = Agent(
     name="Competitor Analysis Agent",
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
+    model=ScheduledOpenRouter(id=DEFAULT_MODEL),
     tools=[
-        FirecrawlTools(
+        CachedFirecrawlTools(
             enable_search=True,
             enable_crawl=True,
             enable_mapping=True,
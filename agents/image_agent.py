@@ -1,23 +1,28 @@
 import os
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
-from agno.tools.mcp import MCPTools
+from config.jobs import media_jobs
+from config.mcp import MCPTools
 
 # Import shared config
 from config.database import db
 from config.knowledge import knowledge
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import DEFAULT_MODEL
+from config.session_summaries import IncrementalSessionSummaryManager
+from config.user_memories import BatchedMemoryManager
 
 image_agent = Agent(
     name="Image Specialist",
     role="Generate and process images for social media content",
-    model=OpenRouter(
-        id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(
+        id=DEFAULT_MODEL,
         api_key=os.getenv("OPENROUTER_API_KEY")
     ),
     tools=[
         MCPTools(
             transport="streamable-http",
             url=os.getenv("OUINHI_MCP_URL", "https://mcp.etugrand.com/mcp"),
+            job_tracker=media_jobs,  # job tools wait briefly for their job, then hand back its id
             include_tools=[
                 "generate_image_api_v1_images_generate_post",
                 "generate_image_api_pollinations_image_generate_post",
@@ -35,7 +40,9 @@ image_agent = Agent(
     db=db,
     knowledge=knowledge,
     enable_user_memories=True,
+    memory_manager=BatchedMemoryManager(),
     enable_session_summaries=True,
+    session_summary_manager=IncrementalSessionSummaryManager(),
     add_history_to_context=True,
     num_history_runs=3,
     add_datetime_to_context=True,
@@ -47,8 +54,8 @@ image_agent = Agent(
     3. Process and optimize images for different social media platforms
     4. Ensure images meet platform requirements (dimensions, file size, etc.)
     5. Handle asynchronous image generation jobs properly when applicable:
-       - When using async image generation, ALWAYS check job status until completion
-       - Use available tools to monitor job progress and retrieve final results
+       - Image job tools wait for the job and return its final result - do not poll check_job_status
+       - Only use check_job_status for a job a tool reported as still running
        - NEVER ask users to manually check status or download results
        - Return the final image file or URL directly to the user
     6. Use OUINHI Pollinations MCP for:
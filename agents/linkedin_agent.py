@@ -1,17 +1,20 @@
 import os
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
-from agno.tools.mcp import MCPTools
+from config.mcp import MCPTools
 
 # Import shared config
 from config.database import db
 from config.knowledge import knowledge
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import DEFAULT_MODEL
+from config.session_summaries import IncrementalSessionSummaryManager
+from config.user_memories import BatchedMemoryManager
 
 linkedin_agent = Agent(
     name="LinkedIn Manager",
     role="Manage LinkedIn professional content",
-    model=OpenRouter(
-        id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(
+        id=DEFAULT_MODEL,
         api_key=os.getenv("OPENROUTER_API_KEY")
     ),
     tools=[
@@ -23,7 +26,9 @@ linkedin_agent = Agent(
     db=db,
     knowledge=knowledge,
     enable_user_memories=True,
+    memory_manager=BatchedMemoryManager(),
     enable_session_summaries=True,
+    session_summary_manager=IncrementalSessionSummaryManager(),
     add_history_to_context=True,
     num_history_runs=3,
     add_datetime_to_context=True,
@@ -2,15 +2,16 @@
 pip install openai exa-py agno firecrawl
 """
 
-import os
 from datetime import datetime, timedelta
 from textwrap import dedent
 
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
 from agno.tools.exa import ExaTools
 from agno.tools.firecrawl import FirecrawlTools
 
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import DEFAULT_MODEL
+
 
 def calculate_start_date(days: int) -> str:
     """Calculate start date based on number of days."""
@@ -20,7 +21,7 @@ def calculate_start_date(days: int) -> str:
 
 agent = Agent(
     name="Media Trend Analysis Agent",
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
+    model=ScheduledOpenRouter(id=DEFAULT_MODEL),
     tools=[
         ExaTools(start_published_date=calculate_start_date(30), type="keyword"),
         FirecrawlTools(enable_scrape=True),
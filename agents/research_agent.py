@@ -24,14 +24,17 @@ from datetime import datetime
 from textwrap import dedent
 
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
 from agno.tools.duckduckgo import DuckDuckGoTools
 from agno.tools.exa import ExaTools
-from agno.tools.mcp import MCPTools
+from config.mcp import MCPTools
+from config.models import DEFAULT_MODEL
+from config.response_cache import CachedOpenRouter
 
 # Import shared config
 from config.database import db
 from config.knowledge import knowledge
+from config.session_summaries import IncrementalSessionSummaryManager
+from config.user_memories import BatchedMemoryManager
 
 # Multi-server MCP configuration disabled due to missing external MCP servers
 multi_mcp = None
@@ -39,8 +42,8 @@ multi_mcp = None
 research_agent = Agent(
     name="Research Agent",
     role="Complete research analyst combining market intelligence and academic research",
-    model=OpenRouter(
-        id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1"),
+    model=CachedOpenRouter(
+        id=DEFAULT_MODEL,
         api_key=os.getenv("OPENROUTER_API_KEY")
     ),
     tools=[
@@ -66,7 +69,9 @@ research_agent = Agent(
     db=db,
     knowledge=knowledge,
     enable_user_memories=True,
+    memory_manager=BatchedMemoryManager(),
     enable_session_summaries=True,
+    session_summary_manager=IncrementalSessionSummaryManager(),
     add_history_to_context=True,
     num_history_runs=3,
     add_datetime_to_context=True,
@@ -47,17 +47,33 @@ analysis and research. Use the insights to refine your concept and business plan
 
 import asyncio
 import os
-from typing import Any
+import time
+from typing import Any, Awaitable, Dict, Optional, Tuple, TypeVar
+from uuid import uuid4
 
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-from agno.models.openrouter import OpenRouter
 from agno.tools.googlesearch import GoogleSearchTools
 from agno.utils.pprint import pprint_run_response
 from agno.workflow.types import WorkflowExecutionInput
 from agno.workflow.workflow import Workflow
 from pydantic import BaseModel, Field
 
+from config.checkpoints import CheckpointStore
+from config.database import db
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import DEFAULT_MODEL
+from config.prompt_budget import PHASE_FIELD_TOKEN_BUDGET, compact_text, log_prompt_size
+from config.response_cache import CachedOpenRouter
+
+# Start competitor discovery from the raw idea while the idea is clarified and the
+# market researched, instead of after market research
+STARTUP_PARALLEL_RESEARCH = os.getenv("STARTUP_PARALLEL_RESEARCH", "true").lower() == "true"
+
+T = TypeVar("T")
+
+# Phase outputs of each run, so a failed run can be resumed from its last good phase
+checkpoints = CheckpointStore(workflow="startup_validation")
+
 
 # --- Response models ---
 class IdeaClarification(BaseModel):
@@ -79,6 +95,15 @@ class MarketResearch(BaseModel):
     target_customer_segments: str = Field(..., description="Target customer segments.")
 
 
+class CompetitorDiscovery(BaseModel):
+    competitors: str = Field(
+        ..., description="Candidate competitors, each with a one-line description and website."
+    )
+    search_notes: str = Field(
+        ..., description="Facts found about their pricing, positioning and market share."
+    )
+
+
 class CompetitorAnalysis(BaseModel):
     competitors: str = Field(..., description="List of identified competitors.")
     swot_analysis: str = Field(..., description="SWOT analysis for each competitor.")
@@ -103,7 +128,8 @@ class ValidationReport(BaseModel):
 # --- Agents ---
 idea_clarifier_agent = Agent(
     name="Idea Clarifier",
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
+    # Exact-match cache only: a similar idea still needs its own clarification
+    model=CachedOpenRouter(id=DEFAULT_MODEL),
     instructions=[
         "Given a user's startup idea, your goal is to refine that idea.",
         "Evaluate the originality of the idea by comparing it with existing concepts.",
@@ -118,7 +144,7 @@ idea_clarifier_agent = Agent(
 
 market_research_agent = Agent(
     name="Market Research Agent",
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
+    model=CachedOpenRouter(id=DEFAULT_MODEL),
     tools=[GoogleSearchTools()],
     instructions=[
         "You are provided with a startup idea and the company's mission and objectives.",
@@ -134,7 +160,7 @@ market_research_agent = Agent(
 
 competitor_analysis_agent = Agent(
     name="Competitor Analysis Agent",
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
+    model=ScheduledOpenRouter(id=DEFAULT_MODEL),
     tools=[GoogleSearchTools()],
     instructions=[
         "You are provided with a startup idea and market research data.",
@@ -149,9 +175,25 @@ competitor_analysis_agent = Agent(
     debug_mode=False,
 )
 
+competitor_discovery_agent = Agent(
+    name="Competitor Discovery Agent",
+    model=ScheduledOpenRouter(id=DEFAULT_MODEL),
+    tools=[GoogleSearchTools()],
+    instructions=[
+        "You are provided with a raw startup idea.",
+        "Search the web for existing products and companies solving the same problem.",
+        "Include direct competitors and the closest indirect alternatives.",
+        "Note pricing, positioning and market share wherever you find them.",
+        "Do not analyze the market or write a SWOT; only collect candidates and facts.",
+    ],
+    add_datetime_to_context=True,
+    output_schema=CompetitorDiscovery,
+    debug_mode=False,
+)
+
 report_agent = Agent(
     name="Report Generator",
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
+    model=ScheduledOpenRouter(id=DEFAULT_MODEL),
     instructions=[
         "You are provided with comprehensive data about a startup idea including clarification, market research, and competitor analysis.",
         "Synthesize all information into a comprehensive validation report.",
@@ -166,25 +208,127 @@ report_agent = Agent(
 )
 
 
+# --- Phase timing ---
+class PhaseTimings:
+    """Start offset and duration of each phase, relative to the start of the run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, Tuple[float, float]] = {}
+
+    async def track(self, name: str, awaitable: Awaitable[T]) -> T:
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.phases[name] = (start - self.started, time.perf_counter() - start)
+
+    def summary(self) -> str:
+        total = time.perf_counter() - self.started
+        sequential = sum(duration for _, duration in self.phases.values())
+        lines = [
+            f"    • {name}: starts at {offset:.1f}s, takes {duration:.1f}s"
+            for name, (offset, duration) in self.phases.items()
+        ]
+        lines.append(f"    • Total: {total:.1f}s (phases add up to {sequential:.1f}s)")
+        return "\n".join(lines)
+
+
 # --- Execution function ---
+def _brief(text: str, idea: str) -> str:
+    """An earlier phase's output, cut to its parts most relevant to the idea"""
+    return compact_text(text, idea, PHASE_FIELD_TOKEN_BUDGET)
+
+
+def _checkpoint(run_id: str, phase: str, value: BaseModel) -> None:
+    if isinstance(value, BaseModel):
+        checkpoints.save(run_id, phase, value)
+
+
+async def discover_competitors(run_id: str, idea: str) -> Optional[CompetitorDiscovery]:
+    """Search for competitors from the raw idea alone, so it can overlap the earlier phases"""
+    prompt = f"""
+    Find existing competitors for this startup idea:
+    STARTUP IDEA: {idea}
+    Use web search to find direct competitors and the closest indirect alternatives.
+    """
+    log_prompt_size("Competitor discovery", prompt)
+    result = await competitor_discovery_agent.arun(prompt)
+    if not isinstance(result.content, CompetitorDiscovery):
+        return None
+    _checkpoint(run_id, "competitor_discovery", result.content)
+    return result.content
+
+
 async def startup_validation_execution(
     workflow: Workflow,
     execution_input: WorkflowExecutionInput,
-    startup_idea: str,
+    startup_idea: Optional[str] = None,
+    parallel_research: bool = STARTUP_PARALLEL_RESEARCH,
+    resume_run_id: Optional[str] = None,
     **kwargs: Any,
 ) -> str:
-    """Execute the complete startup idea validation workflow"""
+    """Execute the complete startup idea validation workflow
+
+    With `parallel_research`, competitor discovery starts from the raw idea together with
+    idea clarification, and the competitor analysis phase reconciles its findings with the
+    market research instead of searching from scratch.
+
+    Every phase output is checkpointed under a run id, which a failed run reports. With
+    `resume_run_id`, the inputs and completed phases of that run are loaded and only the
+    remaining phases run.
+    """
+
+    # AgentOS passes extra form fields through as strings ("false" would be truthy)
+    parallel_research = str(parallel_research).lower() == "true"
 
     # Get inputs
     message: str = execution_input.input
     idea: str = startup_idea
+    run_id: str = resume_run_id or str(uuid4())
+
+    saved_input = checkpoints.load(resume_run_id, "input")
+    if saved_input is not None:
+        message, idea = saved_input["message"], saved_input["startup_idea"]
+        print(f"♻️ Resuming run {resume_run_id} after: {', '.join(checkpoints.phases(resume_run_id))}")
 
     if not idea:
         return "❌ No startup idea provided"
 
+    if saved_input is None:
+        checkpoints.prune()
+        checkpoints.save(run_id, "input", {"message": message, "startup_idea": idea})
+
     print(f"🚀 Starting startup idea validation for: {idea}")
     print(f"💡 Validation request: {message}")
 
+    timings = PhaseTimings()
+    discovery: Optional[asyncio.Task] = None
+    completed = set(checkpoints.phases(run_id))
+    if parallel_research and not {"competitor_discovery", "competitor_analysis"} & completed:
+        print("🔎 Starting competitor discovery in the background...")
+        discovery = asyncio.create_task(
+            timings.track("Competitor discovery", discover_competitors(run_id, idea))
+        )
+
+    try:
+        result = await _validate(run_id, message, idea, timings, discovery)
+        if result.startswith("❌"):
+            result += f"\n\n♻️ Completed phases were saved. Retry with resume_run_id={run_id} to continue from here."
+        return result
+    finally:
+        if discovery is not None and not discovery.done():
+            discovery.cancel()
+
+
+async def _validate(
+    run_id: str,
+    message: str,
+    idea: str,
+    timings: PhaseTimings,
+    discovery: Optional[asyncio.Task],
+) -> str:
+    """Run the four validation phases, reconciling with `discovery` when it was started"""
     # Phase 1: Idea Clarification
     print("\n🎯 PHASE 1: IDEA CLARIFICATION & REFINEMENT")
     print("=" * 60)
@@ -203,17 +347,25 @@ async def startup_validation_execution(
     Provide insights on how to strengthen and focus the core concept.
     """
 
-    print("🔍 Analyzing and refining the startup concept...")
+    idea_clarification = checkpoints.load(run_id, "idea_clarification", IdeaClarification)
+    if idea_clarification is not None:
+        print("♻️ Reusing the idea clarification of the previous attempt")
+    else:
+        print("🔍 Analyzing and refining the startup concept...")
+        log_prompt_size("Idea clarification", clarification_prompt)
 
-    try:
-        clarification_result = await idea_clarifier_agent.arun(clarification_prompt)
-        idea_clarification = clarification_result.content
+        try:
+            clarification_result = await timings.track(
+                "Idea clarification", idea_clarifier_agent.arun(clarification_prompt)
+            )
+            idea_clarification = clarification_result.content
 
-        print("✅ Idea clarification completed")
-        print(f"📝 Mission: {idea_clarification.mission[:100]}...")
+            print("✅ Idea clarification completed")
+            print(f"📝 Mission: {idea_clarification.mission[:100]}...")
+            _checkpoint(run_id, "idea_clarification", idea_clarification)
 
-    except Exception as e:
-        return f"❌ Failed to clarify idea: {str(e)}"
+        except Exception as e:
+            return f"❌ Failed to clarify idea: {str(e)}"
 
     # Phase 2: Market Research
     print("\n📊 PHASE 2: MARKET RESEARCH & ANALYSIS")
@@ -222,9 +374,9 @@ async def startup_validation_execution(
     market_research_prompt = f"""
     Based on the refined startup idea and clarification below, conduct comprehensive market research:
     STARTUP IDEA: {idea}
-    ORIGINALITY: {idea_clarification.originality}
-    MISSION: {idea_clarification.mission}
-    OBJECTIVES: {idea_clarification.objectives}
+    ORIGINALITY: {_brief(idea_clarification.originality, idea)}
+    MISSION: {_brief(idea_clarification.mission, idea)}
+    OBJECTIVES: {_brief(idea_clarification.objectives, idea)}
     Please research and provide:
     1. Total Addressable Market (TAM) - overall market size
     2. Serviceable Available Market (SAM) - portion you could serve
@@ -233,17 +385,25 @@ async def startup_validation_execution(
     Use web search to find current market data and trends.
     """
 
-    print("📈 Researching market size and customer segments...")
+    market_research = checkpoints.load(run_id, "market_research", MarketResearch)
+    if market_research is not None:
+        print("♻️ Reusing the market research of the previous attempt")
+    else:
+        print("📈 Researching market size and customer segments...")
+        log_prompt_size("Market research", market_research_prompt)
 
-    try:
-        market_result = await market_research_agent.arun(market_research_prompt)
-        market_research = market_result.content
+        try:
+            market_result = await timings.track(
+                "Market research", market_research_agent.arun(market_research_prompt)
+            )
+            market_research = market_result.content
 
-        print("✅ Market research completed")
-        print(f"🎯 TAM: {market_research.total_addressable_market[:100]}...")
+            print("✅ Market research completed")
+            print(f"🎯 TAM: {market_research.total_addressable_market[:100]}...")
+            _checkpoint(run_id, "market_research", market_research)
 
-    except Exception as e:
-        return f"❌ Failed to complete market research: {str(e)}"
+        except Exception as e:
+            return f"❌ Failed to complete market research: {str(e)}"
 
     # Phase 3: Competitor Analysis
     print("\n🏢 PHASE 3: COMPETITIVE LANDSCAPE ANALYSIS")
@@ -252,10 +412,10 @@ async def startup_validation_execution(
     competitor_prompt = f"""
     Based on the startup idea and market research below, analyze the competitive landscape:
     STARTUP IDEA: {idea}
-    TAM: {market_research.total_addressable_market}
-    SAM: {market_research.serviceable_available_market}
-    SOM: {market_research.serviceable_obtainable_market}
-    TARGET SEGMENTS: {market_research.target_customer_segments}
+    TAM: {_brief(market_research.total_addressable_market, idea)}
+    SAM: {_brief(market_research.serviceable_available_market, idea)}
+    SOM: {_brief(market_research.serviceable_obtainable_market, idea)}
+    TARGET SEGMENTS: {_brief(market_research.target_customer_segments, idea)}
     Please research and provide:
     1. Identify direct and indirect competitors
     2. SWOT analysis for each major competitor
@@ -264,17 +424,43 @@ async def startup_validation_execution(
     Use web search to find current competitor information.
     """
 
-    print("🔎 Analyzing competitive landscape...")
+    competitor_analysis = checkpoints.load(run_id, "competitor_analysis", CompetitorAnalysis)
+    discovered = checkpoints.load(run_id, "competitor_discovery", CompetitorDiscovery)
+    if discovery is not None:
+        try:
+            discovered = await discovery
+        except Exception as e:
+            print(f"⚠️ Competitor discovery failed, analyzing from scratch: {str(e)}")
+
+    if competitor_analysis is not None:
+        print("♻️ Reusing the competitor analysis of the previous attempt")
+    elif discovered is not None:
+        competitor_prompt += f"""
+    CANDIDATE COMPETITORS (found by an earlier search from the raw idea):
+    {_brief(discovered.competitors, idea)}
+    FACTS FOUND SO FAR:
+    {_brief(discovered.search_notes, idea)}
+    Reconcile these candidates with the market research: drop the ones that do not serve the
+    target segments and add any that are missing. Only search for information you still need.
+    """
+        print("🔎 Reconciling discovered competitors with the market research...")
+    else:
+        print("🔎 Analyzing competitive landscape...")
 
-    try:
-        competitor_result = await competitor_analysis_agent.arun(competitor_prompt)
-        competitor_analysis = competitor_result.content
+    if competitor_analysis is None:
+        log_prompt_size("Competitor analysis", competitor_prompt)
+        try:
+            competitor_result = await timings.track(
+                "Competitor analysis", competitor_analysis_agent.arun(competitor_prompt)
+            )
+            competitor_analysis = competitor_result.content
 
-        print("✅ Competitor analysis completed")
-        print(f"🏆 Positioning: {competitor_analysis.positioning[:100]}...")
+            print("✅ Competitor analysis completed")
+            print(f"🏆 Positioning: {competitor_analysis.positioning[:100]}...")
+            _checkpoint(run_id, "competitor_analysis", competitor_analysis)
 
-    except Exception as e:
-        return f"❌ Failed to complete competitor analysis: {str(e)}"
+        except Exception as e:
+            return f"❌ Failed to complete competitor analysis: {str(e)}"
 
     # Phase 4: Final Validation Report
     print("\n📋 PHASE 4: COMPREHENSIVE VALIDATION REPORT")
@@ -286,18 +472,18 @@ async def startup_validation_execution(
     STARTUP IDEA: {idea}
 
     IDEA CLARIFICATION:
-    - Originality: {idea_clarification.originality}
-    - Mission: {idea_clarification.mission}
-    - Objectives: {idea_clarification.objectives}
+    - Originality: {_brief(idea_clarification.originality, idea)}
+    - Mission: {_brief(idea_clarification.mission, idea)}
+    - Objectives: {_brief(idea_clarification.objectives, idea)}
     MARKET RESEARCH:
-    - TAM: {market_research.total_addressable_market}
-    - SAM: {market_research.serviceable_available_market}
-    - SOM: {market_research.serviceable_obtainable_market}
-    - Target Segments: {market_research.target_customer_segments}
+    - TAM: {_brief(market_research.total_addressable_market, idea)}
+    - SAM: {_brief(market_research.serviceable_available_market, idea)}
+    - SOM: {_brief(market_research.serviceable_obtainable_market, idea)}
+    - Target Segments: {_brief(market_research.target_customer_segments, idea)}
     COMPETITOR ANALYSIS:
-    - Competitors: {competitor_analysis.competitors}
-    - SWOT: {competitor_analysis.swot_analysis}
-    - Positioning: {competitor_analysis.positioning}
+    - Competitors: {_brief(competitor_analysis.competitors, idea)}
+    - SWOT: {_brief(competitor_analysis.swot_analysis, idea)}
+    - Positioning: {_brief(competitor_analysis.positioning, idea)}
     Create a professional validation report with:
     1. Executive summary
     2. Idea assessment (strengths/weaknesses)
@@ -307,16 +493,22 @@ async def startup_validation_execution(
     6. Specific next steps for the entrepreneur
     """
 
-    print("📝 Generating comprehensive validation report...")
+    validation_report = checkpoints.load(run_id, "validation_report", ValidationReport)
+    if validation_report is not None:
+        print("♻️ Reusing the validation report of the previous attempt")
+    else:
+        print("📝 Generating comprehensive validation report...")
+        log_prompt_size("Validation report", report_prompt)
 
-    try:
-        final_result = await report_agent.arun(report_prompt)
-        validation_report = final_result.content
+        try:
+            final_result = await timings.track("Validation report", report_agent.arun(report_prompt))
+            validation_report = final_result.content
 
-        print("✅ Validation report completed")
+            print("✅ Validation report completed")
+            _checkpoint(run_id, "validation_report", validation_report)
 
-    except Exception as e:
-        return f"❌ Failed to generate final report: {str(e)}"
+        except Exception as e:
+            return f"❌ Failed to generate final report: {str(e)}"
 
     # Final summary
     summary = f"""
@@ -355,6 +547,9 @@ async def startup_validation_execution(
     ## Next Steps
     {validation_report.next_steps}
 
+    ⏱️ Phase Timings:
+{timings.summary()}
+
     ⚠️ Disclaimer: This validation is for informational purposes only. Conduct additional due diligence before making investment decisions.
     """
 
@@ -365,15 +560,22 @@ async def startup_validation_execution(
 startup_validation_workflow = Workflow(
     name="Startup Idea Validator",
     description="Comprehensive startup idea validation with market research and competitive analysis",
-    db=SqliteDb(
-        session_table="workflow_session",
-        db_file="tmp/workflows.db",
-    ),
+    db=db,
     steps=startup_validation_execution,
     session_state={},  # Initialize empty workflow session state
 )
 
 
+async def resume_startup_validation(run_id: str, **kwargs: Any):
+    """Re-run a failed validation, skipping the phases it already completed"""
+    saved_input = checkpoints.load(run_id, "input")
+    if saved_input is None:
+        raise ValueError(f"No checkpoints found for startup validation run {run_id}")
+    return await startup_validation_workflow.arun(
+        input=saved_input["message"], startup_idea=saved_input["startup_idea"], resume_run_id=run_id, **kwargs
+    )
+
+
 if __name__ == "__main__":
 
     async def main():
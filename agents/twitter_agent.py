@@ -21,19 +21,22 @@ Example prompts to try:
 
 import os
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
 from agno.tools.x import XTools
-from agno.tools.mcp import MCPTools
+from config.mcp import MCPTools
 
 # Import shared config
 from config.database import db
 from config.knowledge import knowledge
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import FAST_MODEL
+from config.session_summaries import IncrementalSessionSummaryManager
+from config.user_memories import BatchedMemoryManager
 
 twitter_agent = Agent(
     name="Twitter Agent",
     role="Complete Twitter/X content management and social media intelligence expert",
-    model=OpenRouter(
-        id=os.getenv("OPENROUTER_MODEL_NAME", "anthropic/claude-3-haiku"),
+    model=ScheduledOpenRouter(
+        id=FAST_MODEL,
         api_key=os.getenv("OPENROUTER_API_KEY")
     ),
     tools=[
@@ -49,7 +52,9 @@ twitter_agent = Agent(
     db=db,
     knowledge=knowledge,
     enable_user_memories=True,
+    memory_manager=BatchedMemoryManager(),
     enable_session_summaries=True,
+    session_summary_manager=IncrementalSessionSummaryManager(),
     add_history_to_context=True,
     num_history_runs=3,
     add_datetime_to_context=True,
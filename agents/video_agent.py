@@ -1,23 +1,28 @@
 import os
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
-from agno.tools.mcp import MCPTools
+from config.jobs import media_jobs
+from config.mcp import MCPTools
 
 # Import shared config
 from config.database import db
 from config.knowledge import knowledge
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import DEFAULT_MODEL
+from config.session_summaries import IncrementalSessionSummaryManager
+from config.user_memories import BatchedMemoryManager
 
 video_agent = Agent(
     name="Video Specialist",
     role="Generate and process videos for social media content",
-    model=OpenRouter(
-        id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(
+        id=DEFAULT_MODEL,
         api_key=os.getenv("OPENROUTER_API_KEY")
     ),
     tools=[
         MCPTools(
             transport="streamable-http",
             url=os.getenv("OUINHI_MCP_URL", "https://mcp.etugrand.com/mcp"),
+            job_tracker=media_jobs,  # job tools wait briefly for their job, then hand back its id
             include_tools=[
                 "generate_video_api_v1_videos_generate_post",
                 "generate_video_from_image_api_v1_videos_from_image_post",
@@ -40,7 +45,9 @@ video_agent = Agent(
     db=db,
     knowledge=knowledge,
     enable_user_memories=True,
+    memory_manager=BatchedMemoryManager(),
     enable_session_summaries=True,
+    session_summary_manager=IncrementalSessionSummaryManager(),
     add_history_to_context=True,
     num_history_runs=3,
     add_datetime_to_context=True,
@@ -52,8 +59,9 @@ video_agent = Agent(
     3. Generate video scripts from topics using AI
     4. Optimize videos for different social media platforms
     5. Handle asynchronous video generation jobs properly:
-       - When using video generation tools, create the job and immediately check status
-       - Return the status check response directly to the user (contains URL and completion status)
+       - Video job tools wait for the job and return its final status - do not poll check_job_status
+       - Only use check_job_status for a job a tool reported as still running
+       - Return the final job status directly to the user (contains URL and completion status)
        - DO NOT ask users to manually check status or download - just return the API response
        - The status response typically contains the download URL when complete
     6. Use OUINHI Pollinations MCP for:
@@ -1,12 +1,13 @@
-import os
 from textwrap import dedent
 from typing import Dict, List, Optional
 
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
-from agno.tools.firecrawl import FirecrawlTools
 from pydantic import BaseModel, Field
 
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import DEFAULT_MODEL
+from tools.article_tools import CachedFirecrawlTools
+
 
 class ContentSection(BaseModel):
     """Represents a section of content from the webpage."""
@@ -39,8 +40,8 @@ class PageInformation(BaseModel):
 
 
 agent = Agent(
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
-    tools=[FirecrawlTools(enable_scrape=True, enable_crawl=True)],
+    model=ScheduledOpenRouter(id=DEFAULT_MODEL),
+    tools=[CachedFirecrawlTools(enable_scrape=True, enable_crawl=True)],
     instructions=dedent("""
         You are an expert web researcher and content extractor. Extract comprehensive, structured information
         from the provided webpage. Focus on:
@@ -0,0 +1,142 @@
+"""
+Article scraping throughput of the blog generator: direct Newspaper4k extraction vs the scraper agent.
+
+Serves generated news articles from a local HTTP server (with an artificial
+response delay standing in for the network) and scrapes them through
+`workflow.blog_post_generator.scrape_articles`, once with direct extraction
+and once through the content scraper agent.
+
+Without --live the agent is stubbed: it extracts the page the same way and
+then sleeps --llm-latency seconds for the model round-trips, so no API key is
+needed. With --live the real agent is called (needs OPENROUTER_API_KEY).
+
+Run from the repository root:
+    python benchmarks/article_extraction_report.py --articles 40 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SENTENCES = [
+    "The company said that its revenue grew faster than analysts had expected in the last quarter.",
+    "Many of the customers who tried the new product were asked to share their feedback with the team.",
+    "According to the report, the market for these tools is still small but it is growing every year.",
+    "Some of the largest competitors have cut their prices, which has put pressure on smaller firms.",
+    "Researchers who studied the data found that adoption was highest among teams with fewer than ten people.",
+    "It is not yet clear whether the trend will continue once the supply problems have been resolved.",
+    "The chief executive told reporters that the business would keep investing in research and hiring.",
+    "Industry observers expect that demand will remain strong for at least the next two years.",
+]
+
+
+def make_article(index: int, paragraphs: int = 12) -> bytes:
+    rng = random.Random(index)
+    body = "".join(
+        "<p>" + " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 6))) + "</p>"
+        for _ in range(paragraphs)
+    )
+    return (
+        f"<html><head><title>Industry report {index}</title></head><body>"
+        f"<nav><a href='/'>Home</a> <a href='/news'>News</a></nav>"
+        f"<article><h1>Industry report {index}</h1>{body}</article>"
+        f"<footer>Copyright Example News</footer></body></html>"
+    ).encode()
+
+
+def serve(delay: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            page = make_article(int(self.path.strip("/").split("-")[-1] or 0))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(blog, mode: str, search_results, concurrency: int) -> tuple:
+    from config.article_store import ArticleStore
+
+    blog.SCRAPE_DIRECT_EXTRACTION = mode == "direct"
+    # A fresh article store per mode, so neither run reuses pages fetched by the other
+    blog.article_store = ArticleStore(db_file=str(Path(tempfile.mkdtemp()) / "articles.db"))
+    start = time.perf_counter()
+    # The workflow reports progress on stdout; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        scraped = await blog.scrape_articles(
+            f"bench-{mode}", search_results, use_cache=False, concurrency=concurrency
+        )
+    return len(scraped), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4, help="Articles scraped at once")
+    parser.add_argument("--fetch-delay", type=float, default=0.2, help="Seconds the server waits per page")
+    parser.add_argument("--llm-latency", type=float, default=6.0, help="Seconds per stubbed scraper agent run")
+    parser.add_argument("--live", action="store_true", help="Call the real scraper agent")
+    args = parser.parse_args()
+
+    if not args.live:
+        os.environ.setdefault("OPENROUTER_API_KEY", "benchmark-stub")
+    import workflow.blog_post_generator as blog
+
+    blog.logger.setLevel(logging.WARNING)
+
+    if not args.live:
+
+        async def stub_agent(url: str):
+            loop = asyncio.get_running_loop()
+            article = blog.NewsArticle(title=url, url=url, summary=None)
+            scraped = await loop.run_in_executor(blog._extraction_pool, blog.extract_article, article)
+            await asyncio.sleep(args.llm_latency)
+            return SimpleNamespace(content=scraped)
+
+        blog.content_scraper_agent.arun = stub_agent
+
+    server = serve(args.fetch_delay)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    search_results = blog.SearchResults(
+        articles=[
+            blog.NewsArticle(title=f"Industry report {i}", url=f"{base}/report-{i}", summary=None)
+            for i in range(args.articles)
+        ]
+    )
+
+    print(f"{'mode':<8}{'scraped':>10}{'seconds':>10}{'articles/s':>12}")
+    results = {}
+    for mode in ("direct", "agent"):
+        scraped, seconds = asyncio.run(run(blog, mode, search_results, args.concurrency))
+        results[mode] = scraped / seconds
+        print(f"{mode:<8}{scraped:>10}{seconds:>10.2f}{results[mode]:>12.2f}")
+    server.shutdown()
+
+    label = "live agent" if args.live else f"stubbed agent at {args.llm_latency:.1f}s per article"
+    print(f"\nDirect extraction: {results['direct'] / results['agent']:.1f}x the throughput of the {label}")
+
+
+if __name__ == "__main__":
+    main()
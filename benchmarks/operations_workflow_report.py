@@ -0,0 +1,84 @@
+"""
+End-to-end latency of the operations workflow: sequential steps vs the dependency DAG.
+
+Every agent is replaced by a stub step that sleeps for a fixed time (standing
+in for the model round-trips and MCP calls of that agent) and echoes its
+input, so the report measures orchestration only and needs no API keys.
+The step names and dependencies mirror workflow/operations_workflow.py.
+
+Run from the repository root:
+    python benchmarks/operations_workflow_report.py --runs 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.workflow.step import Step  # noqa: E402
+from agno.workflow.types import StepInput, StepOutput  # noqa: E402
+from agno.workflow.workflow import Workflow  # noqa: E402
+
+from workflow.dag import dag_steps  # noqa: E402
+
+# Seconds each stubbed agent takes; media generation dominates, as it does in production
+LATENCIES = {
+    "research_topic": 1.0,
+    "create_text_content": 1.0,
+    "generate_images": 2.0,
+    "generate_videos": 3.0,
+    "generate_audio": 1.5,
+    "publish_content": 1.0,
+}
+
+DEPENDS_ON = {
+    "create_text_content": ["research_topic"],
+    "generate_images": ["create_text_content"],
+    "generate_videos": ["create_text_content"],
+    "generate_audio": ["create_text_content"],
+    "publish_content": ["create_text_content", "generate_images", "generate_videos", "generate_audio"],
+}
+
+
+def stub_step(name: str, scale: float) -> Step:
+    async def run(step_input: StepInput) -> StepOutput:
+        await asyncio.sleep(LATENCIES[name] * scale)
+        return StepOutput(content=f"{name} output (input: {len(str(step_input.previous_step_content or ''))} chars)")
+
+    return Step(name=name, executor=run)
+
+
+def build(mode: str, scale: float) -> Workflow:
+    steps = [stub_step(name, scale) for name in LATENCIES]
+    if mode == "dag":
+        steps = dag_steps(steps, DEPENDS_ON, names={"generate_images": "generate_media"})
+    return Workflow(name=f"operations-{mode}", steps=steps)
+
+
+async def sample(mode: str, scale: float) -> float:
+    workflow = build(mode, scale)
+    start = time.perf_counter()
+    await workflow.arun(input="Launch post for the spring collection")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Workflow runs per mode")
+    parser.add_argument("--scale", type=float, default=0.1, help="Multiplier for the stub latencies")
+    args = parser.parse_args()
+
+    report = {mode: statistics.median(asyncio.run(sample(mode, args.scale)) for _ in range(args.runs)) for mode in ("sequential", "dag")}
+
+    print(f"{'mode':<12}{'end-to-end (s)':>16}")
+    for mode, seconds in report.items():
+        print(f"{mode:<12}{seconds:>16.2f}")
+    print(f"\nDAG layout is {report['sequential'] / report['dag']:.2f}x faster end to end")
+
+
+if __name__ == "__main__":
+    main()
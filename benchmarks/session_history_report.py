@@ -0,0 +1,78 @@
+"""
+Per-request session storage latency against session length (config/database.py).
+
+An agent request with `add_history_to_context=True` reads its session, takes
+the messages of the last `num_history_runs` runs, appends the new run and
+writes the session back. This times that cycle on sessions that already hold
+N runs, with the default `SqliteDb` (every run in the session row) and with
+`TunedSqliteDb` (runs in an indexed per-run table, only the last
+SESSION_HOT_RUNS in the row).
+
+Run from the repository root:
+    python benchmarks/session_history_report.py --lengths 10 100 1000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.db.base import SessionType  # noqa: E402
+from agno.db.sqlite import SqliteDb  # noqa: E402
+from agno.models.message import Message  # noqa: E402
+from agno.run.agent import RunOutput  # noqa: E402
+from agno.session import AgentSession  # noqa: E402
+
+from config.database import TunedSqliteDb  # noqa: E402
+
+
+def make_run(number: int, words: int) -> RunOutput:
+    text = " ".join(["lorem"] * words)
+    return RunOutput(
+        run_id=f"run-{number}",
+        agent_id="bench",
+        session_id="bench",
+        content=text,
+        messages=[Message(role="user", content=f"question {number}"), Message(role="assistant", content=text)],
+    )
+
+
+def request(db, number: int, history_runs: int, words: int) -> float:
+    start = time.perf_counter()
+    session = db.get_session("bench", session_type=SessionType.AGENT)
+    session.get_messages_from_last_n_runs(last_n=history_runs)
+    session.runs.append(make_run(number, words))
+    db.upsert_session(session)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000], help="Runs already in the session")
+    parser.add_argument("--requests", type=int, default=20, help="Requests timed per length")
+    parser.add_argument("--history-runs", type=int, default=3, help="num_history_runs of the simulated agent")
+    parser.add_argument("--words", type=int, default=200, help="Words per assistant reply")
+    args = parser.parse_args()
+
+    backends = {"SqliteDb": SqliteDb, "TunedSqliteDb": TunedSqliteDb}
+    print(f"{'backend':<15}{'session runs':>14}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    for name, backend in backends.items():
+        for length in args.lengths:
+            with tempfile.TemporaryDirectory() as path:
+                db = backend(db_file=os.path.join(path, "bench.db"))
+                runs = [make_run(number, args.words) for number in range(length)]
+                db.upsert_session(AgentSession(session_id="bench", agent_id="bench", runs=runs, created_at=int(time.time())))
+
+                timings = [request(db, length + i, args.history_runs, args.words) for i in range(args.requests)]
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                print(f"{name:<15}{length:>14}{statistics.median(timings):>10.2f}{p95:>10.2f}")
+                db.db_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Run throughput of the agno session storage (config/database.py) under concurrency.
+
+Runs go through `Agent.arun` on one event loop, as AgentOS serves them: each
+run reads its session, adds the last `num_history_runs` runs to the context,
+waits for the model and writes the session back. agno does the session read
+and write synchronously on the loop, so their cost holds up every run in
+flight. The model is an offline stand-in that answers after --latency ms.
+Runs are spread over N concurrent sessions, in each of --workers processes
+sharing the file (uvicorn workers), against the default `SqliteDb` and
+against `TunedSqliteDb`. Runs missing from the stored sessions afterwards
+(e.g. "database is locked", which SqliteDb logs and drops) are counted.
+
+Run from the repository root:
+    python benchmarks/session_storage_report.py --sessions 1 8 32 --runs 20 --workers 1 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.agent import Agent  # noqa: E402
+from agno.db.base import SessionType  # noqa: E402
+from agno.db.sqlite import SqliteDb  # noqa: E402
+from agno.models.base import Model  # noqa: E402
+from agno.models.response import ModelResponse  # noqa: E402
+from agno.utils.log import logger  # noqa: E402
+
+from config.database import TunedSqliteDb, full_session_history  # noqa: E402
+
+
+@dataclass
+class OfflineModel(Model):
+    """Answers every prompt with a fixed reply after `latency` seconds."""
+
+    id: str = "offline"
+    name: str = "Offline"
+    provider: str = "Offline"
+    latency: float = 0.05
+    reply: str = "ok"
+
+    def invoke(self, *args, **kwargs) -> ModelResponse:
+        time.sleep(self.latency)
+        return ModelResponse(role="assistant", content=self.reply)
+
+    async def ainvoke(self, *args, **kwargs) -> ModelResponse:
+        await asyncio.sleep(self.latency)
+        return ModelResponse(role="assistant", content=self.reply)
+
+    def invoke_stream(self, *args, **kwargs):
+        yield self.invoke()
+
+    async def ainvoke_stream(self, *args, **kwargs):
+        yield await self.ainvoke()
+
+    def _parse_provider_response(self, response, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response) -> ModelResponse:
+        return response
+
+
+def build_agent(db, latency: float, words: int) -> Agent:
+    return Agent(
+        id="bench",
+        model=OfflineModel(latency=latency, reply=" ".join(["lorem"] * words)),
+        db=db,
+        add_history_to_context=True,
+        num_history_runs=3,
+        telemetry=False,
+    )
+
+
+async def run_session(agent: Agent, session_id: str, runs: int) -> None:
+    for number in range(runs):
+        await agent.arun(f"question {number}", session_id=session_id, user_id=session_id)
+
+
+BACKENDS = {"SqliteDb": SqliteDb, "TunedSqliteDb": TunedSqliteDb}
+
+
+def worker(backend: str, path: str, worker_id: int, sessions: int, runs: int, latency: float, words: int) -> tuple:
+    """One process: its own agent and sessions on the shared file. Returns (runs/s, missing runs)."""
+    # SqliteDb logs every failed write; the table reports the count instead
+    logger.disabled = True
+    db = BACKENDS[backend](db_file=path)
+    agent = build_agent(db, latency, words)
+    session_ids = [f"session-{worker_id}-{i}" for i in range(sessions)]
+
+    async def measure() -> float:
+        start = time.perf_counter()
+        await asyncio.gather(*(run_session(agent, session_id, runs) for session_id in session_ids))
+        return sessions * runs / (time.perf_counter() - start)
+
+    rate = asyncio.run(measure())
+    missing = 0
+    with full_session_history():
+        for session_id in session_ids:
+            session = db.get_session(session_id, session_type=SessionType.AGENT)
+            missing += runs - len(session.runs or []) if session else runs
+    db.db_engine.dispose()
+    return rate, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32], help="Concurrent sessions per run")
+    parser.add_argument("--runs", type=int, default=20, help="Runs per session")
+    parser.add_argument("--latency", type=float, default=50, help="Milliseconds the model takes per reply")
+    parser.add_argument("--words", type=int, default=200, help="Words per model reply")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="Processes sharing the database")
+    args = parser.parse_args()
+
+    print(f"{'backend':<15}{'workers':>8}{'sessions':>10}{'runs/s':>10}{'missing runs':>14}")
+    for name in BACKENDS:
+        for workers in args.workers:
+            for sessions in args.sessions:
+                with tempfile.TemporaryDirectory() as path:
+                    db_path = os.path.join(path, "bench.db")
+                    # Create the tables outside the timed part
+                    worker(name, db_path, -1, 1, 1, 0, 1)
+                    with ProcessPoolExecutor(workers) as pool:
+                        results = list(pool.map(
+                            worker, [name] * workers, [db_path] * workers, range(workers), [sessions] * workers,
+                            [args.runs] * workers, [args.latency / 1000] * workers, [args.words] * workers,
+                        ))
+                    rate, missing = sum(result[0] for result in results), sum(result[1] for result in results)
+                    print(f"{name:<15}{workers:>8}{sessions:>10}{rate:>10.1f}{missing:>14}")
+
+
+if __name__ == "__main__":
+    main()
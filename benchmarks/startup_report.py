@@ -0,0 +1,67 @@
+"""
+Cold-boot report for my_agentos.py: eager imports vs the lazy registry.
+
+Each sample starts a fresh interpreter that imports `my_agentos` (building the
+AgentOS app) and records wall time and peak RSS of that child process.
+
+Run from the repository root:
+    python benchmarks/startup_report.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import json, resource, time
+start = time.perf_counter()
+import my_agentos
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print("__REPORT__" + json.dumps({"seconds": elapsed, "rss_mb": rss_kb / 1024}))
+"""
+
+
+def sample(lazy: bool) -> dict:
+    env = {**os.environ, "AGENTOS_LAZY_LOADING": "true" if lazy else "false", "AGNO_TELEMETRY": "false"}
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True, text=True, timeout=600
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("__REPORT__"):
+            return json.loads(line[len("__REPORT__"):])
+    raise RuntimeError(f"Boot failed (lazy={lazy}):\n{result.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Cold boots per mode")
+    args = parser.parse_args()
+
+    report = {}
+    for label, lazy in (("eager", False), ("lazy", True)):
+        samples = [sample(lazy) for _ in range(args.runs)]
+        report[label] = {
+            "boot_seconds_median": statistics.median(s["seconds"] for s in samples),
+            "peak_rss_mb_median": statistics.median(s["rss_mb"] for s in samples),
+        }
+
+    print(f"{'mode':<8}{'boot (s)':>12}{'peak RSS (MB)':>16}")
+    for label, row in report.items():
+        print(f"{label:<8}{row['boot_seconds_median']:>12.2f}{row['peak_rss_mb_median']:>16.1f}")
+
+    eager, lazy = report["eager"], report["lazy"]
+    print(
+        f"\nLazy registry: {eager['boot_seconds_median'] - lazy['boot_seconds_median']:.2f}s faster boot, "
+        f"{eager['peak_rss_mb_median'] - lazy['peak_rss_mb_median']:.1f} MB less memory per worker"
+    )
+
+
+if __name__ == "__main__":
+    main()
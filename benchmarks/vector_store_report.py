@@ -0,0 +1,78 @@
+"""
+Retrieval latency of the local mmap vector store (config/vector_store.py).
+
+Fills a temporary store with random unit vectors (no embedding model needed),
+then times top-k search for single queries and for batches of queries.
+
+Run from the repository root:
+    python benchmarks/vector_store_report.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.knowledge.document import Document  # noqa: E402
+from agno.knowledge.embedder import Embedder  # noqa: E402
+
+from config.vector_store import LocalVectorDb  # noqa: E402
+
+
+def fill(store: LocalVectorDb, size: int, dimensions: int, rng: np.random.Generator, batch: int = 50_000) -> float:
+    start = time.perf_counter()
+    for offset in range(0, size, batch):
+        vectors = rng.standard_normal((min(batch, size - offset), dimensions), dtype=np.float32)
+        documents = [
+            Document(content=f"chunk {offset + i}", name=f"doc-{(offset + i) // 10}", embedding=vector.tolist())
+            for i, vector in enumerate(vectors)
+        ]
+        store._append(content_hash=f"bench-{offset}", documents=documents)
+    return time.perf_counter() - start
+
+
+def time_queries(store: LocalVectorDb, queries: np.ndarray, batch: int, limit: int) -> list:
+    timings = []
+    for start in range(0, len(queries), batch):
+        begin = time.perf_counter()
+        store.search_by_embedding(queries[start : start + batch], limit=limit)
+        timings.append((time.perf_counter() - begin) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Chunks per run")
+    parser.add_argument("--dimensions", type=int, default=384, help="Embedding size (all-MiniLM-L6-v2 is 384)")
+    parser.add_argument("--queries", type=int, default=64, help="Queries timed per mode")
+    parser.add_argument("--batch", type=int, default=32, help="Queries per batched search")
+    parser.add_argument("--limit", type=int, default=5, help="Top-k")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((args.queries, args.dimensions), dtype=np.float32)
+
+    print(f"{'chunks':>10}{'build (s)':>12}{'single p50 (ms)':>18}{'single p95 (ms)':>18}{'batched (ms/query)':>21}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as path:
+            store = LocalVectorDb(path=path, embedder=Embedder(dimensions=args.dimensions))
+            build = fill(store, size, args.dimensions, rng)
+            # Warm the page cache so runs measure search, not the first disk read
+            time_queries(store, queries[:1], 1, args.limit)
+
+            single = time_queries(store, queries, 1, args.limit)
+            batched = time_queries(store, queries, args.batch, args.limit)
+            per_query = sum(batched) / len(queries)
+            p95 = statistics.quantiles(single, n=20)[-1] if len(single) > 1 else single[0]
+            print(f"{size:>10}{build:>12.1f}{statistics.median(single):>18.3f}{p95:>18.3f}{per_query:>21.3f}")
+            store.drop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Shared, content-addressed store of fetched web pages.
+
+Every component that reads articles by URL (the blog generator, the news
+agency writer, the web extraction and competitor analysis agents) goes
+through `article_store`, so a page fetched for one topic or agent is reused
+by all of them:
+
+- pages are keyed by normalized URL (lowercase host, no fragment, sorted
+  query without tracking parameters) and revalidated with
+  If-None-Match / If-Modified-Since once they are older than `fresh_seconds`;
+- bodies are stored zlib-compressed in `article_bodies`, keyed by the sha256
+  of the body, so identical pages behind different URLs are stored once;
+- anything derived from a body (Newspaper4k extraction, an agent's
+  structured scrape, a Firecrawl result) is stored in `article_derived`
+  under (text hash, kind), the sha256 of the page's visible text, so it is
+  reused until the text changes, not whenever markup such as nonces, ads or
+  cache busters does;
+- `prune` runs with the scheduled storage maintenance and drops pages not
+  checked for ARTICLE_STORE_MAX_AGE_DAYS with their bodies and results.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+from agno.utils.log import log_debug, logger
+
+from .database import db_file, storage
+
+# Pages checked more recently than this are served without a request
+ARTICLE_STORE_FRESH_SECONDS = float(os.getenv("ARTICLE_STORE_FRESH_SECONDS", "3600"))
+ARTICLE_STORE_MAX_BYTES = int(os.getenv("ARTICLE_STORE_MAX_BYTES", str(5 * 1024 * 1024)))
+# Pages not checked for this long are pruned by the storage maintenance
+ARTICLE_STORE_MAX_AGE_DAYS = float(os.getenv("ARTICLE_STORE_MAX_AGE_DAYS", "30"))
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "ref_src", "_hsenc", "_hsmi")
+_INVISIBLE_RE = re.compile(r"<(script|style|noscript|template)\b.*?</\1\s*>|<!--.*?-->", re.S | re.I)
+_TAG_RE = re.compile(r"<[^>]*>")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS article_pages (
+    url_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    text_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    fetched_at REAL NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS article_bodies (
+    content_hash TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS article_derived (
+    content_hash TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, kind)
+);
+"""
+
+
+def text_hash(body: bytes) -> str:
+    """sha256 of a page's visible text, ignoring scripts, styles, comments, tags and whitespace."""
+    text = _TAG_RE.sub(" ", _INVISIBLE_RE.sub(" ", body.decode("utf-8", errors="replace")))
+    return hashlib.sha256(" ".join(html.unescape(text).split()).encode()).hexdigest()
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL used as the store key."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme, parts.port) in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+@dataclass
+class StoredPage:
+    url: str
+    content_hash: str
+    body: bytes
+    content_type: Optional[str]
+    fetched_at: float
+    checked_at: float
+    # Key of the results derived from the page
+    text_hash: str
+
+    @property
+    def html(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+class ArticleStore:
+    """Conditional-GET page cache with compressed, deduplicated bodies and derived results."""
+
+    def __init__(
+        self,
+        db_file: str = db_file,
+        fresh_seconds: float = ARTICLE_STORE_FRESH_SECONDS,
+        timeout: float = 20.0,
+        max_bytes: int = ARTICLE_STORE_MAX_BYTES,
+    ):
+        self.db_file = db_file
+        self.fresh_seconds = fresh_seconds
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._client: Optional[httpx.Client] = None
+        self.counts: Counter = Counter()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = storage.connect(self.db_file)
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(article_pages)")}
+            if "text_hash" not in columns:
+                self._add_text_hashes()
+            self._conn.commit()
+        return self._conn
+
+    def _add_text_hashes(self) -> None:
+        """Add and fill the text_hash column of a store created before it existed."""
+        try:
+            self._conn.execute("ALTER TABLE article_pages ADD COLUMN text_hash TEXT")  # type: ignore
+        except sqlite3.OperationalError:
+            return  # another worker added it
+        # Results derived before were keyed by the raw body hash; prune() drops them
+        self._conn.executemany(  # type: ignore
+            "UPDATE article_pages SET text_hash = ? WHERE url_key = ?",
+            [
+                (text_hash(zlib.decompress(body)), url_key)
+                for url_key, body in self._conn.execute(  # type: ignore
+                    "SELECT p.url_key, b.body FROM article_pages p JOIN article_bodies b ON b.content_hash = p.content_hash"
+                ).fetchall()
+            ],
+        )
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; ETUGRAND-AgentOS/1.0)"},
+            )
+        return self._client
+
+    def _load(self, url_key: str) -> Optional[StoredPage]:
+        with self._lock:
+            row = self.conn.execute(
+                """
+                SELECT p.url, p.content_hash, b.body, p.content_type, p.fetched_at, p.checked_at, p.text_hash
+                FROM article_pages p JOIN article_bodies b ON b.content_hash = p.content_hash
+                WHERE p.url_key = ?
+                """,
+                (url_key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredPage(row[0], row[1], zlib.decompress(row[2]), *row[3:])
+
+    def _headers(self, url_key: str) -> Dict[str, str]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified FROM article_pages WHERE url_key = ?", (url_key,)
+            ).fetchone()
+        headers = {}
+        if row and row[0]:
+            headers["If-None-Match"] = row[0]
+        if row and row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def _touch(self, url_key: str, now: float) -> None:
+        with self._lock:
+            self.conn.execute("UPDATE article_pages SET checked_at = ? WHERE url_key = ?", (now, url_key))
+            self.conn.commit()
+
+    def _save(self, url_key: str, url: str, response: httpx.Response, body: bytes, now: float) -> StoredPage:
+        page = StoredPage(
+            url, hashlib.sha256(body).hexdigest(), body, response.headers.get("content-type"), now, now, text_hash(body)
+        )
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO article_bodies VALUES (?, ?, ?, ?)",
+                (page.content_hash, zlib.compress(body, 6), len(body), now),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO article_pages "
+                "(url_key, url, content_hash, text_hash, etag, last_modified, content_type, fetched_at, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url_key,
+                    url,
+                    page.content_hash,
+                    page.text_hash,
+                    response.headers.get("etag"),
+                    response.headers.get("last-modified"),
+                    page.content_type,
+                    now,
+                    now,
+                ),
+            )
+            self.conn.commit()
+        return page
+
+    def lookup(self, url: str) -> Optional[StoredPage]:
+        """Stored copy of a page, however old, without any request."""
+        return self._load(normalize_url(url))
+
+    def fetch(self, url: str, max_age: Optional[float] = None) -> Optional[StoredPage]:
+        """Page body, from the store when fresh or unchanged (304), otherwise downloaded and stored.
+
+        Falls back to a stale stored copy when the request fails; None if there is none.
+        """
+        url_key = normalize_url(url)
+        max_age = self.fresh_seconds if max_age is None else max_age
+        stored = self._load(url_key)
+        now = time.time()
+        if stored is not None and now - stored.checked_at < max_age:
+            self.counts["fresh"] += 1
+            return stored
+
+        try:
+            response = self.client.get(url, headers=self._headers(url_key) if stored else {})
+            if response.status_code == 304 and stored is not None:
+                self.counts["not_modified"] += 1
+                self._touch(url_key, now)
+                stored.checked_at = now
+                return stored
+            response.raise_for_status()
+            body = response.content
+            if len(body) > self.max_bytes:
+                raise ValueError(f"page is larger than {self.max_bytes} bytes")
+        except Exception as e:
+            self.counts["errors"] += 1
+            logger.warning(f"Could not fetch {url}: {e}")
+            return stored
+
+        page = self._save(url_key, url, response, body, now)
+        if stored is not None and stored.text_hash == page.text_hash:
+            self.counts["unchanged"] += 1
+        else:
+            self.counts["downloaded"] += 1
+            log_debug(f"Stored {url} ({len(body)} bytes, {page.content_hash[:12]})")
+        return page
+
+    def get_derived(self, text_hash: str, kind: str) -> Optional[Any]:
+        """A result previously derived from a page with this visible text (`StoredPage.text_hash`)."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM article_derived WHERE content_hash = ? AND kind = ?", (text_hash, kind)
+            ).fetchone()
+        self.counts["derived_hits" if row else "derived_misses"] += 1
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def put_derived(self, text_hash: str, kind: str, value: Any) -> None:
+        data = zlib.compress(json.dumps(value, default=str).encode(), 6)
+        with self._lock:
+            # The content_hash column holds the text hash the result was derived from
+            self.conn.execute(
+                "INSERT OR REPLACE INTO article_derived VALUES (?, ?, ?, ?)", (text_hash, kind, data, time.time())
+            )
+            self.conn.commit()
+
+    def extract(self, page: StoredPage) -> Optional[Dict[str, Any]]:
+        """Newspaper4k extraction of a stored page (title, authors, text, publish_date), cached per content."""
+        cached = self.get_derived(page.text_hash, "newspaper")
+        if cached is not None:
+            return cached
+        try:
+            import newspaper
+        except ImportError:
+            return None
+        try:
+            parsed = newspaper.article(page.url, input_html=page.html)
+        except Exception as e:
+            logger.debug(f"Newspaper4k could not parse {page.url}: {e}")
+            return None
+
+        data = {"title": parsed.title, "authors": parsed.authors, "text": parsed.text}
+        try:
+            data["publish_date"] = parsed.publish_date.isoformat() if parsed.publish_date else None
+        except Exception:
+            data["publish_date"] = None
+        self.put_derived(page.text_hash, "newspaper", data)
+        return data
+
+    def prune(self, max_age_seconds: float = ARTICLE_STORE_MAX_AGE_DAYS * 86400) -> int:
+        """Drop pages not checked within `max_age_seconds` and the bodies and results nobody references."""
+        with self._lock:
+            removed = self.conn.execute(
+                "DELETE FROM article_pages WHERE checked_at < ?", (time.time() - max_age_seconds,)
+            ).rowcount
+            self.conn.execute(
+                "DELETE FROM article_bodies WHERE content_hash NOT IN (SELECT content_hash FROM article_pages)"
+            )
+            self.conn.execute(
+                "DELETE FROM article_derived WHERE content_hash NOT IN "
+                "(SELECT text_hash FROM article_pages WHERE text_hash IS NOT NULL)"
+            )
+            self.conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Request outcomes since startup and the on-disk size of stored bodies."""
+        with self._lock:
+            pages, bodies, raw, stored = self.conn.execute(
+                """
+                SELECT (SELECT COUNT(*) FROM article_pages), COUNT(*), COALESCE(SUM(size), 0),
+                       COALESCE(SUM(LENGTH(body)), 0)
+                FROM article_bodies
+                """
+            ).fetchone()
+        return {
+            **self.counts,
+            "pages": pages,
+            "bodies": bodies,
+            "raw_bytes": raw,
+            "stored_bytes": stored,
+            "compression_ratio": round(raw / stored, 2) if stored else 0.0,
+        }
+
+
+article_store = ArticleStore()
+storage.register_maintenance("article_store", article_store.prune)
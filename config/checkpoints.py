@@ -0,0 +1,131 @@
+"""
+Per-phase checkpoints for multi-phase workflows.
+
+The startup validator and the blog generator run several expensive LLM and
+search phases in one custom function; when a late phase failed, the run
+returned an error and the next attempt paid for every phase again. Each
+phase's structured output is now saved in a `workflow_checkpoints` table of
+the shared database, keyed by (workflow, run id, phase); a failed run
+reports its run id. A run started with `resume_run_id=<run id>` (also accepted
+as a form field by the AgentOS workflow run endpoint) loads the completed
+phases instead of running them again and continues from the first missing one.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from agno.utils.log import log_debug
+from pydantic import BaseModel
+
+from .database import db_file, storage
+
+# Checkpoints of runs not updated for this long are dropped
+CHECKPOINT_TTL_SECONDS = float(os.getenv("CHECKPOINT_TTL_SECONDS", str(7 * 86400)))
+
+M = TypeVar("M", bound=BaseModel)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workflow_checkpoints (
+    workflow TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (workflow, run_id, phase)
+);
+CREATE INDEX IF NOT EXISTS idx_workflow_checkpoints_updated ON workflow_checkpoints(workflow, updated_at);
+"""
+
+
+class CheckpointStore:
+    """Structured phase outputs of one workflow's runs, stored per run id."""
+
+    def __init__(self, workflow: str, db_file: str = db_file, ttl: float = CHECKPOINT_TTL_SECONDS):
+        self.workflow = workflow
+        self.db_file = db_file
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = storage.connect(self.db_file)
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def save(self, run_id: str, phase: str, value: Any) -> None:
+        """Store a phase output; pydantic models are stored as their JSON dump."""
+        if isinstance(value, BaseModel):
+            value = value.model_dump(mode="json")
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO workflow_checkpoints VALUES (?, ?, ?, ?, ?)",
+                (self.workflow, run_id, phase, json.dumps(value, default=str), time.time()),
+            )
+            self.conn.commit()
+        log_debug(f"Checkpointed {self.workflow} run {run_id}: {phase}")
+
+    def load(self, run_id: Optional[str], phase: str, model: Optional[Type[M]] = None) -> Optional[Any]:
+        """A saved phase output, validated into `model` when given; None if the phase has not completed."""
+        if not run_id:
+            return None
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM workflow_checkpoints WHERE workflow = ? AND run_id = ? AND phase = ?",
+                (self.workflow, run_id, phase),
+            ).fetchone()
+        if row is None:
+            return None
+        value = json.loads(row[0])
+        return model.model_validate(value) if model is not None else value
+
+    def phases(self, run_id: str) -> List[str]:
+        """Completed phases of a run, in the order they were saved."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT phase FROM workflow_checkpoints WHERE workflow = ? AND run_id = ? ORDER BY updated_at",
+                (self.workflow, run_id),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recently updated runs with their completed phases, to pick one to resume."""
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT run_id, GROUP_CONCAT(phase), MAX(updated_at) FROM workflow_checkpoints
+                WHERE workflow = ? GROUP BY run_id ORDER BY MAX(updated_at) DESC LIMIT ?
+                """,
+                (self.workflow, limit),
+            ).fetchall()
+        return [{"run_id": row[0], "phases": row[1].split(","), "updated_at": row[2]} for row in rows]
+
+    def discard(self, run_id: str) -> int:
+        with self._lock:
+            deleted = self.conn.execute(
+                "DELETE FROM workflow_checkpoints WHERE workflow = ? AND run_id = ?", (self.workflow, run_id)
+            ).rowcount
+            self.conn.commit()
+        return deleted
+
+    def prune(self) -> int:
+        """Drop the checkpoints of runs not updated within `ttl`."""
+        with self._lock:
+            deleted = self.conn.execute(
+                """
+                DELETE FROM workflow_checkpoints WHERE workflow = ? AND run_id IN (
+                    SELECT run_id FROM workflow_checkpoints WHERE workflow = ?
+                    GROUP BY run_id HAVING MAX(updated_at) < ?
+                )
+                """,
+                (self.workflow, self.workflow, time.time() - self.ttl),
+            ).rowcount
+            self.conn.commit()
+        return deleted
@@ -1,6 +1,632 @@
+"""
+Storage for agents, teams, workflows and the stores under config/.
+
+Every run writes its session (and, with user memories enabled, memory rows)
+to one SQLite file. With the default engine each write was its own rollback
+journal transaction with a full fsync, and concurrent runs (or several
+uvicorn workers) failed with "database is locked". agno writes sessions
+synchronously, on the event loop under AgentOS, so every commit stalls all
+runs in flight. `TunedSqliteDb` keeps the agno `SqliteDb` interface and:
+
+- opens connections in WAL mode with `synchronous=NORMAL` and a busy timeout,
+  so readers never block the writer and commits do not fsync;
+- bounds the connection pool (SQLITE_POOL_SIZE connections, waiting up to
+  SQLITE_POOL_TIMEOUT seconds for one);
+- stores every run in an indexed `<session table>_runs` table and keeps only
+  the last SESSION_HOT_RUNS top-level runs (with their team member runs) in
+  the session row, so reading a session for `num_history_runs` costs the
+  same however long the session is. Paused, cancelled and failed runs, which
+  agno leaves out of history, do not count towards the window. Each run is
+  serialized once per write, for both the table and the row.
+  `get_session_runs(session_id, last_n)` reads the last runs from the index
+  and `update_session_summary` writes a summary without rewriting the row;
+  inside `full_session_history()` (the AgentOS /sessions endpoints, via
+  `SessionHistoryMiddleware`) sessions are read with all their runs;
+- reads one user's memories (what agents load at run start) with a single
+  query on the user_id index.
+
+Everything resolves its database through `storage` (`StorageManager`) instead
+of opening its own file: `storage.agno_db()` is the agno db every agent, team
+and workflow uses, `storage.connect()` opens a tuned SQLite connection for the
+checkpoint, cache, article and job stores. STORAGE_BACKEND (default: postgres
+when DATABASE_URL is set, sqlite otherwise) moves the agno tables to Postgres
+on one pooled engine; the stores, whose SQL is SQLite-specific, stay in
+DATABASE_FILE. `storage.maintain()` indexes session_id / user_id / created_at
+columns, runs the stores' cleanups registered with `register_maintenance`,
+runs ANALYZE, and VACUUMs SQLite once enough pages are free (VACUUM
+ANALYZE on Postgres); `storage_maintenance_lifespan` runs it every
+STORAGE_MAINTENANCE_HOURS, GET /storage reports it and POST /storage runs it.
+"""
+
+import asyncio
+import json
 import os
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from agno.db.base import BaseDb, SessionType
+from agno.db.schemas.memory import UserMemory
 from agno.db.sqlite import SqliteDb
+from agno.session import AgentSession, TeamSession, WorkflowSession
+from agno.session.summary import SessionSummary
+from agno.utils.log import logger
+from agno.utils.string import generate_id
+from fastapi import APIRouter
+from sqlalchemy import Table, create_engine, event, inspect, select, text
+from sqlalchemy.engine import Engine
 
-# Database setup - using SQLite for development/demo
+# Database setup - SQLite by default, Postgres when DATABASE_URL is set
 db_file = os.getenv("DATABASE_FILE", "agentos.db")
-db = SqliteDb(db_file=db_file)
\ No newline at end of file
+DATABASE_URL = os.getenv("DATABASE_URL")
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "postgres" if DATABASE_URL else "sqlite").lower()
+
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+SQLITE_POOL_TIMEOUT = float(os.getenv("SQLITE_POOL_TIMEOUT", "30"))
+# Top-level runs kept in the session row itself; older ones are only in the
+# per-run table. Must cover the largest num_history_runs of any agent or team.
+SESSION_HOT_RUNS = int(os.getenv("SESSION_HOT_RUNS", "10"))
+STORAGE_MAINTENANCE_HOURS = float(os.getenv("STORAGE_MAINTENANCE_HOURS", "24"))
+# SQLite is only VACUUMed once this fraction of its pages is free
+STORAGE_VACUUM_FREE_RATIO = float(os.getenv("STORAGE_VACUUM_FREE_RATIO", "0.2"))
+
+# Columns indexed on every table that has them
+INDEXED_COLUMNS = ("session_id", "user_id", "created_at")
+
+# Run statuses agno leaves out of history, so they do not count towards SESSION_HOT_RUNS
+SKIPPED_IN_HISTORY = ("PAUSED", "CANCELLED", "ERROR")
+
+
+_full_history: ContextVar[bool] = ContextVar("full_session_history", default=False)
+
+
+@contextmanager
+def full_session_history() -> Iterator[None]:
+    """Read sessions with all their runs, not just the hot ones, within this context."""
+    token = _full_history.set(True)
+    try:
+        yield
+    finally:
+        _full_history.reset(token)
+
+
+class SessionHistoryMiddleware:
+    """ASGI middleware that gives the AgentOS session endpoints every run of a session."""
+
+    def __init__(self, app, prefixes: tuple = ("/sessions",)):
+        self.app = app
+        self.prefixes = prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.prefixes):
+            with full_session_history():
+                await self.app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+def _hot_window(runs: List[Dict[str, Any]], hot_runs: int) -> List[Dict[str, Any]]:
+    """The serialized runs kept in a session row, in their original order.
+
+    Counts top-level runs (no `parent_run_id`) back from the newest until
+    `hot_runs` of them are ones agno adds to history, and keeps each with the
+    member runs under it. Member runs whose team run is not stored yet are kept.
+    """
+    parents = {run.get("run_id"): run.get("parent_run_id") for run in runs}
+    top_level = [run for run in runs if run.get("parent_run_id") is None]
+
+    kept, counted = set(), 0
+    for run in reversed(top_level):
+        if counted >= hot_runs:
+            break
+        kept.add(run.get("run_id"))
+        if run.get("status") not in SKIPPED_IN_HISTORY:
+            counted += 1
+    if len(kept) == len(top_level):
+        return runs
+
+    def root(run_id: Optional[str]) -> Optional[str]:
+        seen = set()
+        while parents.get(run_id) is not None and run_id not in seen:
+            seen.add(run_id)
+            run_id = parents[run_id]
+        return run_id
+
+    top_level_ids = {run.get("run_id") for run in top_level}
+    return [run for run in runs if root(run.get("run_id")) in kept or root(run.get("run_id")) not in top_level_ids]
+
+
+class _SerializedRun:
+    """A run already converted by `to_dict()`, so writing the session row does not convert it again."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.data
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "_SerializedRun":
+        # AgentSession/TeamSession.to_dict() start with asdict(), which deep-copies every field
+        return self
+
+
+def _tune_connection(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_POOL_TIMEOUT * 1000)}")
+    cursor.close()
+
+
+class TunedSqliteDb(SqliteDb):
+    """`SqliteDb` on a WAL, pooled engine that keeps old runs out of the session rows."""
+
+    def __init__(
+        self,
+        db_file: str = db_file,
+        pool_size: int = SQLITE_POOL_SIZE,
+        pool_timeout: float = SQLITE_POOL_TIMEOUT,
+        hot_runs: int = SESSION_HOT_RUNS,
+        **kwargs: Any,
+    ):
+        db_path = Path(db_file).resolve()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        engine = create_engine(
+            f"sqlite:///{db_path}",
+            pool_size=pool_size,
+            max_overflow=0,
+            pool_timeout=pool_timeout,
+            connect_args={"timeout": pool_timeout, "check_same_thread": False},
+        )
+        event.listen(engine, "connect", _tune_connection)
+        kwargs["id"] = kwargs.get("id") or generate_id(db_file)
+        super().__init__(db_engine=engine, **kwargs)
+        self.db_file = str(db_path)
+        self.hot_runs = hot_runs
+        self.runs_table = f"{self.session_table_name}_runs"
+
+        self._tables: Dict[str, Table] = {}
+        self._runs_table_ready = False
+
+    def _get_table(self, table_type: str, create_table_if_not_found: Optional[bool] = False) -> Optional[Table]:
+        # SqliteDb reflects the table schema again on every read and write
+        table = self._tables.get(table_type)
+        if table is None:
+            table = super()._get_table(table_type, create_table_if_not_found)
+            if table is not None:
+                self._tables[table_type] = table
+        return table
+
+    def _ensure_runs_table(self) -> None:
+        if self._runs_table_ready:
+            return
+        with self.db_engine.begin() as connection:
+            connection.exec_driver_sql(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.runs_table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    run_id TEXT NOT NULL,
+                    created_at INTEGER,
+                    run TEXT NOT NULL,
+                    UNIQUE (session_id, run_id)
+                )
+                """
+            )
+            connection.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.runs_table}_session_order ON {self.runs_table}(session_id, id)"
+            )
+        self._runs_table_ready = True
+
+    def _store_runs(self, connection, session_id: str, runs: List[Dict[str, Any]]) -> None:
+        """Insert or update runs in the per-run table; an updated run keeps its position."""
+        if not runs:
+            return
+        connection.execute(
+            text(
+                f"INSERT INTO {self.runs_table} (session_id, run_id, created_at, run) "
+                "VALUES (:session_id, :run_id, :created_at, :run) "
+                "ON CONFLICT (session_id, run_id) DO UPDATE SET run = excluded.run"
+            ),
+            [
+                {
+                    "session_id": session_id,
+                    "run_id": run.get("run_id"),
+                    "created_at": run.get("created_at"),
+                    "run": json.dumps(run, default=str),
+                }
+                for run in runs
+            ],
+        )
+
+    def _upsert_session(self, session, deserialize: Optional[bool]):
+        """Store every run in the per-run table and only the hot window in the session row."""
+        runs = session.runs
+        serialized = [run.to_dict() for run in runs or []]
+        with self.Session() as sess, sess.begin():
+            self._store_runs(sess, session.session_id, serialized)
+        if serialized:
+            session.runs = [_SerializedRun(run) for run in _hot_window(serialized, self.hot_runs)]
+        try:
+            return super().upsert_session(session, deserialize)
+        finally:
+            session.runs = runs
+
+    def upsert_session(self, session, deserialize: Optional[bool] = True):
+        self._ensure_runs_table()
+        return self._upsert_session(session, deserialize)
+
+    def get_user_memories(self, user_id: Optional[str] = None, deserialize: Optional[bool] = True, **filters: Any):
+        """A user's memories in one query on the user_id index; other lookups go to `SqliteDb`."""
+        # SqliteDb also counts the matching rows first, which only the paginated /memories endpoint needs
+        if user_id is None or not deserialize or any(value is not None for value in filters.values()):
+            return super().get_user_memories(user_id=user_id, deserialize=deserialize, **filters)
+        table = self._get_table(table_type="memories")
+        if table is None:
+            return []
+        try:
+            with self.db_engine.connect() as connection:
+                rows = connection.execute(select(table).where(table.c.user_id == user_id)).fetchall()
+        except Exception as e:
+            logger.error(f"Error reading memories of user {user_id}: {e}")
+            return []
+        return [UserMemory.from_dict(dict(row._mapping)) for row in rows]
+
+    def get_session_runs(self, session_id: str, last_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The last `last_n` runs of a session (all when None), oldest first, read from the per-run index."""
+        self._ensure_runs_table()
+        query = f"SELECT run FROM {self.runs_table} WHERE session_id = :session_id ORDER BY id DESC"
+        params: Dict[str, Any] = {"session_id": session_id}
+        if last_n is not None:
+            query += " LIMIT :last_n"
+            params["last_n"] = last_n
+        with self.db_engine.connect() as connection:
+            rows = connection.execute(text(query), params).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def update_session_summary(self, session_id: str, summary: SessionSummary, session_data: Dict[str, Any]) -> bool:
+        """Store a summary newer than the session's and merge `session_data` into the row's, in one UPDATE.
+
+        Only the summary and session_data columns are written, so runs and session state saved meanwhile stay.
+        """
+        table = self._get_table(table_type="sessions")
+        if table is None:
+            return False
+        serialized = summary.to_dict()
+        with self.db_engine.begin() as connection:
+            # agno stores these columns as JSON-encoded strings inside the JSON column
+            result = connection.execute(
+                text(
+                    f"UPDATE {table.name} SET summary = json_quote(:summary), "
+                    "session_data = json_quote(json_patch(COALESCE(json_extract(session_data, '$'), '{}'), :session_data)) "
+                    "WHERE session_id = :session_id "
+                    "AND COALESCE(json_extract(json_extract(summary, '$'), '$.updated_at'), '') < :updated_at"
+                ),
+                {
+                    "summary": json.dumps(serialized),
+                    "session_data": json.dumps(session_data, default=str),
+                    "session_id": session_id,
+                    "updated_at": serialized.get("updated_at") or "",
+                },
+            )
+        return result.rowcount > 0
+
+    def _with_archived_runs(self, session_raw: Dict[str, Any]) -> Dict[str, Any]:
+        stored = self.get_session_runs(session_raw["session_id"])
+        if stored:
+            stored_ids = {run.get("run_id") for run in stored}
+            hot = [run for run in session_raw.get("runs") or [] if run.get("run_id") not in stored_ids]
+            session_raw["runs"] = stored + hot
+        return session_raw
+
+    def get_session(
+        self,
+        session_id: str,
+        session_type: SessionType,
+        user_id: Optional[str] = None,
+        deserialize: Optional[bool] = True,
+    ):
+        """The session with its hot runs, or with every run inside `full_session_history()`."""
+        if not _full_history.get():
+            return super().get_session(session_id, session_type, user_id, deserialize)
+        session_raw = super().get_session(session_id, session_type, user_id, deserialize=False)
+        if not session_raw:
+            return session_raw
+        session_raw = self._with_archived_runs(dict(session_raw))
+        if not deserialize:
+            return session_raw
+        return {SessionType.AGENT: AgentSession, SessionType.TEAM: TeamSession, SessionType.WORKFLOW: WorkflowSession}[
+            session_type
+        ].from_dict(session_raw)
+
+    def delete_session(self, session_id: str) -> bool:
+        deleted = super().delete_session(session_id)
+        self._delete_runs([session_id])
+        return deleted
+
+    def delete_sessions(self, session_ids: List[str]) -> None:
+        super().delete_sessions(session_ids)
+        self._delete_runs(session_ids)
+
+    def _delete_runs(self, session_ids: List[str]) -> None:
+        self._ensure_runs_table()
+        with self.db_engine.begin() as connection:
+            connection.execute(
+                text(f"DELETE FROM {self.runs_table} WHERE session_id IN (SELECT value FROM json_each(:ids))"),
+                {"ids": json.dumps(session_ids)},
+            )
+
+    def _get_all_sessions_for_metrics_calculation(
+        self, start_timestamp: Optional[int] = None, end_timestamp: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        # Run counts and token metrics have to include the runs no longer in the session rows
+        table = self._get_table(table_type="sessions")
+        if table is None:
+            return []
+        stmt = select(
+            table.c.session_id,
+            table.c.user_id,
+            table.c.session_data,
+            table.c.runs,
+            table.c.created_at,
+            table.c.session_type,
+        )
+        if start_timestamp is not None:
+            stmt = stmt.where(table.c.created_at >= start_timestamp)
+        if end_timestamp is not None:
+            stmt = stmt.where(table.c.created_at <= end_timestamp)
+        with self.db_engine.connect() as connection:
+            records = [dict(record._mapping) for record in connection.execute(stmt).fetchall()]
+        for record in records:
+            session_raw = {"session_id": record.pop("session_id"), "runs": json.loads(record["runs"] or "[]")}
+            record["runs"] = json.dumps(self._with_archived_runs(session_raw)["runs"], default=str)
+        return records
+
+    def archive_runs(self) -> int:
+        """Move runs outside the hot window out of session rows that were written with all their runs."""
+        self._ensure_runs_table()
+        table = self._get_table(table_type="sessions")
+        if table is None:
+            return 0
+        with self.db_engine.connect() as connection:
+            session_ids = connection.execute(
+                # agno stores runs as a JSON-encoded string inside the JSON column
+                text(f"SELECT session_id FROM {table.name} WHERE json_array_length(json_extract(runs, '$')) > :hot"),
+                {"hot": self.hot_runs},
+            ).scalars().all()
+        archived = 0
+        for session_id in session_ids:
+            with self.db_engine.begin() as connection:
+                runs = json.loads(
+                    connection.execute(select(table.c.runs).where(table.c.session_id == session_id)).scalar() or "[]"
+                )
+                hot = _hot_window(runs, self.hot_runs)
+                if len(hot) == len(runs):
+                    continue
+                self._store_runs(connection, session_id, runs)
+                connection.execute(table.update().where(table.c.session_id == session_id).values(runs=json.dumps(hot)))
+            archived += len(runs) - len(hot)
+        if archived:
+            logger.info(f"Archived {archived} runs from {len(session_ids)} sessions")
+        return archived
+
+
+@dataclass
+class MaintenanceReport:
+    state: str = "idle"  # idle, running, completed or failed
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    indexes_created: List[str] = field(default_factory=list)
+    runs_archived: int = 0
+    # Rows removed by each registered store cleanup
+    pruned: Dict[str, int] = field(default_factory=dict)
+    analyzed: bool = False
+    vacuumed: bool = False
+    free_ratio: Optional[float] = None
+    message: Optional[str] = None
+
+
+class StorageManager:
+    """Single entry point for the agno db, SQLite store connections and database maintenance."""
+
+    def __init__(
+        self,
+        backend: str = STORAGE_BACKEND,
+        database_url: Optional[str] = DATABASE_URL,
+        sqlite_file: str = db_file,
+        pool_size: int = SQLITE_POOL_SIZE,
+        pool_timeout: float = SQLITE_POOL_TIMEOUT,
+    ):
+        if backend not in ("sqlite", "postgres"):
+            raise ValueError(f"STORAGE_BACKEND must be 'sqlite' or 'postgres', not '{backend}'")
+        if backend == "postgres" and not database_url:
+            raise ValueError("STORAGE_BACKEND=postgres needs DATABASE_URL")
+        self.backend = backend
+        self.database_url = database_url
+        self.sqlite_file = sqlite_file
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.report = MaintenanceReport()
+
+        self._lock = threading.Lock()
+        self._agno_db: Optional[BaseDb] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._maintenance_hooks: Dict[str, Callable[[], int]] = {}
+
+    def agno_db(self) -> BaseDb:
+        """The agno db shared by every agent, team and workflow."""
+        with self._lock:
+            if self._agno_db is None:
+                if self.backend == "postgres":
+                    from agno.db.postgres import PostgresDb
+
+                    # agno's Postgres support is built on psycopg 3
+                    url = self.database_url.replace("postgresql://", "postgresql+psycopg://", 1)
+                    engine = create_engine(
+                        url, pool_size=self.pool_size, max_overflow=0, pool_timeout=self.pool_timeout, pool_pre_ping=True
+                    )
+                    self._agno_db = PostgresDb(db_engine=engine, id=generate_id(url))
+                else:
+                    self._agno_db = TunedSqliteDb(
+                        db_file=self.sqlite_file, pool_size=self.pool_size, pool_timeout=self.pool_timeout
+                    )
+            return self._agno_db
+
+    @property
+    def engine(self) -> Engine:
+        return self.agno_db().db_engine
+
+    def connect(self, path: Optional[str] = None) -> sqlite3.Connection:
+        """A WAL, synchronous=NORMAL connection to `path` (default DATABASE_FILE) for a store's own tables."""
+        path = path or self.sqlite_file
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = sqlite3.connect(path, timeout=self.pool_timeout, check_same_thread=False)
+        _tune_connection(conn, None)
+        return conn
+
+    def ensure_indexes(self) -> List[str]:
+        """Index session_id, user_id and created_at on every table that has them and lacks one."""
+        agno_db = self.agno_db()
+        # agno creates its tables on first use; create them now so they are indexed from the start
+        for table_type in ("sessions", "memories"):
+            agno_db._get_table(table_type=table_type, create_table_if_not_found=True)
+
+        engines = [self.engine]
+        if self.backend == "postgres":
+            engines.append(create_engine(f"sqlite:///{Path(self.sqlite_file).resolve()}"))
+        created = []
+        for engine in engines:
+            inspector = inspect(engine)
+            schema = getattr(agno_db, "db_schema", None) if engine is self.engine else None
+            for table in inspector.get_table_names(schema=schema):
+                columns = {column["name"] for column in inspector.get_columns(table, schema=schema)}
+                leading = {index["column_names"][0] for index in inspector.get_indexes(table, schema=schema)}
+                leading.update(inspector.get_pk_constraint(table, schema=schema)["constrained_columns"][:1])
+                for column in INDEXED_COLUMNS:
+                    if column in columns and column not in leading:
+                        name = f"idx_{table}_{column}"
+                        qualified = f'"{schema}"."{table}"' if schema else f'"{table}"'
+                        with engine.begin() as connection:
+                            connection.execute(text(f'CREATE INDEX IF NOT EXISTS "{name}" ON {qualified} ("{column}")'))
+                        created.append(name)
+            if engine is not self.engine:
+                engine.dispose()
+        if created:
+            logger.info(f"Created indexes: {', '.join(created)}")
+        return created
+
+    def register_maintenance(self, name: str, hook: Callable[[], int]) -> None:
+        """Run `hook` (a store's cleanup, returning the rows it removed) on every `maintain`."""
+        self._maintenance_hooks[name] = hook
+
+    def maintain(self) -> MaintenanceReport:
+        """Create missing indexes, archive old runs, refresh planner statistics and reclaim free space."""
+        report = self.report = MaintenanceReport(state="running", started_at=time.time())
+        try:
+            report.indexes_created = self.ensure_indexes()
+            if isinstance(self._agno_db, TunedSqliteDb):
+                report.runs_archived = self._agno_db.archive_runs()
+            # Before VACUUM, so the space the stores free is reclaimed in the same run
+            for name, hook in list(self._maintenance_hooks.items()):
+                report.pruned[name] = hook()
+            if self.backend == "postgres":
+                self._maintain_postgres()
+                report.analyzed = report.vacuumed = True
+            conn = self.connect()
+            try:
+                conn.execute("ANALYZE")
+                report.analyzed = True
+                page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                report.free_ratio = round(free_pages / page_count, 3) if page_count else 0.0
+                if report.free_ratio >= STORAGE_VACUUM_FREE_RATIO:
+                    conn.execute("VACUUM")
+                    report.vacuumed = True
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+            report.state = "completed"
+        except Exception as e:
+            report.state = "failed"
+            report.message = str(e)
+            logger.error(f"Storage maintenance failed: {e}")
+        report.finished_at = time.time()
+        return report
+
+    def _maintain_postgres(self) -> None:
+        agno_db = self.agno_db()
+        schema = getattr(agno_db, "db_schema", None)
+        # VACUUM cannot run inside a transaction block
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for table in inspect(self.engine).get_table_names(schema=schema):
+                connection.execute(text(f'VACUUM (ANALYZE) "{schema}"."{table}"' if schema else f'VACUUM (ANALYZE) "{table}"'))
+
+    def start_maintenance(self, interval_hours: float = STORAGE_MAINTENANCE_HOURS) -> asyncio.Task:
+        """Run `maintain` now and then every `interval_hours` on the current event loop."""
+        if self._maintenance_task is not None and not self._maintenance_task.done():
+            return self._maintenance_task
+
+        async def loop():
+            while True:
+                await asyncio.to_thread(self.maintain)
+                await asyncio.sleep(interval_hours * 3600)
+
+        self._maintenance_task = asyncio.create_task(loop())
+        return self._maintenance_task
+
+    async def stop_maintenance(self) -> None:
+        if self._maintenance_task is not None and not self._maintenance_task.done():
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> Dict[str, Any]:
+        """Backend, pool usage, file sizes and the last maintenance run."""
+        status: Dict[str, Any] = {"backend": self.backend, "pool": self.engine.pool.status()}
+        for suffix in ("", "-wal"):
+            path = Path(self.sqlite_file + suffix)
+            status[f"sqlite{suffix.replace('-', '_')}_bytes"] = path.stat().st_size if path.exists() else 0
+        status["maintenance"] = asdict(self.report)
+        return status
+
+
+storage = StorageManager()
+db = storage.agno_db()
+
+
+def storage_maintenance_lifespan(manager: StorageManager = storage):
+    """FastAPI lifespan that indexes and maintains the database in the background."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        manager.start_maintenance()
+        try:
+            yield
+        finally:
+            await manager.stop_maintenance()
+
+    return lifespan
+
+
+def get_storage_router(manager: StorageManager = storage) -> APIRouter:
+    """Endpoints to inspect the database and run maintenance."""
+    router = APIRouter(prefix="/storage", tags=["Storage"])
+
+    @router.get("")
+    async def get_storage_status() -> Dict[str, Any]:
+        return manager.status()
+
+    @router.post("")
+    async def run_storage_maintenance() -> Dict[str, Any]:
+        return asdict(await asyncio.to_thread(manager.maintain))
+
+    return router
@@ -0,0 +1,249 @@
+"""
+Persistent embedding cache for knowledge ingestion.
+
+`CachedEmbedder` wraps any agno Embedder. Embeddings are stored in an
+`embedding_cache` table of the AgentOS SQLite database, keyed by
+(model id, sha256 of the text), so unchanged chunks are never re-embedded
+across restarts or re-crawls. Cache misses are embedded in batches. Entries
+not used for EMBEDDING_CACHE_TTL_DAYS are dropped and the least recently used
+are evicted past EMBEDDING_CACHE_MAX_ENTRIES per model.
+
+One-off texts (search queries, prompts) go through `get_query_embeddings`
+(or `embed_queries` for any embedder) instead: they are kept in a bounded
+in-memory LRU and never written to the table.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from agno.knowledge.embedder import Embedder
+from agno.utils.log import logger
+
+from .database import db_file, storage
+
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+EMBEDDING_CACHE_TTL_DAYS = float(os.getenv("EMBEDDING_CACHE_TTL_DAYS", "90"))
+EMBEDDING_QUERY_CACHE_SIZE = int(os.getenv("EMBEDDING_QUERY_CACHE_SIZE", "1024"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    created_at INTEGER NOT NULL,
+    accessed_at INTEGER NOT NULL,
+    PRIMARY KEY (model, text_hash)
+);
+"""
+_LRU_INDEX = "CREATE INDEX IF NOT EXISTS idx_embedding_cache_lru ON embedding_cache(model, accessed_at)"
+
+
+def embed_many(embedder: Embedder, texts: List[str], batch_size: int) -> List[List[float]]:
+    """Embed texts with the embedder's batch API when it has one."""
+    if hasattr(embedder, "get_embeddings_batch"):
+        return embedder.get_embeddings_batch(texts, batch_size=batch_size)
+    if hasattr(embedder, "sentence_transformer_client"):
+        # SentenceTransformerEmbedder.get_embedding also accepts a list of texts
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            embeddings.extend(embedder.get_embedding(texts[start : start + batch_size]))
+        return embeddings
+    return [embedder.get_embedding(text) for text in texts]
+
+
+def embed_queries(embedder: Embedder, texts: List[str]) -> List[List[float]]:
+    """Embeddings of one-off texts, kept out of a CachedEmbedder's persistent table."""
+    if hasattr(embedder, "get_query_embeddings"):
+        return embedder.get_query_embeddings(texts)
+    if hasattr(embedder, "get_embeddings"):
+        return embedder.get_embeddings(texts)
+    return [embedder.get_embedding(text) for text in texts]
+
+
+@dataclass
+class CachedEmbedder(Embedder):
+    """Embedder that serves repeated texts from a SQLite cache and embeds misses in batches."""
+
+    embedder: Optional[Embedder] = None
+    db_file: str = db_file
+    batch_size: int = 64
+    max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES
+    ttl_days: Optional[float] = EMBEDDING_CACHE_TTL_DAYS
+    query_cache_size: int = EMBEDDING_QUERY_CACHE_SIZE
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    embedded: int = field(default=0, init=False)
+    embed_seconds: float = field(default=0.0, init=False)
+    evicted: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        if self.embedder is None:
+            raise ValueError("CachedEmbedder needs an embedder to wrap")
+        self.dimensions = self.embedder.dimensions
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._queries: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    @property
+    def model_id(self) -> str:
+        return getattr(self.embedder, "id", None) or type(self.embedder).__name__
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = storage.connect(self.db_file)
+            self._conn.execute(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embedding_cache)")}
+            if "accessed_at" not in columns:
+                try:
+                    self._conn.execute("ALTER TABLE embedding_cache ADD COLUMN accessed_at INTEGER NOT NULL DEFAULT 0")
+                    self._conn.execute("UPDATE embedding_cache SET accessed_at = created_at")
+                except sqlite3.OperationalError:
+                    pass  # another worker added it
+            self._conn.execute(_LRU_INDEX)
+            self._conn.commit()
+        return self._conn
+
+    def _lookup(self, hashes: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start : start + 500]
+            rows = self.conn.execute(
+                f"SELECT text_hash, embedding FROM embedding_cache WHERE model = ? AND text_hash IN ({', '.join('?' * len(chunk))})",
+                [self.model_id, *chunk],
+            )
+            for text_hash, blob in rows:
+                found[text_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def _store(self, rows: List[Tuple[Any, ...]], hit_hashes: List[str], now: int) -> None:
+        """Insert new embeddings, mark hits as used, and drop expired and least recently used entries."""
+        with self._lock:
+            self.conn.executemany("INSERT OR REPLACE INTO embedding_cache VALUES (?, ?, ?, ?, ?)", rows)
+            self.conn.executemany(
+                "UPDATE embedding_cache SET accessed_at = ? WHERE model = ? AND text_hash = ?",
+                [(now, self.model_id, text_hash) for text_hash in hit_hashes],
+            )
+            evicted = 0
+            if rows and self.ttl_days:
+                evicted += self.conn.execute(
+                    "DELETE FROM embedding_cache WHERE model = ? AND accessed_at < ?",
+                    (self.model_id, now - self.ttl_days * 86400),
+                ).rowcount
+            if rows:
+                evicted += self.conn.execute(
+                    """
+                    DELETE FROM embedding_cache WHERE model = ? AND rowid IN (
+                        SELECT rowid FROM embedding_cache WHERE model = ?
+                        ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.model_id, self.model_id, self.max_entries),
+                ).rowcount
+            self.conn.commit()
+        self.evicted += evicted
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings for all texts, embedding only the ones not cached yet."""
+        hashes = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+        with self._lock:
+            cached = self._lookup(list(set(hashes)))
+
+        missing: Dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in cached:
+                missing.setdefault(text_hash, text)
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            start = time.perf_counter()
+            embeddings = embed_many(self.embedder, list(missing.values()), self.batch_size)  # type: ignore
+            self.embed_seconds += time.perf_counter() - start
+            self.embedded += len(missing)
+
+        now = int(time.time())
+        rows: List[Tuple[Any, ...]] = []
+        if missing:
+            for text_hash, embedding in zip(missing, embeddings):
+                if not embedding:
+                    continue
+                cached[text_hash] = list(embedding)
+                rows.append((self.model_id, text_hash, np.asarray(embedding, dtype=np.float32).tobytes(), now, now))
+            logger.debug(f"Embedded {len(missing)} texts in {self.embed_seconds:.2f}s ({len(texts) - len(missing)} cached)")
+        self._store(rows, [text_hash for text_hash in set(hashes) if text_hash not in missing], now)
+
+        return [cached.get(text_hash, []) for text_hash in hashes]
+
+    def get_query_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings of one-off texts from an in-memory LRU of `query_cache_size`; nothing is persisted."""
+        hashes = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for text_hash in set(hashes):
+                if text_hash in self._queries:
+                    self._queries.move_to_end(text_hash)
+                    found[text_hash] = self._queries[text_hash]
+
+        missing: Dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in found:
+                missing.setdefault(text_hash, text)
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            start = time.perf_counter()
+            embeddings = embed_many(self.embedder, list(missing.values()), self.batch_size)  # type: ignore
+            self.embed_seconds += time.perf_counter() - start
+            self.embedded += len(missing)
+            with self._lock:
+                for text_hash, embedding in zip(missing, embeddings):
+                    if not embedding:
+                        continue
+                    found[text_hash] = self._queries[text_hash] = list(embedding)
+                while len(self._queries) > self.query_cache_size:
+                    self._queries.popitem(last=False)
+
+        return [found.get(text_hash, []) for text_hash in hashes]
+
+    def get_query_embedding(self, text: str) -> List[float]:
+        return self.get_query_embeddings([text])[0]
+
+    async def async_get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(self.get_embeddings, texts)
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embeddings([text])[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+    async def async_get_embedding(self, text: str) -> List[float]:
+        return (await self.async_get_embeddings([text]))[0]
+
+    async def async_get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return await self.async_get_embedding(text), None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and the embedding time the cache saved (estimated from the mean miss cost)."""
+        lookups = self.hits + self.misses
+        seconds_per_text = self.embed_seconds / self.embedded if self.embedded else 0.0
+        return {
+            "model": self.model_id,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "embed_seconds": round(self.embed_seconds, 3),
+            "seconds_saved": round(self.hits * seconds_per_text, 3),
+            "evicted": self.evicted,
+        }
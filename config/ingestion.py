@@ -0,0 +1,312 @@
+"""
+Background, incremental website ingestion for the shared knowledge base.
+
+The job starts from the app lifespan (so it never blocks imports or worker
+boot), crawls the configured site and only re-reads/re-embeds pages whose
+content changed. Per-URL freshness data (ETag, Last-Modified, content hash and
+discovered links) is stored in the `metadata` of each page's row in the
+knowledge contents DB, so it survives restarts and is shared by all workers.
+Only one worker crawls: the first to take an exclusive lock on
+KNOWLEDGE_INGESTION_LOCK keeps it for its lifetime, and the others skip.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import httpx
+from agno.utils.log import logger
+from agno.utils.string import generate_id
+from fastapi import APIRouter
+
+from .database import db_file
+
+try:
+    import fcntl
+except ImportError:  # Windows: every worker counts as the leader
+    fcntl = None
+
+KNOWLEDGE_SOURCE_URL = os.getenv("KNOWLEDGE_SOURCE_URL", "https://etugrand.com")
+KNOWLEDGE_MAX_LINKS = int(os.getenv("KNOWLEDGE_MAX_LINKS", "10"))
+KNOWLEDGE_MAX_DEPTH = int(os.getenv("KNOWLEDGE_MAX_DEPTH", "3"))
+# Seconds to wait after startup before crawling, so the server is already serving requests
+KNOWLEDGE_INGESTION_DELAY = float(os.getenv("KNOWLEDGE_INGESTION_DELAY", "5"))
+# Set KNOWLEDGE_INGESTION=false to disable the background crawl entirely
+KNOWLEDGE_INGESTION_ENABLED = os.getenv("KNOWLEDGE_INGESTION", "true").lower() != "false"
+# Lock file electing the worker that runs ingestion, next to the AgentOS database by default
+KNOWLEDGE_INGESTION_LOCK = os.getenv("KNOWLEDGE_INGESTION_LOCK", os.path.splitext(db_file)[0] + "_ingestion.lock")
+
+_SKIPPED_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".zip")
+
+
+@dataclass
+class IngestionProgress:
+    """Progress of the current (or last) ingestion run."""
+
+    state: str = "idle"  # idle, waiting, running, completed, failed, skipped
+    source_url: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    current_url: Optional[str] = None
+    pages_checked: int = 0
+    pages_unchanged: int = 0
+    pages_updated: int = 0
+    pages_failed: int = 0
+    message: Optional[str] = None
+    errors: Dict[str, str] = field(default_factory=dict)
+    embedding_cache: Dict[str, Any] = field(default_factory=dict)
+
+
+def page_content_id(url: str) -> str:
+    """Id of a page's knowledge row (matches Knowledge's id for content named by its URL)."""
+    return generate_id(hashlib.sha256(url.encode()).hexdigest())
+
+
+def extract_page(html: bytes, url: str, primary_domain: str) -> Tuple[str, List[str]]:
+    """Return the main text of a page and the same-site links it contains."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "nav", "footer", "header"]):
+        tag.decompose()
+
+    main = soup.find("main") or soup.find("article") or soup.body or soup
+    text = main.get_text(separator="\n", strip=True)
+
+    links = []
+    for anchor in soup.find_all("a", href=True):
+        link, _ = urldefrag(urljoin(url, str(anchor["href"])))
+        parsed = urlparse(link)
+        if (
+            parsed.scheme in ("http", "https")
+            and parsed.netloc.endswith(primary_domain)
+            and not parsed.path.lower().endswith(_SKIPPED_EXTENSIONS)
+            and link not in links
+        ):
+            links.append(link)
+    return text, links
+
+
+class KnowledgeIngestionJob:
+    """Crawl a website into a Knowledge base, re-embedding only pages that changed."""
+
+    def __init__(
+        self,
+        knowledge: Any,
+        source_url: str = KNOWLEDGE_SOURCE_URL,
+        max_links: int = KNOWLEDGE_MAX_LINKS,
+        max_depth: int = KNOWLEDGE_MAX_DEPTH,
+        timeout: float = 15.0,
+        lock_file: str = KNOWLEDGE_INGESTION_LOCK,
+    ):
+        self.knowledge = knowledge
+        self.source_url = source_url
+        self.max_links = max_links
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.lock_file = lock_file
+        self.progress = IngestionProgress(source_url=source_url)
+        self._task: Optional[asyncio.Task] = None
+        self._leader_lock: Optional[IO] = None
+
+    def is_leader(self) -> bool:
+        """Whether this process runs ingestion; the first worker to ask holds the lock until stop()."""
+        if fcntl is None or self._leader_lock is not None:
+            return True
+        f = open(self.lock_file, "a+b")
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._leader_lock = f
+        return True
+
+    @property
+    def contents_db(self):
+        return self.knowledge.contents_db
+
+    def _get_freshness(self, url: str) -> Dict[str, Any]:
+        row = self.contents_db.get_knowledge_content(page_content_id(url)) if self.contents_db else None
+        if row is None or row.status != "completed":
+            return {}
+        return (row.metadata or {}).get("ingestion", {})
+
+    def _save_freshness(self, url: str, freshness: Dict[str, Any]) -> None:
+        if not self.contents_db:
+            return
+        row = self.contents_db.get_knowledge_content(page_content_id(url))
+        if row is None:
+            return
+        row.metadata = {**(row.metadata or {}), "ingestion": freshness}
+        row.updated_at = int(time.time())
+        self.contents_db.upsert_knowledge_content(knowledge_row=row)
+
+    async def _ingest_page(self, client: httpx.AsyncClient, url: str, primary_domain: str) -> List[str]:
+        """Fetch one page conditionally and (re-)embed it if its content changed. Returns its links."""
+        previous = await asyncio.to_thread(self._get_freshness, url)
+        headers = {}
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+        response = await client.get(url, headers=headers)
+        if response.status_code == 304:
+            self.progress.pages_unchanged += 1
+            return previous.get("links", [])
+        response.raise_for_status()
+
+        text, links = await asyncio.to_thread(extract_page, response.content, url, primary_domain)
+        freshness = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "content_hash": hashlib.sha256(text.encode()).hexdigest(),
+            "links": links,
+            "checked_at": int(time.time()),
+        }
+
+        if previous.get("content_hash") == freshness["content_hash"]:
+            self.progress.pages_unchanged += 1
+        elif text:
+            # Drop the stale chunks of a changed page before embedding its new text
+            if previous and self.knowledge.vector_db is not None:
+                await asyncio.to_thread(self.knowledge.vector_db.delete_by_content_id, page_content_id(url))
+            await self.knowledge.add_content_async(
+                name=url,
+                text_content=text,
+                metadata={"url": url, "source": self.source_url},
+                skip_if_exists=False,
+            )
+            self.progress.pages_updated += 1
+
+        await asyncio.to_thread(self._save_freshness, url, freshness)
+        return links
+
+    async def run(self) -> IngestionProgress:
+        """Run one incremental crawl of the source site."""
+        self.progress = IngestionProgress(source_url=self.source_url, state="running", started_at=time.time())
+
+        if self.knowledge.vector_db is None:
+            self.progress.state = "skipped"
+            self.progress.message = "No vector database configured for the knowledge base"
+            self.progress.finished_at = time.time()
+            logger.info(f"Skipping knowledge ingestion: {self.progress.message}")
+            return self.progress
+
+        if not self.is_leader():
+            self.progress.state = "skipped"
+            self.progress.message = "Another worker runs knowledge ingestion"
+            self.progress.finished_at = time.time()
+            logger.debug(f"Skipping knowledge ingestion: {self.progress.message}")
+            return self.progress
+
+        primary_domain = urlparse(self.source_url).netloc.removeprefix("www.")
+        queue: List[Tuple[str, int]] = [(self.source_url, 1)]
+        visited = set()
+
+        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+            while queue and self.progress.pages_checked < self.max_links:
+                url, depth = queue.pop(0)
+                if url in visited or depth > self.max_depth:
+                    continue
+                visited.add(url)
+                self.progress.current_url = url
+
+                try:
+                    links = await self._ingest_page(client, url, primary_domain)
+                except Exception as e:
+                    self.progress.pages_failed += 1
+                    self.progress.errors[url] = str(e)
+                    logger.warning(f"Knowledge ingestion failed for {url}: {e}")
+                    links = []
+                self.progress.pages_checked += 1
+
+                queue.extend((link, depth + 1) for link in links if link not in visited)
+
+        self.progress.current_url = None
+        self.progress.finished_at = time.time()
+        embedder = getattr(self.knowledge.vector_db, "embedder", None)
+        if hasattr(embedder, "stats"):
+            self.progress.embedding_cache = embedder.stats()
+        if self.progress.pages_checked and self.progress.pages_failed == self.progress.pages_checked:
+            self.progress.state = "failed"
+        else:
+            self.progress.state = "completed"
+        logger.info(
+            f"Knowledge ingestion {self.progress.state}: {self.progress.pages_updated} updated, "
+            f"{self.progress.pages_unchanged} unchanged, {self.progress.pages_failed} failed"
+        )
+        if self.progress.embedding_cache:
+            logger.info(
+                f"Embedding cache hit rate {self.progress.embedding_cache['hit_rate']:.0%}, "
+                f"~{self.progress.embedding_cache['seconds_saved']:.1f}s of embedding saved"
+            )
+        return self.progress
+
+    def start(self, delay: float = KNOWLEDGE_INGESTION_DELAY) -> asyncio.Task:
+        """Schedule a background run on the current event loop (no-op if one is in flight)."""
+        if self._task is not None and not self._task.done():
+            return self._task
+
+        async def delayed_run():
+            self.progress.state = "waiting"
+            await asyncio.sleep(delay)
+            try:
+                await self.run()
+            except Exception as e:
+                self.progress.state = "failed"
+                self.progress.message = str(e)
+                self.progress.finished_at = time.time()
+                logger.error(f"Knowledge ingestion failed: {e}")
+
+        self._task = asyncio.create_task(delayed_run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._leader_lock is not None:
+            self._leader_lock.close()
+            self._leader_lock = None
+
+
+def get_ingestion_router(job: KnowledgeIngestionJob) -> APIRouter:
+    """Endpoints to inspect and re-trigger background knowledge ingestion."""
+    router = APIRouter(prefix="/knowledge/ingestion", tags=["Knowledge"])
+
+    @router.get("")
+    async def get_ingestion_progress() -> Dict[str, Any]:
+        return asdict(job.progress)
+
+    @router.post("")
+    async def trigger_ingestion() -> Dict[str, Any]:
+        job.start(delay=0)
+        return asdict(job.progress)
+
+    return router
+
+
+def ingestion_lifespan(job: KnowledgeIngestionJob):
+    """FastAPI lifespan that runs the ingestion job in the background once the app is up."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Every worker serves the progress endpoint, only the elected one crawls
+        if KNOWLEDGE_INGESTION_ENABLED and job.is_leader():
+            job.start()
+        try:
+            yield
+        finally:
+            await job.stop()
+
+    return lifespan
@@ -0,0 +1,307 @@
+"""
+Tracker for long-running OUINHI media jobs (video edits, speech, captions, ...).
+
+Job-creating MCP tools return a job id straight away and the agent used to
+poll `check_job_status` through LLM tool calls, one model round-trip per
+poll. With `MCPTools(..., job_tracker=media_jobs)` the tracker registers any
+job id a tool returns and polls the server itself with exponential backoff.
+The tool call waits at most MEDIA_JOB_WAIT_SECONDS, so short jobs hand their
+final result back in the same call; longer ones hand back the job id, marked
+as still running, and finish in the background, reported at
+GET /media-jobs/{job_id}. Only those are worth a `check_job_status` call from
+the agent.
+
+Jobs are persisted in a `media_jobs` table of the AgentOS SQLite database,
+so jobs still in flight when the server stops are resumed on the next start.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from agno.tools.function import ToolResult
+from agno.utils.log import log_info, log_warning
+from fastapi import APIRouter, HTTPException
+
+from .database import db_file, storage
+from .mcp import MCPConnectionPool, mcp_pool
+
+# Longest a tool call waits for its job before handing the job id back to the agent
+MEDIA_JOB_WAIT_SECONDS = float(os.getenv("MEDIA_JOB_WAIT_SECONDS", "30"))
+# Give up polling a job after this long
+MEDIA_JOB_MAX_AGE_SECONDS = float(os.getenv("MEDIA_JOB_MAX_AGE_SECONDS", "86400"))
+
+COMPLETED_STATUSES = {"completed", "complete", "succeeded", "success", "successful", "done", "finished"}
+FAILED_STATUSES = {"failed", "failure", "error", "errored", "cancelled", "canceled", "expired", "timeout"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media_jobs (
+    job_id TEXT PRIMARY KEY,
+    transport TEXT NOT NULL,
+    url TEXT NOT NULL,
+    tool_name TEXT,
+    status TEXT NOT NULL,
+    result TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_media_jobs_status ON media_jobs(status);
+"""
+
+
+@dataclass
+class MediaJob:
+    job_id: str
+    transport: str
+    url: str
+    tool_name: Optional[str]
+    status: str
+    result: Optional[Any] = None
+    attempts: int = 0
+    created_at: int = 0
+    updated_at: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in COMPLETED_STATUSES or self.status in FAILED_STATUSES
+
+
+def _parse_json(content: Any) -> Any:
+    if isinstance(content, (dict, list)):
+        return content
+    try:
+        return json.loads(content)
+    except (TypeError, ValueError):
+        return None
+
+
+def _find_key(data: Any, keys: tuple) -> Optional[Any]:
+    """First value for any of `keys`, searching nested dicts breadth first."""
+    queue = [data]
+    while queue:
+        item = queue.pop(0)
+        if isinstance(item, dict):
+            for key in keys:
+                if item.get(key) not in (None, ""):
+                    return item[key]
+            queue.extend(value for value in item.values() if isinstance(value, dict))
+    return None
+
+
+def extract_job_id(content: Any) -> Optional[str]:
+    """Job id in a tool result, if the tool started an asynchronous job."""
+    data = _parse_json(content)
+    if data is not None:
+        job_id = _find_key(data, ("job_id", "jobId"))
+        return str(job_id) if job_id is not None else None
+    match = re.search(r"job[_ ]?id[\"']?\s*[:=]\s*[\"']?([\w-]{6,})", str(content), re.IGNORECASE)
+    return match.group(1) if match else None
+
+
+def extract_status(content: Any) -> Optional[str]:
+    data = _parse_json(content)
+    status = _find_key(data, ("status", "state")) if data is not None else None
+    return str(status).lower() if status is not None else None
+
+
+class MediaJobTracker:
+    """Polls asynchronous MCP jobs with backoff, outside the LLM loop, and persists them."""
+
+    def __init__(
+        self,
+        pool: MCPConnectionPool = mcp_pool,
+        db_file: str = db_file,
+        status_tool: str = "check_job_status",
+        initial_delay: float = 2.0,
+        max_delay: float = 30.0,
+        backoff: float = 1.6,
+    ):
+        self.pool = pool
+        self.db_file = db_file
+        self.status_tool = status_tool
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pollers: Dict[str, asyncio.Task] = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = storage.connect(self.db_file)
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def _save(self, job: MediaJob) -> None:
+        job.updated_at = int(time.time())
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO media_jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.job_id,
+                    job.transport,
+                    job.url,
+                    job.tool_name,
+                    job.status,
+                    json.dumps(job.result, default=str) if job.result is not None else None,
+                    job.attempts,
+                    job.created_at,
+                    job.updated_at,
+                ),
+            )
+            self.conn.commit()
+
+    def _rows(self, where: str = "1", params: tuple = (), limit: int = 100) -> List[MediaJob]:
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM media_jobs WHERE {where} ORDER BY created_at DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [MediaJob(*row[:5], _parse_json(row[5]) if row[5] else None, *row[6:]) for row in rows]
+
+    def get(self, job_id: str) -> Optional[MediaJob]:
+        jobs = self._rows("job_id = ?", (job_id,), limit=1)
+        return jobs[0] if jobs else None
+
+    def list(self, pending_only: bool = False, limit: int = 100) -> List[MediaJob]:
+        if not pending_only:
+            return self._rows(limit=limit)
+        finished = tuple(COMPLETED_STATUSES | FAILED_STATUSES)
+        return self._rows(f"status NOT IN ({', '.join('?' * len(finished))})", finished, limit=limit)
+
+    def track(self, job_id: str, transport: str, url: str, tool_name: Optional[str] = None) -> asyncio.Task:
+        """Register a job and start polling it (no-op if it is already being polled)."""
+        if job_id in self._pollers and not self._pollers[job_id].done():
+            return self._pollers[job_id]
+        job = self.get(job_id)
+        if job is None:
+            now = int(time.time())
+            job = MediaJob(job_id, transport, url, tool_name, "pending", created_at=now)
+            self._save(job)
+        self._pollers[job_id] = asyncio.create_task(self._poll(job))
+        return self._pollers[job_id]
+
+    async def _poll(self, job: MediaJob) -> MediaJob:
+        connection = self.pool.get(job.transport, job.url)
+        delay = self.initial_delay
+        while not job.finished:
+            if time.time() - job.created_at > MEDIA_JOB_MAX_AGE_SECONDS:
+                job.status = "expired"
+                self._save(job)
+                break
+            # Jitter keeps many jobs started together from polling in lockstep
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(delay * self.backoff, self.max_delay)
+            job.attempts += 1
+            try:
+                # A failed poll just waits for the next one; it never reconnects the session other agents share
+                result = await connection.call_tool(self.status_tool, {"job_id": job.job_id}, retry=False)
+                text = "\n".join(getattr(item, "text", "") for item in result.content)
+                job.result = _parse_json(text) or text
+                job.status = extract_status(text) or job.status
+            except Exception as e:
+                log_warning(f"Polling media job {job.job_id} failed, retrying in {delay:.0f}s: {e}")
+            self._save(job)
+        log_info(f"Media job {job.job_id} {job.status} after {job.attempts} polls")
+        self._pollers.pop(job.job_id, None)
+        return job
+
+    async def wait(self, job_id: str, timeout: float = MEDIA_JOB_WAIT_SECONDS) -> MediaJob:
+        """Wait for a tracked job to finish (or `timeout`), returning its latest state."""
+        poller = self._pollers.get(job_id)
+        if poller is not None:
+            try:
+                return await asyncio.wait_for(asyncio.shield(poller), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.get(job_id)  # type: ignore
+
+    def wrap(self, entrypoint: Callable, tool_name: str, transport: str, url: str) -> Callable:
+        """Entrypoint that waits up to MEDIA_JOB_WAIT_SECONDS for any job the tool starts.
+
+        Returns the job's final result, or, if it is still running after that, its id and a note that
+        the status tool can fetch the result later.
+        """
+
+        async def call_and_wait(agent: Any, **kwargs) -> ToolResult:
+            result = await entrypoint(agent=agent, **kwargs)
+            job_id = extract_job_id(result.content)
+            if job_id is None or extract_status(result.content) in COMPLETED_STATUSES | FAILED_STATUSES:
+                return result
+
+            self.track(job_id, transport, url, tool_name)
+            job = await self.wait(job_id)
+            if not job.finished:
+                return ToolResult(
+                    content=f"{result.content}\n\nJob {job_id} is still {job.status}; it keeps being tracked "
+                    f"in the background. Its result is at GET /media-jobs/{job_id} and can be fetched later "
+                    f"with {self.status_tool}."
+                )
+            return ToolResult(
+                content=f"Job {job_id} {job.status}. Final job status:\n{json.dumps(job.result, default=str)}",
+                images=result.images,
+            )
+
+        return call_and_wait
+
+    def resume(self) -> int:
+        """Restart polling for jobs that were still running when the process stopped."""
+        jobs = self.list(pending_only=True, limit=1000)
+        for job in jobs:
+            self.track(job.job_id, job.transport, job.url, job.tool_name)
+        if jobs:
+            log_info(f"Resumed polling {len(jobs)} media jobs")
+        return len(jobs)
+
+    async def stop(self) -> None:
+        pollers = list(self._pollers.values())
+        for poller in pollers:
+            poller.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+        self._pollers = {}
+
+
+media_jobs = MediaJobTracker()
+
+
+def job_tracker_lifespan(tracker: MediaJobTracker = media_jobs):
+    """FastAPI lifespan that resumes persisted jobs on startup and stops polling on shutdown."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        tracker.resume()
+        try:
+            yield
+        finally:
+            await tracker.stop()
+
+    return lifespan
+
+
+def get_jobs_router(tracker: MediaJobTracker = media_jobs) -> APIRouter:
+    """Endpoints to inspect tracked media jobs."""
+    router = APIRouter(prefix="/media-jobs", tags=["Media Jobs"])
+
+    @router.get("")
+    async def list_media_jobs(pending: bool = False, limit: int = 100) -> List[Dict[str, Any]]:
+        return [asdict(job) for job in tracker.list(pending_only=pending, limit=limit)]
+
+    @router.get("/{job_id}")
+    async def get_media_job(job_id: str) -> Dict[str, Any]:
+        job = tracker.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Media job '{job_id}' not found")
+        return asdict(job)
+
+    return router
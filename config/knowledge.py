@@ -1,13 +1,34 @@
 import os
 from agno.knowledge.knowledge import Knowledge
+from agno.vectordb.search import SearchType
 
 # Import database config
 from .database import db
+from .embedding_cache import CachedEmbedder
+from .vector_store import LocalVectorDb
+
+
+def get_vector_db():
+    """Local vector store when sentence-transformers is installed, otherwise no semantic search.
+
+    Embeddings go through a persistent cache, so unchanged chunks are never re-embedded.
+    Searches fuse vector and BM25 keyword rankings, so exact product names and FAQ
+    phrases are found without falling back to web search.
+    """
+    try:
+        from agno.knowledge.embedder.sentence_transformer import SentenceTransformerEmbedder
+    except ImportError:
+        return None
+    return LocalVectorDb(
+        embedder=CachedEmbedder(embedder=SentenceTransformerEmbedder()),
+        search_type=SearchType.hybrid,
+    )
+
 
 # Knowledge base for business operations and strategies
-# Using SQLite database without vector database for development/demo
+# Using SQLite for contents and an in-process mmap vector store for embeddings
 knowledge = Knowledge(
     name="ETUGRAND Operations Knowledge",
     contents_db=db,
-    vector_db=None,  # No vector database for basic functionality
-)
\ No newline at end of file
+    vector_db=get_vector_db(),
+)
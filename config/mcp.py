@@ -0,0 +1,438 @@
+"""
+Process-wide pooled MCP connections.
+
+Every agent used to open its own MCP session to the same server (handshake,
+`list_tools` and an HTTP connection per agent). `MCPConnectionPool` keeps a
+single session per (transport, url) instead: all agents' tool calls are
+multiplexed over it, `list_tools` runs once per connection and each toolkit
+filters that result by its own `include_tools`/`exclude_tools`. A call is
+retried once on a fresh connection only if it failed before the request was
+sent; anything else (timeouts, tool errors, a connection lost mid-call) goes
+back to the caller, since the tool may already have run.
+
+Each session lives in its own background task, because the MCP client's anyio
+contexts must be entered and exited by the same task; that also lets connects
+time out instead of hanging on an unreachable server.
+
+Tool schemas are also cached on disk (`MCPSchemaCache`), keyed by server and
+versioned by the server's reported version plus a hash of the schemas. Toolkits
+come up from the cache without any network round-trip; the connection then
+revalidates in the background and re-registers every toolkit's functions if the
+server's tool list changed. `python -m config.mcp --invalidate [URL]` drops
+cached schemas by hand.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+import weakref
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+import httpx
+from agno.tools.function import Function
+from agno.tools.mcp import MCPTools as AgnoMCPTools
+from agno.utils.log import log_debug, log_error, log_info, log_warning
+from agno.utils.mcp import get_entrypoint_for_tool
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import Tool as MCPTool
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# On-disk cache of MCP tool schemas, so toolkits can start without calling list_tools
+MCP_SCHEMA_CACHE_FILE = os.getenv("MCP_SCHEMA_CACHE_FILE", "tmp/mcp_tool_schemas.json")
+
+
+def create_http_client(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    auth: Optional[httpx.Auth] = None,
+) -> httpx.AsyncClient:
+    """httpx client for MCP transports, using HTTP/2 when `h2` is installed."""
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        http2=HTTP2_AVAILABLE,
+        timeout=timeout or httpx.Timeout(30.0),
+        headers=headers,
+        auth=auth,
+    )
+
+
+class MCPSchemaCache:
+    """Tool schemas per MCP server, persisted as JSON."""
+
+    def __init__(self, path: str = MCP_SCHEMA_CACHE_FILE):
+        self.path = path
+
+    @staticmethod
+    def key(transport: str, url: str) -> str:
+        return f"{transport} {url}"
+
+    @staticmethod
+    def schema_hash(server_version: Optional[str], tools: List[MCPTool]) -> str:
+        payload = json.dumps(
+            {"server_version": server_version, "tools": [tool.model_dump(mode="json") for tool in tools]},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, transport: str, url: str) -> Optional[Tuple[str, List[MCPTool]]]:
+        """Cached (schema hash, tools) for a server, if any."""
+        entry = self._read().get(self.key(transport, url))
+        if not entry:
+            return None
+        try:
+            return entry["schema_hash"], [MCPTool.model_validate(tool) for tool in entry["tools"]]
+        except Exception as e:
+            log_warning(f"Ignoring unreadable MCP schema cache entry for {url}: {e}")
+            return None
+
+    def put(self, transport: str, url: str, server_version: Optional[str], tools: List[MCPTool]) -> str:
+        schema_hash = self.schema_hash(server_version, tools)
+        entries = self._read()
+        entries[self.key(transport, url)] = {
+            "server_version": server_version,
+            "schema_hash": schema_hash,
+            "fetched_at": int(time.time()),
+            "tools": [tool.model_dump(mode="json") for tool in tools],
+        }
+        self._write(entries)
+        return schema_hash
+
+    def invalidate(self, url: Optional[str] = None) -> int:
+        """Drop cached schemas for one server URL (or all). Returns the number removed."""
+        entries = self._read()
+        keep = {key: entry for key, entry in entries.items() if url is not None and key.split(" ", 1)[1] != url}
+        self._write(keep)
+        return len(entries) - len(keep)
+
+
+# Raised before a request leaves: by a refused connect, or by writing to a session whose stream is closed
+_NOT_SENT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, httpx.ConnectError, ConnectionRefusedError)
+
+
+def _not_sent(error: BaseException) -> bool:
+    """Whether `error` means the request never reached the server, so it is safe to send again."""
+    if isinstance(error, BaseExceptionGroup):
+        return all(_not_sent(inner) for inner in error.exceptions)
+    return isinstance(error, _NOT_SENT_ERRORS)
+
+
+class MCPConnection:
+    """A single shared MCP session to one server, reconnected on demand."""
+
+    def __init__(
+        self,
+        transport: str,
+        url: str,
+        timeout_seconds: int = 10,
+        connect_timeout: float = 30,
+        schema_cache: Optional[MCPSchemaCache] = None,
+    ):
+        self.transport = transport
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+        self.connect_timeout = connect_timeout
+        self.schema_cache = schema_cache
+        self.tools: List[MCPTool] = []
+        self.schema_hash: Optional[str] = None
+        self.toolkits: "weakref.WeakSet[MCPTools]" = weakref.WeakSet()
+        self.connects = 0
+        self.calls = 0
+        self._revalidation: Optional[asyncio.Task] = None
+
+        self._session: Optional[ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._session is not None
+
+    def _transport_context(self):
+        if self.transport == "sse":
+            return sse_client(url=self.url, httpx_client_factory=create_http_client)
+        return streamablehttp_client(url=self.url, httpx_client_factory=create_http_client)
+
+    async def _run(self, ready: asyncio.Future, closing: asyncio.Event) -> None:
+        """Own the transport and session for their whole lifetime."""
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = (await stack.enter_async_context(self._transport_context()))[0:2]
+                session = await stack.enter_async_context(
+                    ClientSession(read, write, read_timeout_seconds=timedelta(seconds=self.timeout_seconds))
+                )
+                initialize_result = await session.initialize()
+                self._update_tools(initialize_result.serverInfo.version, (await session.list_tools()).tools)
+                ready.set_result(session)
+                await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                log_warning(f"MCP connection to {self.url} closed: {e}")
+        finally:
+            if not ready.done():
+                ready.cancel()
+            if self._closing is closing:
+                self._session = None
+
+    async def session(self) -> ClientSession:
+        """The live session, connecting (once, for all concurrent callers) if needed."""
+        async with self._lock:
+            if self._session is not None:
+                return self._session
+
+            ready = asyncio.get_running_loop().create_future()
+            self._closing = asyncio.Event()
+            self._task = asyncio.create_task(self._run(ready, self._closing))
+            try:
+                self._session = await asyncio.wait_for(asyncio.shield(ready), self.connect_timeout)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                raise ConnectionError(f"Timed out connecting to MCP server {self.url}")
+            self.connects += 1
+            log_info(f"Connected to MCP server {self.url} ({len(self.tools)} tools)")
+            return self._session
+
+    def _update_tools(self, server_version: Optional[str], tools: List[MCPTool]) -> None:
+        """Adopt the server's current tool list, refreshing toolkits if the schemas changed."""
+        if self.schema_cache is not None:
+            schema_hash = self.schema_cache.put(self.transport, self.url, server_version, tools)
+        else:
+            schema_hash = MCPSchemaCache.schema_hash(server_version, tools)
+        changed = self.schema_hash is not None and schema_hash != self.schema_hash
+        self.tools, self.schema_hash = tools, schema_hash
+        if changed:
+            log_info(f"MCP tool schemas changed on {self.url}, refreshing {len(self.toolkits)} toolkits")
+            for toolkit in list(self.toolkits):
+                toolkit.refresh_tools(tools)
+
+    async def get_tools(self) -> List[MCPTool]:
+        """Tool schemas, from memory, the on-disk cache (revalidated in the background) or the server."""
+        if self.tools:
+            return self.tools
+        cached = self.schema_cache.get(self.transport, self.url) if self.schema_cache is not None else None
+        if cached is not None:
+            self.schema_hash, self.tools = cached
+            if self._revalidation is None or self._revalidation.done():
+                self._revalidation = asyncio.create_task(self._revalidate())
+            return self.tools
+        await self.session()
+        return self.tools
+
+    async def _revalidate(self) -> None:
+        try:
+            await self.session()
+        except Exception as e:
+            log_warning(f"Could not revalidate cached MCP tool schemas for {self.url}: {e}")
+
+    async def _call(self, session: ClientSession, name: str, arguments: Optional[Dict[str, Any]]):
+        """Call a tool, failing fast if the connection task dies while the call is in flight."""
+        connection_task = self._task
+        call = asyncio.ensure_future(session.call_tool(name, arguments))
+        try:
+            if connection_task is not None:
+                await asyncio.wait({call, connection_task}, return_when=asyncio.FIRST_COMPLETED)
+                if not call.done():
+                    raise ConnectionError(f"MCP connection to {self.url} closed")
+            return await call
+        finally:
+            if not call.done():
+                call.cancel()
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, retry: bool = True):
+        """Call a tool over the shared session.
+
+        Only failures that happen before the request is sent (a refused connect, a
+        session whose stream is already closed) are retried, once. Timeouts, tool
+        errors and connections lost mid-call reach the caller, because the tool may
+        already have run and OUINHI and Postiz tools are not idempotent. With
+        `retry=False` every failure reaches the caller and the session is left alone.
+        """
+        self.calls += 1
+        if not retry:
+            return await self._call(await self.session(), name, arguments)
+        for attempt in range(2):
+            try:
+                session = await self.session()
+            except Exception as e:
+                if attempt or not _not_sent(e):
+                    raise
+                log_warning(f"Connecting to MCP server {self.url} failed ({e}), retrying")
+                continue
+            try:
+                return await self._call(session, name, arguments)
+            except Exception as e:
+                if attempt or not _not_sent(e):
+                    raise
+                log_warning(f"MCP session to {self.url} was closed before '{name}' was sent, reconnecting")
+                # Its stream is closed, so the session cannot carry any other call either
+                await self.close(session)
+        raise ConnectionError(f"MCP server {self.url} is unreachable")
+
+    async def close(self, session: Optional[ClientSession] = None) -> None:
+        """Close the connection (only if it is still `session`, when given)."""
+        async with self._lock:
+            if session is not None and session is not self._session:
+                return
+            task, closing = self._task, self._closing
+            self._session, self._task, self._closing = None, None, None
+        if closing is not None:
+            closing.set()
+        if task is not None:
+            _, pending = await asyncio.wait({task}, timeout=5)
+            for stuck in pending:
+                stuck.cancel()
+
+
+class MCPConnectionPool:
+    """MCP connections shared by every toolkit in the process, keyed by (transport, url)."""
+
+    def __init__(self, schema_cache: Optional[MCPSchemaCache] = None):
+        self.schema_cache = schema_cache
+        self._connections: Dict[Tuple[str, str], MCPConnection] = {}
+
+    def get(self, transport: str, url: str, timeout_seconds: int = 10) -> MCPConnection:
+        key = (transport, url)
+        if key not in self._connections:
+            self._connections[key] = MCPConnection(
+                transport, url, timeout_seconds=timeout_seconds, schema_cache=self.schema_cache
+            )
+        return self._connections[key]
+
+    async def invalidate(self, url: Optional[str] = None) -> None:
+        """Forget cached schemas and reconnect, so the next use lists tools from the server again."""
+        if self.schema_cache is not None:
+            self.schema_cache.invalidate(url)
+        for connection in list(self._connections.values()):
+            if url is None or connection.url == url:
+                await connection.close()
+                connection.tools = []
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {"transport": c.transport, "url": c.url, "connected": c.connected, "connects": c.connects, "calls": c.calls}
+            for c in self._connections.values()
+        ]
+
+    async def close(self) -> None:
+        for connection in list(self._connections.values()):
+            await connection.close()
+
+
+mcp_pool = MCPConnectionPool(schema_cache=MCPSchemaCache())
+
+
+class MCPTools(AgnoMCPTools):
+    """Drop-in MCPTools whose url-based connections go through the shared `mcp_pool`.
+
+    Keeps the `MCPTools` class name, which AgentOS and agno use to recognise MCP toolkits.
+    """
+
+    def __init__(self, *args, pool: Optional[MCPConnectionPool] = None, job_tracker: Optional[Any] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = pool or mcp_pool
+        # Waits for asynchronous jobs started by these tools (see config/jobs.py)
+        self.job_tracker = job_tracker
+        self._connection: Optional[MCPConnection] = None
+
+    @property
+    def pooled(self) -> bool:
+        return self.transport in ("sse", "streamable-http") and self.url is not None and self.server_params is None
+
+    async def _connect(self) -> None:
+        if self._initialized:
+            return
+        if not self.pooled:
+            await super()._connect()
+            return
+
+        self._connection = self.pool.get(self.transport, self.url, self.timeout_seconds)  # type: ignore
+        self._connection.toolkits.add(self)
+        self._register_tools(await self._connection.get_tools())
+
+    def refresh_tools(self, available_tools: List[MCPTool]) -> None:
+        """Re-register functions after the server's tool list changed."""
+        functions = self.functions
+        self.functions = {}
+        try:
+            self._register_tools(available_tools)
+        except ValueError as e:
+            self.functions = functions
+            log_error(f"Keeping previous MCP tools for {self.url}: {e}")
+
+    def _register_tools(self, available_tools: List[MCPTool]) -> None:
+        self._check_tools_filters(
+            available_tools=[tool.name for tool in available_tools],
+            include_tools=self.include_tools,
+            exclude_tools=self.exclude_tools,
+        )
+        for tool in available_tools:
+            if self.exclude_tools and tool.name in self.exclude_tools:
+                continue
+            if self.include_tools is not None and tool.name not in self.include_tools:
+                continue
+            # The connection stands in for the session, so calls survive reconnects
+            entrypoint = get_entrypoint_for_tool(tool, self._connection)  # type: ignore
+            if self.job_tracker is not None and tool.name != self.job_tracker.status_tool:
+                entrypoint = self.job_tracker.wrap(entrypoint, tool.name, self.transport, self.url)
+            self.functions[tool.name] = Function(
+                name=tool.name,
+                description=tool.description,
+                parameters=tool.inputSchema,
+                entrypoint=entrypoint,
+                skip_entrypoint_processing=True,
+            )
+        log_debug(f"{self.name} initialized with {len(self.functions)} pooled tools from {self.url}")
+        self._initialized = True
+
+    async def close(self) -> None:
+        # The pooled connection is shared with other toolkits and closed with the pool
+        if self.pooled:
+            self._initialized = False
+            return
+        await super().close()
+
+    async def __aexit__(self, _exc_type, _exc_val, _exc_tb):
+        await self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the on-disk MCP tool schema cache")
+    parser.add_argument("--invalidate", nargs="?", const="", metavar="URL", help="Drop cached schemas (all, or one server)")
+    args = parser.parse_args()
+    cache = MCPSchemaCache()
+    if args.invalidate is not None:
+        removed = cache.invalidate(args.invalidate or None)
+        print(f"✅ Removed {removed} cached MCP schema entries from {cache.path}")
+    else:
+        for key, entry in cache._read().items():
+            print(f"{key}: {len(entry['tools'])} tools, version {entry['server_version']}, hash {entry['schema_hash'][:12]}")
@@ -0,0 +1,474 @@
+"""
+Process-wide scheduler for OpenRouter calls.
+
+Every agent and team used to call OpenRouter through its own client, so a
+burst of workflow runs hit the provider's rate limits and each call retried
+on its own. `ScheduledOpenRouter` (a drop-in for `OpenRouter`) takes a slot
+from `model_scheduler` before each request:
+
+- per model id, at most `rpm` requests and `tpm` tokens (prompt estimate plus
+  `max_tokens`, corrected with the reported usage) start in any 60 seconds,
+  and at most `max_concurrency` are in flight;
+- waiting calls are served by priority: interactive requests (agent and team
+  chats) before background ones (workflow runs, see
+  `ModelPriorityMiddleware` and `model_priority`);
+- rate-limit headers on every response (`Retry-After`, `X-RateLimit-Reset`
+  once `X-RateLimit-Remaining` hits 0) pause the model for everyone, and
+  calls rejected with 429 are retried after the pause.
+
+Limits come from OPENROUTER_RPM / OPENROUTER_TPM / OPENROUTER_MAX_CONCURRENCY,
+with per-model overrides in OPENROUTER_MODEL_LIMITS (JSON, e.g.
+'{"deepseek/deepseek-r1": {"rpm": 20}}'). Queue depths, waits and rate-limit
+counts are at GET /llm-scheduler.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Type, Union
+
+import httpx
+from agno.exceptions import ModelProviderError
+from agno.models.message import Message
+from agno.models.openrouter import OpenRouter
+from agno.models.response import ModelResponse
+from agno.run.agent import RunOutput
+from agno.utils.log import log_debug, logger
+from fastapi import APIRouter
+from openai import AsyncOpenAI as AsyncOpenAIClient
+from openai import OpenAI as OpenAIClient
+from pydantic import BaseModel
+
+from .prompt_budget import estimate_tokens
+
+OPENROUTER_RPM = int(os.getenv("OPENROUTER_RPM", "60"))
+OPENROUTER_TPM = int(os.getenv("OPENROUTER_TPM", "200000"))
+OPENROUTER_MAX_CONCURRENCY = int(os.getenv("OPENROUTER_MAX_CONCURRENCY", "8"))
+OPENROUTER_MODEL_LIMITS = json.loads(os.getenv("OPENROUTER_MODEL_LIMITS", "{}"))
+# Times a call rejected with 429 is retried after the model's pause
+OPENROUTER_RATE_LIMIT_RETRIES = int(os.getenv("OPENROUTER_RATE_LIMIT_RETRIES", "3"))
+
+_WINDOW_SECONDS = 60.0
+_MAX_PAUSE_SECONDS = 120.0
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_priority: ContextVar[Priority] = ContextVar("model_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def model_priority(priority: Priority) -> Iterator[None]:
+    """Run model calls made in this context (and tasks started from it) at `priority`."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass
+class ModelLimits:
+    rpm: int = OPENROUTER_RPM
+    tpm: int = OPENROUTER_TPM
+    max_concurrency: int = OPENROUTER_MAX_CONCURRENCY
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    notify: Callable[[], None] = field(compare=False)
+    entry: Optional[List[float]] = field(default=None, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+@dataclass
+class _ModelState:
+    limits: ModelLimits
+    window: Deque[List[float]] = field(default_factory=deque)
+    waiters: List[_Waiter] = field(default_factory=list)
+    in_flight: int = 0
+    paused_until: float = 0.0
+    rate_limit_streak: int = 0
+    timer: Optional[threading.Timer] = None
+    timer_at: float = 0.0
+    counts: Counter = field(default_factory=Counter)
+    wait_seconds: float = 0.0
+
+
+class ModelScheduler:
+    """Request/token budgets, concurrency caps and priority queues per model id."""
+
+    def __init__(self, default_limits: Optional[ModelLimits] = None, overrides: Optional[Dict[str, Dict]] = None):
+        self.default_limits = default_limits or ModelLimits()
+        self.overrides = overrides if overrides is not None else OPENROUTER_MODEL_LIMITS
+        self._lock = threading.Lock()
+        self._models: Dict[str, _ModelState] = {}
+        self._seq = itertools.count()
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            limits = ModelLimits(**{**self.default_limits.__dict__, **self.overrides.get(model, {})})
+            state = self._models[model] = _ModelState(limits=limits)
+        return state
+
+    def _delay(self, state: _ModelState, tokens: int, now: float) -> float:
+        """Seconds until a call of `tokens` may start (inf: when another call finishes)."""
+        while state.window and state.window[0][0] <= now - _WINDOW_SECONDS:
+            state.window.popleft()
+        if now < state.paused_until:
+            return state.paused_until - now
+        if state.in_flight >= state.limits.max_concurrency:
+            return float("inf")
+        if len(state.window) >= state.limits.rpm:
+            return state.window[0][0] + _WINDOW_SECONDS - now
+        used = sum(entry[1] for entry in state.window)
+        if state.window and used + tokens > state.limits.tpm:
+            freed = 0.0
+            for started, spent in state.window:
+                freed += spent
+                if used - freed + tokens <= state.limits.tpm:
+                    return started + _WINDOW_SECONDS - now
+            return state.window[-1][0] + _WINDOW_SECONDS - now
+        return 0.0
+
+    def _dispatch(self, model: str) -> None:
+        """Start as many waiting calls as the budgets allow, highest priority first."""
+        with self._lock:
+            state = self._state(model)
+            now = time.time()
+            while state.waiters:
+                waiter = state.waiters[0]
+                if waiter.cancelled:
+                    heapq.heappop(state.waiters)
+                    continue
+                delay = self._delay(state, waiter.tokens, now)
+                if delay > 0:
+                    if delay != float("inf"):
+                        self._wake_in(model, state, delay)
+                    break
+                heapq.heappop(state.waiters)
+                waiter.entry = [now, float(waiter.tokens)]
+                state.window.append(waiter.entry)
+                state.in_flight += 1
+                waiter.notify()
+
+    def _wake_in(self, model: str, state: _ModelState, delay: float) -> None:
+        at = time.time() + delay
+        if state.timer is not None and state.timer.is_alive() and state.timer_at <= at:
+            return
+        if state.timer is not None:
+            state.timer.cancel()
+        state.timer = threading.Timer(delay, self._dispatch, (model,))
+        state.timer.daemon = True
+        state.timer_at = at
+        state.timer.start()
+
+    def _enqueue(self, model: str, tokens: int, priority: Priority, notify: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(int(priority), next(self._seq), tokens, notify)
+        with self._lock:
+            state = self._state(model)
+            state.counts[f"requests_{priority.name.lower()}"] += 1
+            heapq.heappush(state.waiters, waiter)
+        self._dispatch(model)
+        return waiter
+
+    def _release(self, model: str, waiter: _Waiter, tokens_used: Optional[int], waited: float) -> None:
+        with self._lock:
+            state = self._state(model)
+            state.in_flight -= 1
+            state.counts["completed"] += 1
+            state.wait_seconds += waited
+            if tokens_used is not None and waiter.entry is not None:
+                waiter.entry[1] = float(tokens_used)
+        self._dispatch(model)
+
+    def _cancel(self, model: str, waiter: _Waiter) -> None:
+        with self._lock:
+            waiter.cancelled = True
+            granted = waiter.entry is not None
+        if granted:
+            self._release(model, waiter, None, 0.0)
+
+    @asynccontextmanager
+    async def slot(self, model: str, tokens: int, priority: Optional[Priority] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Wait for a slot for one call; set "tokens" in the yielded dict to the actual usage."""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def notify():
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        start = time.perf_counter()
+        waiter = self._enqueue(model, tokens, priority if priority is not None else _priority.get(), notify)
+        try:
+            await granted
+        except BaseException:
+            self._cancel(model, waiter)
+            raise
+        usage: Dict[str, Any] = {"tokens": None}
+        try:
+            yield usage
+        finally:
+            self._release(model, waiter, usage["tokens"], time.perf_counter() - start)
+
+    @contextmanager
+    def slot_sync(self, model: str, tokens: int, priority: Optional[Priority] = None) -> Iterator[Dict[str, Any]]:
+        """Blocking `slot` for synchronous model calls."""
+        granted = threading.Event()
+        start = time.perf_counter()
+        waiter = self._enqueue(model, tokens, priority if priority is not None else _priority.get(), granted.set)
+        try:
+            granted.wait()
+        except BaseException:
+            self._cancel(model, waiter)
+            raise
+        usage: Dict[str, Any] = {"tokens": None}
+        try:
+            yield usage
+        finally:
+            self._release(model, waiter, usage["tokens"], time.perf_counter() - start)
+
+    def observe(self, model: str, status_code: int, headers: httpx.Headers) -> None:
+        """Pause a model when a response says its rate limit is exhausted."""
+        now = time.time()
+        pause = None
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                pause = float(retry_after)
+            except ValueError:
+                try:
+                    pause = parsedate_to_datetime(retry_after).timestamp() - now
+                except (TypeError, ValueError):
+                    pause = None
+        if pause is None and (status_code == 429 or headers.get("x-ratelimit-remaining") == "0"):
+            reset = headers.get("x-ratelimit-reset")
+            if reset:
+                try:
+                    reset_at = float(reset)
+                    # OpenRouter reports the reset as epoch milliseconds
+                    pause = (reset_at / 1000 if reset_at > 1e11 else reset_at) - now
+                except ValueError:
+                    pause = None
+
+        with self._lock:
+            state = self._state(model)
+            if status_code == 429:
+                state.counts["rate_limited"] += 1
+                state.rate_limit_streak += 1
+                if pause is None:
+                    pause = min(2.0**state.rate_limit_streak, _MAX_PAUSE_SECONDS)
+            elif 200 <= status_code < 300:
+                state.rate_limit_streak = 0
+            if pause is None or pause <= 0:
+                return
+            state.paused_until = max(state.paused_until, now + min(pause, _MAX_PAUSE_SECONDS))
+        log_debug(f"Pausing {model} calls for {pause:.1f}s (HTTP {status_code})")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth by priority, in-flight calls, budget use and rate limits per model."""
+        now = time.time()
+        models = {}
+        with self._lock:
+            for model, state in self._models.items():
+                self._delay(state, 0, now)
+                waiting = [waiter for waiter in state.waiters if not waiter.cancelled]
+                completed = state.counts["completed"]
+                models[model] = {
+                    "limits": state.limits.__dict__,
+                    "queued": {
+                        priority.name.lower(): sum(1 for waiter in waiting if waiter.priority == priority)
+                        for priority in Priority
+                    },
+                    "in_flight": state.in_flight,
+                    "requests_last_minute": len(state.window),
+                    "tokens_last_minute": int(sum(entry[1] for entry in state.window)),
+                    "paused_for_seconds": round(max(0.0, state.paused_until - now), 1),
+                    "mean_wait_seconds": round(state.wait_seconds / completed, 3) if completed else 0.0,
+                    **state.counts,
+                }
+        return {"models": models}
+
+
+model_scheduler = ModelScheduler()
+
+
+def _request_model(request: httpx.Request) -> Optional[str]:
+    try:
+        return json.loads(request.content).get("model")
+    except Exception:
+        return None
+
+
+def _observe_response(response: httpx.Response) -> None:
+    model = _request_model(response.request)
+    if model:
+        model_scheduler.observe(model, response.status_code, response.headers)
+
+
+async def _aobserve_response(response: httpx.Response) -> None:
+    _observe_response(response)
+
+
+class ModelPriorityMiddleware:
+    """ASGI middleware that runs model calls of workflow requests at background priority."""
+
+    def __init__(self, app, background_prefixes: tuple = ("/workflows",)):
+        self.app = app
+        self.background_prefixes = background_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.background_prefixes):
+            with model_priority(Priority.BACKGROUND):
+                await self.app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+@dataclass
+class ScheduledOpenRouter(OpenRouter):
+    """OpenRouter model whose calls go through the process-wide `model_scheduler`."""
+
+    scheduler: Optional[ModelScheduler] = None
+    priority: Optional[Priority] = None
+
+    @property
+    def model_scheduler(self) -> ModelScheduler:
+        return self.scheduler or model_scheduler
+
+    def get_client(self) -> OpenAIClient:
+        if self.http_client is not None:
+            return super().get_client()
+        return OpenAIClient(
+            **self._get_client_params(), http_client=httpx.Client(event_hooks={"response": [_observe_response]})
+        )
+
+    def get_async_client(self) -> AsyncOpenAIClient:
+        if self.http_client is not None:
+            return super().get_async_client()
+        return AsyncOpenAIClient(
+            **self._get_client_params(),
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+                event_hooks={"response": [_aobserve_response]},
+            ),
+        )
+
+    def _estimate(self, messages: List[Message]) -> int:
+        prompt = sum(estimate_tokens(message.get_content_string()) for message in messages)
+        return prompt + (self.max_tokens or 1024)
+
+    @staticmethod
+    def _used(response: ModelResponse) -> Optional[int]:
+        usage = response.response_usage
+        return usage.total_tokens if usage is not None and usage.total_tokens else None
+
+    @staticmethod
+    def _rate_limited(error: ModelProviderError, attempt: int) -> bool:
+        return error.status_code == 429 and attempt < OPENROUTER_RATE_LIMIT_RETRIES
+
+    def invoke(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[RunOutput] = None,
+    ) -> ModelResponse:
+        for attempt in itertools.count():
+            with self.model_scheduler.slot_sync(self.id, self._estimate(messages), self.priority) as usage:
+                try:
+                    response = super().invoke(
+                        messages, assistant_message, response_format, tools, tool_choice, run_response
+                    )
+                except ModelProviderError as e:
+                    if not self._rate_limited(e, attempt):
+                        raise
+                    logger.warning(f"{self.id} rate limited, retrying after the scheduler's pause")
+                    continue
+                usage["tokens"] = self._used(response)
+                return response
+
+    async def ainvoke(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[RunOutput] = None,
+    ) -> ModelResponse:
+        for attempt in itertools.count():
+            async with self.model_scheduler.slot(self.id, self._estimate(messages), self.priority) as usage:
+                try:
+                    response = await super().ainvoke(
+                        messages, assistant_message, response_format, tools, tool_choice, run_response
+                    )
+                except ModelProviderError as e:
+                    if not self._rate_limited(e, attempt):
+                        raise
+                    logger.warning(f"{self.id} rate limited, retrying after the scheduler's pause")
+                    continue
+                usage["tokens"] = self._used(response)
+                return response
+
+    def invoke_stream(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[RunOutput] = None,
+    ) -> Iterator[ModelResponse]:
+        with self.model_scheduler.slot_sync(self.id, self._estimate(messages), self.priority) as usage:
+            for delta in super().invoke_stream(
+                messages, assistant_message, response_format, tools, tool_choice, run_response
+            ):
+                usage["tokens"] = self._used(delta) or usage["tokens"]
+                yield delta
+
+    async def ainvoke_stream(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[RunOutput] = None,
+    ) -> AsyncIterator[ModelResponse]:
+        async with self.model_scheduler.slot(self.id, self._estimate(messages), self.priority) as usage:
+            async for delta in super().ainvoke_stream(
+                messages, assistant_message, response_format, tools, tool_choice, run_response
+            ):
+                usage["tokens"] = self._used(delta) or usage["tokens"]
+                yield delta
+
+
+def get_model_scheduler_router(scheduler: ModelScheduler = model_scheduler) -> APIRouter:
+    """Endpoint to inspect the model call scheduler."""
+    router = APIRouter(prefix="/llm-scheduler", tags=["LLM Scheduler"])
+
+    @router.get("")
+    async def get_llm_scheduler_stats() -> Dict[str, Any]:
+        return scheduler.stats()
+
+    return router
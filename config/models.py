@@ -0,0 +1,21 @@
+"""
+Model ids shared by the component modules and config/registry.py.
+
+Components build their models from these names and the registry declares the
+same names, so /models and the listings match what a run will use without
+importing the component. `python -m config.registry` checks they agree.
+"""
+
+import os
+
+OPENROUTER = "OpenRouter"
+GOOGLE = "Google"
+
+# General-purpose agents
+DEFAULT_MODEL = os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")
+# Chat-heavy agents and team leaders
+FAST_MODEL = os.getenv("OPENROUTER_MODEL_NAME", "anthropic/claude-3-haiku")
+# Pinned for components that rely on its reasoning, whatever OPENROUTER_MODEL_NAME says
+REASONING_MODEL = "deepseek/deepseek-r1"
+# Content team leader when the Gemini SDK is installed
+GEMINI_MODEL = "gemini-2.5-flash"
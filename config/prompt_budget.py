@@ -0,0 +1,163 @@
+"""
+Token budgeting for the payloads workflows pass from one phase to the next.
+
+The blog writer used to receive every scraped article in full, as indented
+JSON, and the startup validator pasted each phase's complete output into the
+next prompt, so input tokens grew with every source. The helpers here keep
+those payloads under a budget without another model call:
+
+- `estimate_tokens` counts words and punctuation, which tracks BPE token
+  counts of English prose closely enough for budgeting;
+- `compact_sources` drops paragraphs repeated across sources (exact or near
+  duplicates), scores the rest against the topic with BM25 and keeps the best
+  paragraphs of each source, in their original order, within the budget;
+- `compact_text` does the same for a single block of text;
+- `compact_json` serializes without pretty-print whitespace;
+- `log_prompt_size` logs the estimated size of each phase's prompt.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+from agno.utils.log import logger
+
+# Token budget for all scraped sources sent to the blog writer together
+WRITER_SOURCE_TOKEN_BUDGET = int(os.getenv("WRITER_SOURCE_TOKEN_BUDGET", "6000"))
+# Token budget for each earlier phase's field pasted into a later phase's prompt
+PHASE_FIELD_TOKEN_BUDGET = int(os.getenv("PHASE_FIELD_TOKEN_BUDGET", "500"))
+# Paragraphs sharing at least this fraction of their words are treated as duplicates
+DUPLICATE_SIMILARITY = float(os.getenv("DUPLICATE_SIMILARITY", "0.8"))
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WORD_RE = re.compile(r"\w+")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a prompt (words plus punctuation)."""
+    return len(_TOKEN_RE.findall(text or ""))
+
+
+def _terms(text: str) -> List[str]:
+    return [word for word in _WORD_RE.findall(text.casefold()) if word not in _STOPWORDS]
+
+
+def _split(text: str) -> List[str]:
+    """Paragraphs of a text, or its sentences when it is a single paragraph."""
+    parts = [part.strip() for part in _PARAGRAPH_RE.split(text or "") if part.strip()]
+    if len(parts) == 1:
+        parts = [part.strip() for part in _SENTENCE_RE.split(parts[0]) if part.strip()]
+    return parts
+
+
+def _similar(a: set, b: set) -> bool:
+    if min(len(a), len(b)) < 5:
+        return a == b
+    return len(a & b) / min(len(a), len(b)) >= DUPLICATE_SIMILARITY
+
+
+def _bm25(passages: List[List[str]], query: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    if not passages:
+        return []
+    average = sum(len(terms) for terms in passages) / len(passages) or 1.0
+    frequency = Counter(term for terms in passages for term in set(terms))
+    scores = []
+    for terms in passages:
+        counts = Counter(terms)
+        score = 0.0
+        for term in set(query):
+            if counts[term]:
+                idf = math.log(1 + (len(passages) - frequency[term] + 0.5) / (frequency[term] + 0.5))
+                score += idf * counts[term] * (k1 + 1) / (counts[term] + k1 * (1 - b + b * len(terms) / average))
+        scores.append(score)
+    return scores
+
+
+def _select(passages: List[str], scores: List[float], budget: int) -> List[str]:
+    """Highest scoring passages that fit in `budget` tokens, in their original order."""
+    # Earlier passages win ties: leads and introductions tend to carry the point of the piece
+    ranked = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+    chosen: Dict[int, str] = {}
+    used = 0
+    for index in ranked:
+        tokens = estimate_tokens(passages[index])
+        if used + tokens <= budget:
+            chosen[index] = passages[index]
+            used += tokens
+        elif not chosen and budget > 0:
+            # The best passage does not fit whole: keep as much of it as the budget allows
+            chosen[index] = " ".join(passages[index].split()[: max(1, int(budget * 0.75))])
+            used = budget
+    return [chosen[i] for i in sorted(chosen)]
+
+
+def compact_text(text: Optional[str], query: str, budget: int = PHASE_FIELD_TOKEN_BUDGET) -> str:
+    """The paragraphs (or sentences) of `text` most relevant to `query` that fit in `budget` tokens."""
+    if not text or estimate_tokens(text) <= budget:
+        return text or ""
+    passages = _split(text)
+    return "\n\n".join(_select(passages, _bm25([_terms(p) for p in passages], _terms(query)), budget))
+
+
+def compact_sources(
+    sources: Sequence[Dict[str, Any]],
+    query: str,
+    budget: int = WRITER_SOURCE_TOKEN_BUDGET,
+    text_key: str = "content",
+) -> List[Dict[str, Any]]:
+    """Copies of `sources` whose `text_key` keeps only non-duplicate, relevant paragraphs.
+
+    The budget is shared evenly; what a short source does not use goes to the longer ones.
+    """
+    seen: List[set] = []
+    paragraphs: List[List[str]] = []
+    for source in sources:
+        kept = []
+        for paragraph in _split(source.get(text_key) or ""):
+            words = set(_terms(paragraph))
+            if any(_similar(words, other) for other in seen):
+                continue
+            seen.append(words)
+            kept.append(paragraph)
+        paragraphs.append(kept)
+
+    all_passages = [p for kept in paragraphs for p in kept]
+    all_scores = iter(_bm25([_terms(p) for p in all_passages], _terms(query)))
+    scores = [[next(all_scores) for _ in kept] for kept in paragraphs]
+
+    # Hand out the budget shortest source first, so unused shares roll over to longer ones
+    sizes = [sum(estimate_tokens(p) for p in kept) for kept in paragraphs]
+    shares = [0] * len(sources)
+    remaining = budget
+    for position, index in enumerate(sorted(range(len(sources)), key=lambda i: sizes[i])):
+        shares[index] = min(sizes[index], remaining // (len(sources) - position))
+        remaining -= shares[index]
+
+    compacted = []
+    for source, kept, kept_scores, share in zip(sources, paragraphs, scores, shares):
+        compacted.append({**source, text_key: "\n\n".join(_select(kept, kept_scores, share)) or None})
+    return compacted
+
+
+def compact_json(value: Any) -> str:
+    """JSON without indentation or spaces after separators."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def log_prompt_size(phase: str, prompt: str, before: Optional[int] = None) -> int:
+    """Log the estimated tokens of a phase's prompt (and what compaction saved) and return them."""
+    tokens = estimate_tokens(prompt)
+    if before is not None and before > tokens:
+        logger.info(f"{phase}: ~{tokens} prompt tokens (compacted from ~{before})")
+    else:
+        logger.info(f"{phase}: ~{tokens} prompt tokens")
+    return tokens
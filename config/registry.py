@@ -0,0 +1,556 @@
+"""
+Lazy agent/team/workflow registry for AgentOS.
+
+Every component is registered up front under a stable id with its name,
+description, model and an import path. AgentOS receives LazyComponent stand-ins
+that answer metadata lookups from the spec: the listing, detail, /models and
+/config routes are served from it, and the real module - and everything it
+pulls in - is only imported, off the event loop, by the first run request.
+
+Model ids come from config/models.py, which the component modules build their
+models from. `python -m config.registry` imports every component once, rejects
+ids that point at the same object and checks each declared model.
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import os
+import re
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from agno.os import AgentOS
+from agno.os.schema import (
+    AgentResponse,
+    Model,
+    ModelResponse,
+    TeamResponse,
+    WorkflowResponse,
+)
+from agno.utils.log import logger
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.routing import Mount
+
+from .mcp import mcp_pool
+from .models import DEFAULT_MODEL, FAST_MODEL, GEMINI_MODEL, GOOGLE, OPENROUTER, REASONING_MODEL
+
+# Set AGENTOS_LAZY_LOADING=false to import and build every component at startup
+LAZY_LOADING = os.getenv("AGENTOS_LAZY_LOADING", "true").lower() != "false"
+
+SHARED_DB = "config.database:db"
+SHARED_KNOWLEDGE = "config.knowledge:knowledge"
+
+GEMINI_AVAILABLE = importlib.util.find_spec("google.genai") is not None
+
+
+def load_object(path: str) -> Any:
+    """Import an object from a 'package.module:attribute' path."""
+    module_path, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_path), attr)
+
+
+@dataclass
+class ComponentSpec:
+    """Declarative description of an agent, team or workflow."""
+
+    kind: str  # "agent", "team" or "workflow"
+    id: str
+    name: str
+    target: str  # "package.module:attribute"
+    description: Optional[str] = None
+    db: Optional[str] = None  # import path of the db, resolved without importing the target
+    knowledge: Optional[str] = None  # import path of the knowledge base
+    model: Optional[str] = None  # model id, e.g. "deepseek/deepseek-r1"
+    model_provider: Optional[str] = None
+
+
+def _collect_mcp_tools(component: Any, found: Optional[List[Any]] = None) -> List[Any]:
+    """Collect MCP toolkits used by an agent, a team (and its members) or a workflow's steps."""
+    found = [] if found is None else found
+
+    for tool in getattr(component, "tools", None) or []:
+        if type(tool).__name__ in ("MCPTools", "MultiMCPTools") and tool not in found:
+            found.append(tool)
+
+    for member in getattr(component, "members", None) or []:
+        _collect_mcp_tools(member, found)
+
+    steps = getattr(component, "steps", None)
+    if isinstance(steps, list):
+        for step in steps:
+            for attr in ("agent", "team"):
+                if getattr(step, attr, None) is not None:
+                    _collect_mcp_tools(getattr(step, attr), found)
+            if isinstance(getattr(step, "steps", None), list):
+                _collect_mcp_tools(step, found)
+
+    return found
+
+
+def _route_shape(path: str) -> str:
+    """'/agents/{agent_id}' -> '/agents/{}', to match routes whatever their parameter names."""
+    return re.sub(r"\{[^}]*\}", "{}", path)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class LazyComponent:
+    """Stand-in for an agent, team or workflow that is built on first use.
+
+    Until it is resolved, the proxy answers the handful of attributes AgentOS
+    reads while booting (id, name, description, db, knowledge, tools, members)
+    from its spec, and records initialisation calls/flags to replay later.
+    Any other attribute access imports the target and forwards to it, so
+    request handlers should go through `LazyAgentOS.load_component` instead.
+    """
+
+    _METADATA = ("id", "name", "description")
+
+    def __init__(self, spec: ComponentSpec):
+        object.__setattr__(self, "_spec", spec)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_pending_attrs", {})
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_mcp_tools", [])
+
+    @property
+    def is_resolved(self) -> bool:
+        return self._target is not None
+
+    def resolve(self) -> Any:
+        """Import and initialise the underlying component (thread-safe, once)."""
+        if self._target is not None:
+            return self._target
+
+        with self._lock:
+            if self._target is not None:
+                return self._target
+
+            spec = self._spec
+            component = load_object(spec.target)
+
+            # Stable ids across workers and restarts, regardless of the module's own id/name
+            component.id = spec.id
+            if not getattr(component, "name", None):
+                component.name = spec.name
+
+            for key, value in self._pending_attrs.items():
+                setattr(component, key, value)
+
+            if spec.kind == "agent":
+                component.initialize_agent()
+            elif spec.kind == "team":
+                component.initialize_team()
+                for member in component.members:
+                    if hasattr(member, "initialize_agent"):
+                        member.team_id = None
+                        member.initialize_agent()
+                    elif hasattr(member, "initialize_team"):
+                        member.initialize_team()
+
+            object.__setattr__(self, "_mcp_tools", _collect_mcp_tools(component))
+            object.__setattr__(self, "_target", component)
+            logger.info(f"Loaded {spec.kind} '{spec.id}' from {spec.target}")
+
+        return self._target
+
+    @property
+    def mcp_tools(self) -> List[Any]:
+        return self._mcp_tools
+
+    async def aresolve(self) -> Any:
+        """Resolve without blocking the event loop."""
+        if self._target is None:
+            await asyncio.to_thread(self.resolve)
+        return self._target
+
+    def __getattr__(self, item: str) -> Any:
+        spec = self._spec
+
+        if item in self._METADATA:
+            return getattr(spec, item)
+
+        if self._target is None:
+            if item == "db":
+                return load_object(spec.db) if spec.db else None
+            if item == "knowledge":
+                return load_object(spec.knowledge) if spec.knowledge else None
+            if item in ("tools", "members"):
+                # MCP connections are handled by aresolve() instead of the AgentOS lifespan
+                return []
+            if item in ("initialize_agent", "initialize_team"):
+                return lambda *args, **kwargs: None
+            if _on_event_loop():
+                logger.warning(f"Loading {spec.kind} '{spec.id}' on the event loop to read '{item}'")
+
+        return getattr(self.resolve(), item)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        if self._target is None:
+            self._pending_attrs[key] = value
+        else:
+            setattr(self._target, key, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._target is not None else "lazy"
+        return f"<LazyComponent {self._spec.kind}:{self._spec.id} ({state})>"
+
+
+class LazyAgentOS(AgentOS):
+    """AgentOS that resolves LazyComponents on the first request that targets them.
+
+    MCP sessions are entered and exited by anyio task groups, so they must live
+    in one long-running task: connections for lazily loaded components are
+    opened and closed by a worker started in the app lifespan.
+
+    Listing and detail routes answer unresolved components from their spec;
+    only run routes (/{kind}/{id}/runs...) load a component.
+
+    Extra `routers` are served ahead of the MCP app, which AgentOS mounts at "/".
+    """
+
+    _ROUTE_PREFIXES = {"agents": "agent", "teams": "team", "workflows": "workflow"}
+    _RESPONSES = {
+        "agent": (AgentResponse, AgentResponse.from_agent),
+        "team": (TeamResponse, TeamResponse.from_team),
+        "workflow": (WorkflowResponse, WorkflowResponse.from_workflow),
+    }
+
+    def __init__(self, *args, lifespan: Optional[Any] = None, routers: Optional[List[Any]] = None, **kwargs):
+        user_lifespan = lifespan
+        self._extra_routers = routers or []
+        self._mcp_queue: Optional[asyncio.Queue] = None
+        self._connected_mcp_tools: List[Any] = []
+
+        @asynccontextmanager
+        async def lazy_lifespan(app):
+            self._mcp_queue = asyncio.Queue()
+            worker = asyncio.create_task(self._mcp_connection_worker())
+            try:
+                if user_lifespan is not None:
+                    async with user_lifespan(app):
+                        yield
+                else:
+                    yield
+            finally:
+                await self._mcp_queue.put(None)
+                await worker
+                self._mcp_queue = None
+                await mcp_pool.close()
+
+        super().__init__(*args, lifespan=lazy_lifespan, **kwargs)
+
+    async def _mcp_connection_worker(self) -> None:
+        """Own every lazily opened MCP connection for the lifetime of the app."""
+        while True:
+            item = await self._mcp_queue.get()
+            if item is None:
+                break
+            tools, done = item
+            for tool in tools:
+                if tool in self._connected_mcp_tools:
+                    continue
+                try:
+                    await tool.connect()
+                    self._connected_mcp_tools.append(tool)
+                except Exception as e:
+                    logger.warning(f"Failed to connect MCP tools ({getattr(tool, 'url', None)}): {e}")
+            done.set_result(None)
+
+        for tool in self._connected_mcp_tools:
+            try:
+                await tool.close()
+            except Exception as e:
+                logger.warning(f"Failed to close MCP tools ({getattr(tool, 'url', None)}): {e}")
+        self._connected_mcp_tools = []
+
+    async def load_component(self, component: LazyComponent) -> Any:
+        """Resolve a lazy component and connect its MCP tools before it serves a request."""
+        target = await component.aresolve()
+        pending = [tool for tool in component.mcp_tools if tool not in self._connected_mcp_tools]
+        if pending and self._mcp_queue is not None:
+            done = asyncio.get_running_loop().create_future()
+            await self._mcp_queue.put((pending, done))
+            await done
+        return target
+
+    def get_lazy_component(self, kind: str, component_id: str) -> Optional[LazyComponent]:
+        if getattr(self, "_lazy_index", None) is None:
+            collections = {"agent": self.agents, "team": self.teams, "workflow": self.workflows}
+            self._lazy_index = {
+                (collection_kind, component.id): component
+                for collection_kind, components in collections.items()
+                for component in components or []
+                if isinstance(component, LazyComponent)
+            }
+        return self._lazy_index.get((kind, component_id))
+
+    def describe(self, kind: str, component: Any) -> Any:
+        """AgentOS response for a component, built from its spec until it is loaded."""
+        response_class, from_component = self._RESPONSES[kind]
+        if not isinstance(component, LazyComponent):
+            return from_component(component)
+        if component.is_resolved:
+            return from_component(component.resolve())
+
+        spec = component._spec
+        model = ModelResponse(model=spec.model, provider=spec.model_provider) if spec.model else None
+        fields = {"id": spec.id, "name": spec.name, "description": spec.description, "model": model}
+        fields["db_id"] = component.db.id if spec.db else None
+        return response_class(**{key: value for key, value in fields.items() if key in response_class.model_fields})
+
+    def get_models(self) -> List[Model]:
+        """Unique models of all agents and teams, read from the spec for unloaded ones."""
+        models: Dict[Any, Model] = {}
+        for component in (self.agents or []) + (self.teams or []):
+            if isinstance(component, LazyComponent) and not component.is_resolved:
+                model_id, provider = component._spec.model, component._spec.model_provider
+            else:
+                model = component.model
+                model_id, provider = model.id, model.provider
+            if model_id is not None and provider is not None:
+                models.setdefault((model_id, provider), Model(id=model_id, provider=provider))
+        return list(models.values())
+
+    def _get_spec_router(self) -> APIRouter:
+        """GET routes that replace AgentOS's own, answering lazy components from their spec."""
+        router = APIRouter()
+        collections = {"agent": "agents", "team": "teams", "workflow": "workflows"}
+
+        def add_routes(kind: str, prefix: str) -> None:
+            response_class = self._RESPONSES[kind][0]
+
+            async def list_components() -> List[Any]:
+                return [self.describe(kind, component) for component in getattr(self, prefix) or []]
+
+            async def get_component(component_id: str) -> Any:
+                for component in getattr(self, prefix) or []:
+                    if component.id == component_id:
+                        return self.describe(kind, component)
+                raise HTTPException(status_code=404, detail=f"{kind.capitalize()} not found")
+
+            if kind != "workflow":  # AgentOS already lists workflows by summary
+                router.add_api_route(f"/{prefix}", list_components, methods=["GET"], tags=[prefix.capitalize()],
+                                     response_model=List[response_class], response_model_exclude_none=True)
+            router.add_api_route(f"/{prefix}/{{component_id}}", get_component, methods=["GET"],
+                                 tags=[prefix.capitalize()], response_model=response_class,
+                                 response_model_exclude_none=True)
+
+        for kind, prefix in collections.items():
+            add_routes(kind, prefix)
+
+        async def get_models() -> List[Model]:
+            return self.get_models()
+
+        router.add_api_route("/models", get_models, methods=["GET"], tags=["Core"],
+                             response_model=List[Model], response_model_exclude_none=True)
+        return router
+
+    def get_app(self):
+        app = super().get_app()
+        if getattr(self, "_lazy_middleware_added", False):
+            return app
+        self._lazy_middleware_added = True
+
+        spec_router = self._get_spec_router()
+        replaced = {(_route_shape(route.path), method) for route in spec_router.routes for method in route.methods}
+        app.router.routes = [
+            route for route in app.router.routes
+            if not (isinstance(route, APIRoute)
+                    and any((_route_shape(route.path), method) in replaced for method in route.methods))
+        ]
+        app.include_router(spec_router)
+        for router in self._extra_routers:
+            app.include_router(router)
+        # Keep catch-all mounts (the MCP app at "/") behind the routes added above
+        mounts = [route for route in app.router.routes if isinstance(route, Mount)]
+        app.router.routes = [route for route in app.router.routes if not isinstance(route, Mount)] + mounts
+
+        @app.middleware("http")
+        async def resolve_lazy_components(request, call_next):
+            parts = request.url.path.strip("/").split("/")
+            # /{kind}/{id}/runs, /{kind}/{id}/runs/{run_id}/cancel and .../continue
+            if len(parts) >= 3 and parts[0] in self._ROUTE_PREFIXES and parts[2] == "runs":
+                component = self.get_lazy_component(self._ROUTE_PREFIXES[parts[0]], parts[1])
+                if component is not None:
+                    try:
+                        await self.load_component(component)
+                    except Exception as e:
+                        logger.error(f"Failed to load {self._ROUTE_PREFIXES[parts[0]]} '{component.id}': {e}")
+                        return JSONResponse(status_code=500, content={"detail": f"Failed to load '{component.id}': {e}"})
+            return await call_next(request)
+
+        return app
+
+
+class ComponentRegistry:
+    """Components indexed by (kind, id), with collision checks."""
+
+    KINDS = ("agent", "team", "workflow")
+
+    def __init__(self):
+        self._specs: Dict[str, Dict[str, ComponentSpec]] = {kind: {} for kind in self.KINDS}
+        self._targets: Dict[str, ComponentSpec] = {}
+
+    def register(self, kind: str, id: str, name: str, target: str, **kwargs) -> ComponentSpec:
+        """Register a component under a stable id. Raises ValueError on any collision."""
+        if kind not in self._specs:
+            raise ValueError(f"Unknown component kind '{kind}', expected one of {self.KINDS}")
+        if id in self._specs[kind]:
+            raise ValueError(f"Duplicate {kind} id '{id}' ({target} vs {self._specs[kind][id].target})")
+        if target in self._targets:
+            existing = self._targets[target]
+            raise ValueError(f"'{target}' is already registered as {existing.kind} '{existing.id}'")
+
+        spec = ComponentSpec(kind=kind, id=id, name=name, target=target, **kwargs)
+        self._specs[kind][id] = spec
+        self._targets[target] = spec
+        return spec
+
+    def get(self, kind: str, id: str) -> Optional[ComponentSpec]:
+        return self._specs.get(kind, {}).get(id)
+
+    def specs(self, kind: str) -> List[ComponentSpec]:
+        return list(self._specs[kind].values())
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def build(self, kind: str, lazy: bool = LAZY_LOADING) -> List[Any]:
+        """Return lazy stand-ins (or eagerly loaded components) for every spec of a kind."""
+        components = [LazyComponent(spec) for spec in self.specs(kind)]
+        if not lazy:
+            return [component.resolve() for component in components]
+        return components
+
+    def validate(self) -> None:
+        """Import every target once, reject two ids that resolve to the same object
+        and check the declared model against the one the component really uses."""
+        seen: Dict[int, ComponentSpec] = {}
+        for kind in self.KINDS:
+            for spec in self.specs(kind):
+                component = load_object(spec.target)
+                if id(component) in seen:
+                    other = seen[id(component)]
+                    raise ValueError(f"{spec.kind} '{spec.id}' and {other.kind} '{other.id}' are the same object")
+                seen[id(component)] = spec
+
+                model = getattr(component, "model", None)
+                declared = (spec.model, spec.model_provider)
+                actual = (model.id, model.provider) if model is not None else (None, None)
+                if declared != actual:
+                    raise ValueError(f"{spec.kind} '{spec.id}' declares model {declared} but uses {actual}")
+
+
+# --- Component declarations ---
+registry = ComponentRegistry()
+
+# Agents
+registry.register("agent", "content-creator", "Content Creator", "agents.content_agent:content_agent",
+                  description="Create engaging social media content", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "engagement-analyst", "Engagement Analyst", "agents.engagement_agent:engagement_agent",
+                  description="Analyze social media engagement and performance", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=FAST_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "postiz-social-media-manager", "Postiz Social Media Manager", "agents.postiz_agent:postiz_agent",
+                  description="Manage social media publishing and scheduling through Postiz", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "image-specialist", "Image Specialist", "agents.image_agent:image_agent",
+                  description="Generate and process images for social media content", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "video-specialist", "Video Specialist", "agents.video_agent:video_agent",
+                  description="Generate and process videos for social media content", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "audio-specialist", "Audio Specialist", "agents.audio_agent:audio_agent",
+                  description="Generate and process audio for social media content", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "etugrand-operations-manager", "ETUGRAND Operations Manager", "agents.operations_manager_agent:operations_manager_agent",
+                  description="Coordinate and manage all ETUGRAND company operations", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "research-agent", "Research Agent", "agents.research_agent:research_agent",
+                  description="Complete research analyst combining market intelligence and academic research", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "analytics-specialist", "Analytics Specialist", "agents.analytics_agent:analytics_agent",
+                  description="Analyze performance and generate insights", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "twitter-agent", "Twitter Agent", "agents.twitter_agent:twitter_agent",
+                  description="Complete Twitter/X content management and social media intelligence expert", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=FAST_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "linkedin-manager", "LinkedIn Manager", "agents.linkedin_agent:linkedin_agent",
+                  description="Manage LinkedIn professional content", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "youtube-agent", "YouTube Agent", "agents.youtube_agent:youtube_agent",
+                  description="Complete YouTube content analysis and platform management expert", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=FAST_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "reddit-manager", "Reddit Manager", "agents.reddit_agent:reddit_agent",
+                  description="Manage Reddit communities and content", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=FAST_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "s3-manager", "S3 Manager", "agents.s3_agent:s3_agent",
+                  description="Manage S3 file uploads and downloads", db=SHARED_DB, knowledge=SHARED_KNOWLEDGE,
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "competitor-analysis-agent", "Competitor Analysis Agent", "agents.competitor_analysis_agent:competitor_analysis_agent",
+                  description="Competitive intelligence with search, scraping and SWOT analysis",
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "media-trend-analysis-agent", "Media Trend Analysis Agent", "agents.media_trend_analysis_agent:agent",
+                  description="Identify emerging trends across news and digital platforms",
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "web-extraction-agent", "Web Extraction Agent", "agents.web_extraction_agent:agent",
+                  description="Extract structured information from a webpage",
+                  model=DEFAULT_MODEL, model_provider=OPENROUTER)
+registry.register("agent", "investigative-journalist", "Investigative Journalist", "workflow.research_agent:research_agent",
+                  description="NYT-style investigative research reports",
+                  model=REASONING_MODEL, model_provider=OPENROUTER)
+
+# Teams
+registry.register("team", "operations-team", "ETUGRAND Operations Team", "teams.operations_team:operations_team",
+                  description="Content, media, engagement and publishing operations", db=SHARED_DB,
+                  model=FAST_MODEL, model_provider=OPENROUTER)
+registry.register("team", "platform-management-team", "Platform Management Team", "teams.platform_team:platform_team",
+                  description="Platform-specific content and engagement management", db=SHARED_DB,
+                  model=FAST_MODEL, model_provider=OPENROUTER)
+registry.register("team", "strategy-team", "Strategy Team", "teams.strategy_team:strategy_team",
+                  description="Business strategy, analytics and research", db=SHARED_DB,
+                  model=FAST_MODEL, model_provider=OPENROUTER)
+registry.register("team", "customer-support-team", "Customer Support Team", "teams.ai_customer_support_team:customer_support_team",
+                  description="Classify and route customer inquiries",
+                  model=REASONING_MODEL, model_provider=OPENROUTER)
+registry.register("team", "ceo-agent", "CEO Agent", "teams.autonomous_startup_team:autonomous_startup_team",
+                  description="Autonomous startup team led by a CEO agent",
+                  model=REASONING_MODEL, model_provider=OPENROUTER)
+registry.register("team", "content-team", "Content Team", "teams.content_team:content_team",
+                  description="Researchers and writers creating high-quality content",
+                  model=GEMINI_MODEL if GEMINI_AVAILABLE else REASONING_MODEL,
+                  model_provider=GOOGLE if GEMINI_AVAILABLE else OPENROUTER)
+registry.register("team", "editor", "Editor", "teams.news_agency_team:editor",
+                  description="News agency team writing NYT-worthy articles",
+                  model=REASONING_MODEL, model_provider=OPENROUTER)
+
+# Workflows
+registry.register("workflow", "operations-workflow", "ETUGRAND Operations Workflow", "workflow.operations_workflow:operations_workflow",
+                  description="End-to-end business operations and content management workflow", db=SHARED_DB)
+registry.register("workflow", "daily-operations-workflow", "Daily Operations Workflow", "workflow.daily_operations_workflow:daily_operations_workflow",
+                  description="Daily business operations and content management", db=SHARED_DB)
+registry.register("workflow", "crisis-management-workflow", "Crisis Management Workflow", "workflow.crisis_workflow:crisis_workflow",
+                  description="Handle business crises and operational challenges", db=SHARED_DB)
+registry.register("workflow", "business-campaign-workflow", "Business Campaign Workflow", "workflow.campaign_workflow:campaign_workflow",
+                  description="Manage end-to-end business operations campaigns", db=SHARED_DB)
+registry.register("workflow", "blog-post-generator", "Blog Post Generator", "workflow.blog_post_generator:blog_generator_workflow",
+                  description="Advanced blog post generator with research and content creation capabilities", db=SHARED_DB)
+registry.register("workflow", "startup-idea-validator", "Startup Idea Validator", "agents.startup_idea_validator:startup_validation_workflow",
+                  description="Comprehensive startup idea validation with market research and competitive analysis", db=SHARED_DB)
+
+
+if __name__ == "__main__":
+    registry.validate()
+    print(f"✅ {len(registry)} components match their declarations")
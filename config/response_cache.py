@@ -0,0 +1,416 @@
+"""
+Response cache for OpenRouter models.
+
+Daily workflows, repeated research topics and support FAQs send the same (or
+nearly the same) prompts over and over. `CachedOpenRouter` is a drop-in for
+`OpenRouter` that agents opt into; its responses are kept in an
+`llm_response_cache` table of the AgentOS SQLite database:
+
+- the exact tier is keyed by a hash of the model id, the messages and the
+  request parameters (tools, tool choice, response schema, temperature...).
+  Timestamps in the messages (e.g. from `add_datetime_to_context`) are cut
+  to the date, so a prompt repeated on the same day still hits;
+- the semantic tier (`semantic_cache=True`, needs sentence-transformers)
+  matches a new last user message against earlier ones with the same model,
+  history and parameters by embedding similarity, above `similarity_threshold`.
+
+Entries expire after `cache_ttl` (LLM_CACHE_TTL_SECONDS by default). Hits,
+misses and the model latency saved are reported by `response_cache.stats()`
+and at GET /llm-cache. Misses go through the model scheduler like any
+`ScheduledOpenRouter` call; hits do not take a slot.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+import numpy as np
+from agno.knowledge.embedder import Embedder
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+from agno.run.agent import RunOutput
+from agno.utils.log import log_debug, logger
+from fastapi import APIRouter
+from pydantic import BaseModel
+
+from .database import db_file, storage
+from .embedding_cache import embed_queries
+from .model_scheduler import ScheduledOpenRouter
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0.95"))
+
+_TIMESTAMP_RE = re.compile(r"(\d{4}-\d{2}-\d{2})[ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?([+-]\d{2}:?\d{2}|Z)?")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    embedding BLOB,
+    response TEXT NOT NULL,
+    latency REAL NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_scope ON llm_response_cache(scope, expires_at);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_lru ON llm_response_cache(accessed_at);
+"""
+
+
+def _hash(value: Any) -> str:
+    text = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(_TIMESTAMP_RE.sub(r"\1", text).encode()).hexdigest()
+
+
+def _default_embedder() -> Optional[Embedder]:
+    try:
+        from agno.knowledge.embedder.sentence_transformer import SentenceTransformerEmbedder
+    except ImportError:
+        return None
+    from .embedding_cache import CachedEmbedder
+
+    return CachedEmbedder(embedder=SentenceTransformerEmbedder())
+
+
+class ResponseCache:
+    """SQLite store of model responses with an exact tier and an embedding-similarity tier."""
+
+    def __init__(
+        self,
+        db_file: str = db_file,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        embedder: Optional[Embedder] = None,
+    ):
+        self.db_file = db_file
+        self.max_entries = max_entries
+        self._embedder = embedder
+        self._embedder_loaded = embedder is not None
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.counts: Counter = Counter()
+        self.seconds_saved = 0.0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = storage.connect(self.db_file)
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    @property
+    def embedder(self) -> Optional[Embedder]:
+        if not self._embedder_loaded:
+            self._embedder_loaded = True
+            self._embedder = _default_embedder()
+            if self._embedder is None:
+                logger.warning("sentence-transformers is not installed, the semantic LLM cache tier is disabled")
+        return self._embedder
+
+    def _hit(self, key: str, response: str, latency: float, tier: str) -> Dict[str, Any]:
+        with self._lock:
+            self.conn.execute("UPDATE llm_response_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        self.counts[f"{tier}_hits"] += 1
+        self.seconds_saved += latency
+        log_debug(f"LLM cache {tier} hit, saved {latency:.1f}s")
+        return json.loads(response)
+
+    def get(self, key: str, with_tool_calls: bool = True) -> Optional[Dict[str, Any]]:
+        """Response stored under an exact key, if it has not expired."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response, latency FROM llm_response_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        if row is None or (not with_tool_calls and json.loads(row[0]).get("tool_calls")):
+            return None
+        return self._hit(key, row[0], row[1], "exact")
+
+    def get_similar(self, scope: str, text: str, threshold: float) -> Optional[Dict[str, Any]]:
+        """Response to the most similar earlier prompt in the same scope, if similar enough."""
+        embedder = self.embedder
+        if embedder is None or not text:
+            return None
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT key, embedding, response, latency FROM llm_response_cache
+                WHERE scope = ? AND embedding IS NOT NULL AND expires_at > ?
+                ORDER BY accessed_at DESC LIMIT 1000
+                """,
+                (scope, time.time()),
+            ).fetchall()
+        if not rows:
+            return None
+        # Prompts are one-off texts: kept in the embedder's in-memory LRU, not its table
+        query = np.asarray(embed_queries(embedder, [text])[0], dtype=np.float32)
+        matrix = np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        similarities = matrix @ query / np.where(norms == 0, 1.0, norms)
+        best = int(np.argmax(similarities))
+        if similarities[best] < threshold:
+            return None
+        key, _, response, latency = rows[best]
+        return self._hit(key, response, latency, "semantic")
+
+    def put(
+        self,
+        key: str,
+        model: str,
+        scope: str,
+        response: Dict[str, Any],
+        latency: float,
+        ttl: float,
+        text: Optional[str] = None,
+    ) -> None:
+        """Store a response; with `text`, also its embedding for the semantic tier."""
+        embedding = None
+        if text and self.embedder is not None:
+            embedding = np.asarray(embed_queries(self.embedder, [text])[0], dtype=np.float32).tobytes()
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, scope, embedding, json.dumps(response, default=str), latency, now, now + ttl, now),
+            )
+            self.conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+            self.conn.execute(
+                """
+                DELETE FROM llm_response_cache WHERE rowid IN (
+                    SELECT rowid FROM llm_response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self.conn.commit()
+        self.counts["stores"] += 1
+
+    def miss(self) -> None:
+        self.counts["misses"] += 1
+
+    def clear(self, model: Optional[str] = None) -> int:
+        with self._lock:
+            if model is None:
+                deleted = self.conn.execute("DELETE FROM llm_response_cache").rowcount
+            else:
+                deleted = self.conn.execute("DELETE FROM llm_response_cache WHERE model = ?", (model,)).rowcount
+            self.conn.commit()
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits per tier, misses, hit rate and model latency saved since startup, plus the entry count."""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+        hits = self.counts["exact_hits"] + self.counts["semantic_hits"]
+        lookups = hits + self.counts["misses"]
+        return {
+            **self.counts,
+            "entries": entries,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "seconds_saved": round(self.seconds_saved, 3),
+        }
+
+
+response_cache = ResponseCache()
+
+
+@dataclass
+class CachedOpenRouter(ScheduledOpenRouter):
+    """OpenRouter model whose responses are served from `response_cache` when the prompt repeats.
+
+    Streaming requests are served from the cache too, as a single chunk; streamed
+    responses that call tools are not stored.
+    """
+
+    cache: Optional[ResponseCache] = None
+    cache_ttl: float = LLM_CACHE_TTL_SECONDS
+    semantic_cache: bool = False
+    similarity_threshold: float = LLM_CACHE_SIMILARITY
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        return self.cache or response_cache
+
+    def _cache_keys(
+        self,
+        messages: List[Message],
+        response_format: Optional[Union[Dict, Type[BaseModel]]],
+        tools: Optional[List[Dict[str, Any]]],
+        tool_choice: Optional[Union[str, Dict[str, Any]]],
+    ) -> Tuple[str, str, Optional[str]]:
+        """Exact key, semantic scope (everything but the last message) and the last user message."""
+        formatted = [self._format_message(m) for m in messages]
+        params = self.get_request_params(response_format=response_format, tools=tools, tool_choice=tool_choice)
+        key = _hash([self.id, formatted, params])
+        scope = _hash([self.id, formatted[:-1], params])
+        last = messages[-1] if messages else None
+        text = last.get_content_string() if last is not None and last.role == "user" else None
+        return key, scope, text
+
+    def _lookup(
+        self, key: str, scope: str, text: Optional[str], stream: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        if not LLM_CACHE_ENABLED:
+            return None
+        # Streams can only replay plain answers; tool calls arrive as deltas agno merges itself
+        cached = self.response_cache.get(key, with_tool_calls=not stream)
+        if cached is None and self.semantic_cache and text:
+            cached = self.response_cache.get_similar(scope, text, self.similarity_threshold)
+        if cached is None:
+            self.response_cache.miss()
+        return cached
+
+    def _store(self, key: str, scope: str, text: Optional[str], response: ModelResponse, latency: float) -> None:
+        if not LLM_CACHE_ENABLED or not (response.content is None or isinstance(response.content, str)):
+            return
+        if response.content is None and not response.tool_calls:
+            return
+        try:
+            self.response_cache.put(
+                key,
+                self.id,
+                scope,
+                {
+                    "role": response.role,
+                    "content": response.content,
+                    "tool_calls": response.tool_calls,
+                    "reasoning_content": response.reasoning_content,
+                },
+                latency,
+                self.cache_ttl,
+                text=text if self.semantic_cache and not response.tool_calls else None,
+            )
+        except Exception as e:
+            logger.warning(f"Could not cache the {self.id} response: {e}")
+
+    @staticmethod
+    def _response(cached: Dict[str, Any]) -> ModelResponse:
+        return ModelResponse(
+            role=cached.get("role") or "assistant",
+            content=cached.get("content"),
+            tool_calls=cached.get("tool_calls") or [],
+            reasoning_content=cached.get("reasoning_content"),
+        )
+
+    def invoke(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[RunOutput] = None,
+    ) -> ModelResponse:
+        key, scope, text = self._cache_keys(messages, response_format, tools, tool_choice)
+        cached = self._lookup(key, scope, text)
+        if cached is not None:
+            return self._response(cached)
+
+        start = time.perf_counter()
+        response = super().invoke(messages, assistant_message, response_format, tools, tool_choice, run_response)
+        self._store(key, scope, text, response, time.perf_counter() - start)
+        return response
+
+    async def ainvoke(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[RunOutput] = None,
+    ) -> ModelResponse:
+        key, scope, text = self._cache_keys(messages, response_format, tools, tool_choice)
+        cached = self._lookup(key, scope, text)
+        if cached is not None:
+            return self._response(cached)
+
+        start = time.perf_counter()
+        response = await super().ainvoke(messages, assistant_message, response_format, tools, tool_choice, run_response)
+        self._store(key, scope, text, response, time.perf_counter() - start)
+        return response
+
+    def _stream_result(self, deltas: List[ModelResponse]) -> Optional[ModelResponse]:
+        """The complete response of a stream, or None when it called tools."""
+        if any(delta.tool_calls for delta in deltas):
+            return None
+        content = "".join(delta.content for delta in deltas if isinstance(delta.content, str))
+        reasoning = "".join(delta.reasoning_content or "" for delta in deltas)
+        return ModelResponse(role="assistant", content=content or None, reasoning_content=reasoning or None)
+
+    def invoke_stream(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[RunOutput] = None,
+    ) -> Iterator[ModelResponse]:
+        key, scope, text = self._cache_keys(messages, response_format, tools, tool_choice)
+        cached = self._lookup(key, scope, text, stream=True)
+        if cached is not None:
+            yield self._response(cached)
+            return
+
+        start = time.perf_counter()
+        deltas = []
+        for delta in super().invoke_stream(messages, assistant_message, response_format, tools, tool_choice, run_response):
+            deltas.append(delta)
+            yield delta
+        result = self._stream_result(deltas)
+        if result is not None:
+            self._store(key, scope, text, result, time.perf_counter() - start)
+
+    async def ainvoke_stream(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[RunOutput] = None,
+    ) -> AsyncIterator[ModelResponse]:
+        key, scope, text = self._cache_keys(messages, response_format, tools, tool_choice)
+        cached = self._lookup(key, scope, text, stream=True)
+        if cached is not None:
+            yield self._response(cached)
+            return
+
+        start = time.perf_counter()
+        deltas = []
+        async for delta in super().ainvoke_stream(
+            messages, assistant_message, response_format, tools, tool_choice, run_response
+        ):
+            deltas.append(delta)
+            yield delta
+        result = self._stream_result(deltas)
+        if result is not None:
+            self._store(key, scope, text, result, time.perf_counter() - start)
+
+
+def get_response_cache_router(cache: ResponseCache = response_cache) -> APIRouter:
+    """Endpoints to inspect and clear the LLM response cache."""
+    router = APIRouter(prefix="/llm-cache", tags=["LLM Cache"])
+
+    @router.get("")
+    async def get_llm_cache_stats() -> Dict[str, Any]:
+        return cache.stats()
+
+    @router.delete("")
+    async def clear_llm_cache(model: Optional[str] = None) -> Dict[str, Any]:
+        return {"deleted": cache.clear(model)}
+
+    return router
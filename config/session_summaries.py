@@ -0,0 +1,339 @@
+"""
+Incremental, debounced session summaries.
+
+With `enable_session_summaries=True`, agno re-summarizes the whole
+conversation with an extra model call at the end of every run, and the run
+waits for it. `IncrementalSessionSummaryManager` is a drop-in
+`session_summary_manager` that instead:
+
+- folds only the runs added since the last summary into the stored summary
+  (the model sees the previous summary and the new exchanges, not the whole
+  conversation);
+- debounces: a summary is made once SESSION_SUMMARY_EVERY_RUNS new runs have
+  piled up, or when a session with unsummarized runs has been idle for
+  SESSION_SUMMARY_IDLE_SECONDS;
+- runs the model call in a background thread at background model priority
+  and writes only the summary and its cursor to the session row, so runs and
+  session state saved meanwhile are kept. The next run of the session picks
+  up the newest summary before it is saved again.
+
+Prompt tokens sent, the tokens a full re-summarization after every run would
+have sent, and the model time taken off the response path are reported by
+`summary_report()` and at GET /session-summaries.
+"""
+
+import copy
+import itertools
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from textwrap import dedent
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from agno.db.base import BaseDb, SessionType
+from agno.models.message import Message
+from agno.session import AgentSession, TeamSession
+from agno.session.summary import SessionSummary, SessionSummaryManager
+from agno.utils.log import log_debug, logger
+from fastapi import APIRouter
+from sqlalchemy import select
+
+from .model_scheduler import Priority, model_priority
+from .prompt_budget import estimate_tokens
+
+SESSION_SUMMARY_EVERY_RUNS = int(os.getenv("SESSION_SUMMARY_EVERY_RUNS", "3"))
+SESSION_SUMMARY_IDLE_SECONDS = float(os.getenv("SESSION_SUMMARY_IDLE_SECONDS", "300"))
+
+# session_data key of the last run folded into the session's summary, so a restart resumes from it
+SUMMARY_CURSOR_KEY = "summary_run_id"
+
+_summary_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="session-summary")
+
+
+@dataclass
+class _Pending:
+    """Runs of a session not yet folded into its summary."""
+
+    session_type: SessionType
+    summary: Optional[SessionSummary]
+    runs: List[Tuple[str, List[Message]]]  # (run id, its user and assistant messages)
+    timer: Optional[threading.Timer] = None
+    folding: bool = False
+
+
+@dataclass
+class SummaryStats:
+    runs_seen: int = 0
+    summaries: int = 0
+    prompt_tokens: int = 0
+    # What re-summarizing the whole conversation after every run would have sent
+    full_resummary_tokens: int = 0
+    # Model time spent on summaries in the background instead of in the response
+    background_seconds: float = 0.0
+    failures: int = 0
+
+
+# Shared by every agent's manager
+summary_stats = SummaryStats()
+_stats_lock = threading.Lock()
+_managers: "weakref.WeakValueDictionary[int, IncrementalSessionSummaryManager]" = weakref.WeakValueDictionary()
+
+
+@dataclass
+class IncrementalSessionSummaryManager(SessionSummaryManager):
+    """`SessionSummaryManager` that folds new runs into the summary every few runs, off the response path."""
+
+    every_runs: int = SESSION_SUMMARY_EVERY_RUNS
+    idle_seconds: float = SESSION_SUMMARY_IDLE_SECONDS
+    db: Optional[BaseDb] = None
+    stats: SummaryStats = field(default_factory=lambda: summary_stats)
+
+    def __post_init__(self):
+        _managers[id(self)] = self
+        self._lock = threading.Lock()
+        self._pending: Dict[str, _Pending] = {}
+        self._latest: Dict[str, SessionSummary] = {}
+        # Last run folded into each session's summary
+        self._cursor: Dict[str, str] = {}
+
+    @property
+    def storage(self) -> BaseDb:
+        if self.db is None:
+            from .database import db
+
+            self.db = db
+        return self.db
+
+    def _new_runs(self, session: Union[AgentSession, TeamSession]) -> List[Any]:
+        runs = session.runs or []
+        cursor = self._cursor.get(session.session_id) or (session.session_data or {}).get(SUMMARY_CURSOR_KEY)
+        if cursor is not None:
+            for index, run in enumerate(runs):
+                if run.run_id == cursor:
+                    return runs[index + 1 :]
+        return list(runs)
+
+    @staticmethod
+    def _messages(session: Union[AgentSession, TeamSession], run: Any) -> List[Message]:
+        partial = copy.copy(session)
+        partial.runs = [run]
+        return partial.get_messages_for_session()
+
+    def _track(self, session: Union[AgentSession, TeamSession]) -> Optional[SessionSummary]:
+        if self.model is None:
+            return None
+        session_id = session.session_id
+        with self._lock:
+            latest = self._latest.get(session_id)
+            if latest is not None and (
+                session.summary is None or (session.summary.updated_at or datetime.min) < latest.updated_at
+            ):
+                session.summary = latest
+            if session_id in self._cursor:
+                session.session_data = {**(session.session_data or {}), SUMMARY_CURSOR_KEY: self._cursor[session_id]}
+
+            new_runs = self._new_runs(session)
+            with _stats_lock:
+                self.stats.runs_seen += 1
+            if not new_runs:
+                return session.summary
+
+            pending = self._pending.get(session_id)
+            if pending is not None and pending.timer is not None:
+                pending.timer.cancel()
+            pending = self._pending[session_id] = _Pending(
+                session_type=SessionType.TEAM if isinstance(session, TeamSession) else SessionType.AGENT,
+                summary=session.summary,
+                runs=[(run.run_id, self._messages(session, run)) for run in new_runs],
+                folding=pending.folding if pending is not None else False,
+            )
+            if len(pending.runs) >= self.every_runs and not pending.folding:
+                pending.folding = True
+                _summary_pool.submit(self._fold, session_id)
+            elif self.idle_seconds > 0:
+                pending.timer = threading.Timer(self.idle_seconds, self._on_idle, (session_id,))
+                pending.timer.daemon = True
+                pending.timer.start()
+        return session.summary
+
+    def _on_idle(self, session_id: str) -> None:
+        with self._lock:
+            pending = self._pending.get(session_id)
+            if pending is None or pending.folding:
+                return
+            pending.folding = True
+        self._fold(session_id)
+
+    def _prompt(self, previous: Optional[SessionSummary], messages: List[Message]) -> List[Message]:
+        conversation = "\n".join(
+            f"User: {message.content}" if message.role == "user" else f"Assistant: {message.content}\n"
+            for message in messages
+        )
+        previous_summary = (
+            f"{previous.summary}\nTopics: {', '.join(previous.topics or [])}" if previous is not None else "(none yet)"
+        )
+        system = dedent("""\
+            You maintain the running summary of a conversation between a user and an assistant.
+            Update the existing summary with the new exchanges below and return:
+              - Summary (str): the updated, concise summary, keeping earlier information that still matters for future interactions.
+              - Topics (Optional[List[str]]): all topics discussed so far.
+            Only include relevant information. Do not make anything up.
+
+            <existing_summary>
+            {previous_summary}
+            </existing_summary>
+
+            <new_exchanges>
+            """).format(previous_summary=previous_summary)
+        system += conversation + "</new_exchanges>"
+        response_format = self.get_response_format(self.model)
+        if response_format == {"type": "json_object"}:
+            from agno.session.summary import SessionSummaryResponse
+            from agno.utils.prompts import get_json_output_prompt
+
+            system += "\n" + get_json_output_prompt(SessionSummaryResponse)
+        return [Message(role="system", content=system), Message(role="user", content="Provide the updated summary.")]
+
+    def _fold(self, session_id: str) -> None:
+        """Fold a session's pending runs into its summary and save it."""
+        with self._lock:
+            pending = self._pending.get(session_id)
+            if pending is None:
+                return
+            pending.timer = None
+        try:
+            messages = self._prompt(pending.summary, [message for _, run in pending.runs for message in run])
+            start = time.perf_counter()
+            with model_priority(Priority.BACKGROUND):
+                response = self.model.response(messages=messages, response_format=self.get_response_format(self.model))
+            elapsed = time.perf_counter() - start
+            summary = self._process_summary_response(response, self.model)
+            if summary is None:
+                raise ValueError("the model returned no parsable summary")
+
+            with _stats_lock:
+                self.stats.summaries += 1
+                self.stats.prompt_tokens += sum(estimate_tokens(message.get_content_string()) for message in messages)
+                self.stats.background_seconds += elapsed
+            folded = {run_id for run_id, _ in pending.runs}
+            cursor = pending.runs[-1][0]
+            with self._lock:
+                self._latest[session_id] = summary
+                self._cursor[session_id] = cursor
+                # Runs added while the model was busy stay pending, on top of the new summary
+                current = self._pending.get(session_id)
+                if current is not None:
+                    current.runs = [run for run in current.runs if run[0] not in folded]
+                    current.summary = summary
+                    if not current.runs:
+                        if current.timer is not None:
+                            current.timer.cancel()
+                        del self._pending[session_id]
+            self.summaries_updated = True
+            self._save(session_id, pending.session_type, summary, cursor)
+            log_debug(f"Folded {len(folded)} runs into the summary of session {session_id} in {elapsed:.1f}s")
+            try:
+                full_tokens = self._full_resummary_tokens(session_id, pending)
+                with _stats_lock:
+                    self.stats.full_resummary_tokens += full_tokens
+            except Exception as e:
+                log_debug(f"Could not measure the full re-summary of session {session_id}: {e}")
+        except Exception as e:
+            with _stats_lock:
+                self.stats.failures += 1
+            logger.warning(f"Session summary for {session_id} failed: {e}")
+        finally:
+            with self._lock:
+                current = self._pending.get(session_id)
+                if current is not None:
+                    current.folding = False
+
+    def _full_resummary_tokens(self, session_id: str, pending: _Pending) -> int:
+        """Prompt tokens agno's default manager would have sent after each folded run, over the whole conversation."""
+        storage = self.storage
+        folded = {run_id for run_id, _ in pending.runs}
+        session_cls = TeamSession if pending.session_type == SessionType.TEAM else AgentSession
+        if hasattr(storage, "get_session_runs"):
+            # The session row only keeps the last runs; the per-run table has them all
+            runs = storage.get_session_runs(session_id)
+        else:
+            session_raw = storage.get_session(session_id=session_id, session_type=pending.session_type, deserialize=False)
+            runs = (session_raw or {}).get("runs") or []
+        earlier = list(itertools.takewhile(lambda run: run.get("run_id") not in folded, runs))
+        conversation: List[Message] = []
+        if earlier:
+            conversation = session_cls.from_dict({"session_id": session_id, "runs": earlier}).get_messages_for_session()
+        response_format = self.get_response_format(self.model)
+        instruction = Message(role="user", content="Provide the summary of the conversation.")
+        tokens = 0
+        for _, messages in pending.runs:
+            conversation.extend(messages)
+            prompt = [self.get_system_message(conversation=conversation, response_format=response_format), instruction]
+            tokens += sum(estimate_tokens(message.get_content_string()) for message in prompt)
+        return tokens
+
+    def _save(self, session_id: str, session_type: SessionType, summary: SessionSummary, cursor: str) -> None:
+        """Write the summary and its cursor without touching the runs or state the session saved meanwhile."""
+        storage = self.storage
+        if hasattr(storage, "update_session_summary"):
+            storage.update_session_summary(session_id, summary, {SUMMARY_CURSOR_KEY: cursor})
+            return
+        # Other backends: re-read and merge the two columns under a row lock
+        table = storage._get_table(table_type="sessions")
+        if table is None:
+            return
+        with storage.Session() as sess, sess.begin():
+            row = sess.execute(
+                select(table.c.summary, table.c.session_data).where(table.c.session_id == session_id).with_for_update()
+            ).first()
+            if row is None:
+                return
+            stored = SessionSummary.from_dict(row.summary) if row.summary else None
+            if stored is None or (stored.updated_at or datetime.min) < summary.updated_at:
+                sess.execute(
+                    table.update()
+                    .where(table.c.session_id == session_id)
+                    .values(
+                        summary=summary.to_dict(),
+                        session_data={**(row.session_data or {}), SUMMARY_CURSOR_KEY: cursor},
+                    )
+                )
+
+    def create_session_summary(self, session: Union[AgentSession, TeamSession]) -> Optional[SessionSummary]:
+        """Record the run and return the current summary; the model call happens in the background."""
+        return self._track(session)
+
+    async def acreate_session_summary(self, session: Union[AgentSession, TeamSession]) -> Optional[SessionSummary]:
+        return self._track(session)
+
+
+def summary_report() -> Dict[str, Any]:
+    """Summaries made, sessions waiting for one, and the tokens and model time saved."""
+    with _stats_lock:
+        stats = copy.copy(summary_stats)
+    return {
+        "runs_seen": stats.runs_seen,
+        "summaries": stats.summaries,
+        "pending_sessions": sum(len(manager._pending) for manager in list(_managers.values())),
+        "prompt_tokens": stats.prompt_tokens,
+        "full_resummary_tokens": stats.full_resummary_tokens,
+        "tokens_saved": max(0, stats.full_resummary_tokens - stats.prompt_tokens),
+        "model_calls_saved": max(0, stats.runs_seen - stats.summaries),
+        "background_seconds": round(stats.background_seconds, 2),
+        "failures": stats.failures,
+    }
+
+
+def get_session_summary_router() -> APIRouter:
+    """Endpoint to inspect incremental session summaries."""
+    router = APIRouter(prefix="/session-summaries", tags=["Session Summaries"])
+
+    @router.get("")
+    async def get_session_summary_stats() -> Dict[str, Any]:
+        return summary_report()
+
+    return router
@@ -0,0 +1,424 @@
+"""
+Background, batched and deduplicated user-memory extraction.
+
+With `enable_user_memories=True`, agno runs a memory-extraction model call
+for every run before the run completes, and asks the model to avoid
+duplicates only by showing it the existing memories, so near-duplicates pile
+up. `BatchedMemoryManager` is a drop-in `memory_manager` that:
+
+- queues each run's user messages per user and returns at once;
+- extracts memories for MEMORY_BATCH_RUNS queued runs of a user in one model
+  call, or for fewer once the user has been idle for MEMORY_IDLE_SECONDS, in
+  a background thread at background model priority;
+- merges a memory the model adds into an existing memory of the same user
+  when the two are near-duplicates: embedding cosine similarity of at least
+  MEMORY_DEDUP_SIMILARITY with sentence-transformers installed, otherwise a
+  fuzzy text match of at least MEMORY_FUZZY_SIMILARITY.
+
+`deduplicate_user_memories()` merges the near-duplicates already stored.
+Memories loaded at run start come from `TunedSqliteDb`'s single-query lookup
+on the user_id index. GET /memory-extraction reports runs queued, extraction
+calls, merges and background model time; POST /memory-extraction
+deduplicates the stored memories. `memory_extraction_lifespan` extracts the
+runs still queued when the app shuts down.
+"""
+
+import asyncio
+import copy
+import os
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from agno.db.base import BaseDb
+from agno.db.schemas.memory import UserMemory
+from agno.knowledge.embedder import Embedder
+from agno.memory import MemoryManager
+from agno.models.message import Message
+from agno.utils.log import log_debug, log_warning, logger
+from fastapi import APIRouter
+
+from .embedding_cache import embed_queries
+from .model_scheduler import Priority, model_priority
+
+MEMORY_BATCH_RUNS = int(os.getenv("MEMORY_BATCH_RUNS", "3"))
+MEMORY_IDLE_SECONDS = float(os.getenv("MEMORY_IDLE_SECONDS", "120"))
+MEMORY_DEDUP_SIMILARITY = float(os.getenv("MEMORY_DEDUP_SIMILARITY", "0.9"))
+MEMORY_FUZZY_SIMILARITY = float(os.getenv("MEMORY_FUZZY_SIMILARITY", "0.85"))
+
+_extraction_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-extraction")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_PUNCTUATION_RE.sub(" ", text.lower()).split())
+
+
+def _default_embedder() -> Optional[Embedder]:
+    try:
+        from agno.knowledge.embedder.sentence_transformer import SentenceTransformerEmbedder
+    except ImportError:
+        return None
+    from .embedding_cache import CachedEmbedder
+
+    return CachedEmbedder(embedder=SentenceTransformerEmbedder())
+
+
+class MemoryDeduplicator:
+    """Finds a user's memory that says the same as a new one, by embeddings or by fuzzy text match."""
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        similarity: float = MEMORY_DEDUP_SIMILARITY,
+        fuzzy_similarity: float = MEMORY_FUZZY_SIMILARITY,
+    ):
+        self.similarity = similarity
+        self.fuzzy_similarity = fuzzy_similarity
+        self._embedder = embedder
+        self._embedder_loaded = embedder is not None
+
+    @property
+    def embedder(self) -> Optional[Embedder]:
+        if not self._embedder_loaded:
+            self._embedder_loaded = True
+            self._embedder = _default_embedder()
+            if self._embedder is None:
+                log_debug("sentence-transformers is not installed, memories are deduplicated by fuzzy match")
+        return self._embedder
+
+    def find(self, text: str, memories: List[UserMemory]) -> Optional[UserMemory]:
+        """The memory most similar to `text`, if it is similar enough to count as a duplicate."""
+        normalized = _normalize(text)
+        candidates = [memory for memory in memories if memory.memory]
+        for memory in candidates:
+            if _normalize(memory.memory) == normalized:
+                return memory
+        if not candidates:
+            return None
+
+        embedder = self.embedder
+        if embedder is not None:
+            # CachedEmbedder serves the stored memories' embeddings from its cache, in one lookup
+            texts = [memory.memory for memory in candidates]
+            if hasattr(embedder, "get_embeddings"):
+                matrix = np.asarray(embedder.get_embeddings(texts), dtype=np.float32)
+            else:
+                matrix = np.asarray([embedder.get_embedding(memory) for memory in texts], dtype=np.float32)
+            query = np.asarray(embed_queries(embedder, [text])[0], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+            scores = matrix @ query / np.where(norms == 0, 1.0, norms)
+            threshold = self.similarity
+        else:
+            scores = np.asarray(
+                [SequenceMatcher(None, normalized, _normalize(memory.memory)).ratio() for memory in candidates]
+            )
+            threshold = self.fuzzy_similarity
+        best = int(np.argmax(scores))
+        return candidates[best] if scores[best] >= threshold else None
+
+
+def _merge(existing: UserMemory, memory: str, topics: Optional[List[str]]) -> UserMemory:
+    """`existing` with the more detailed of the two texts and the topics of both."""
+    merged_topics = list(dict.fromkeys((existing.topics or []) + (topics or []))) or None
+    return UserMemory(
+        memory_id=existing.memory_id,
+        user_id=existing.user_id,
+        agent_id=existing.agent_id,
+        team_id=existing.team_id,
+        memory=memory if len(memory) > len(existing.memory) else existing.memory,
+        topics=merged_topics,
+        input=existing.input,
+    )
+
+
+@dataclass
+class MemoryStats:
+    runs_queued: int = 0
+    extractions: int = 0
+    memories_added: int = 0
+    duplicates_merged: int = 0
+    # Model time spent extracting memories in the background instead of in the response
+    background_seconds: float = 0.0
+    failures: int = 0
+
+
+# Shared by every agent's and team's manager
+memory_stats = MemoryStats()
+_stats_lock = threading.Lock()
+_managers: "weakref.WeakValueDictionary[int, BatchedMemoryManager]" = weakref.WeakValueDictionary()
+
+
+@dataclass
+class _Pending:
+    """Runs of a user whose memories have not been extracted yet."""
+
+    agent_id: Optional[str]
+    team_id: Optional[str]
+    messages: List[Message] = field(default_factory=list)
+    runs: int = 0
+    timer: Optional[threading.Timer] = None
+
+
+class BatchedMemoryManager(MemoryManager):
+    """`MemoryManager` that extracts several runs' memories of a user at once, off the response path."""
+
+    def __init__(
+        self,
+        *args: Any,
+        batch_runs: int = MEMORY_BATCH_RUNS,
+        idle_seconds: float = MEMORY_IDLE_SECONDS,
+        deduplicator: Optional[MemoryDeduplicator] = None,
+        stats: MemoryStats = memory_stats,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.batch_runs = batch_runs
+        self.idle_seconds = idle_seconds
+        self.deduplicator = deduplicator or MemoryDeduplicator()
+        self.stats = stats
+
+        self._lock = threading.Lock()
+        # agno binds the memory tools to one user on the manager, so extractions run one at a time
+        self._extract_lock = threading.Lock()
+        self._pending: Dict[str, _Pending] = {}
+        _managers[id(self)] = self
+
+    def _queue(
+        self,
+        message: Optional[str],
+        messages: Optional[List[Message]],
+        agent_id: Optional[str],
+        team_id: Optional[str],
+        user_id: Optional[str],
+    ) -> str:
+        if self.db is None:
+            log_warning("MemoryDb not provided.")
+            return "Please provide a db to store memories"
+        if not messages and not message:
+            raise ValueError("You must provide either a message or a list of messages")
+        if message:
+            messages = [Message(role="user", content=message)]
+        user_id = user_id or "default"
+
+        with self._lock:
+            pending = self._pending.get(user_id)
+            if pending is None:
+                pending = self._pending[user_id] = _Pending(agent_id=agent_id, team_id=team_id)
+            elif pending.timer is not None:
+                pending.timer.cancel()
+                pending.timer = None
+            pending.messages.extend(messages)
+            pending.runs += 1
+            with _stats_lock:
+                self.stats.runs_queued += 1
+            if pending.runs >= self.batch_runs:
+                _extraction_pool.submit(self._extract, user_id)
+            elif self.idle_seconds > 0:
+                pending.timer = threading.Timer(self.idle_seconds, self._extract, (user_id,))
+                pending.timer.daemon = True
+                pending.timer.start()
+        return "Memory extraction queued"
+
+    def create_user_memories(
+        self,
+        message: Optional[str] = None,
+        messages: Optional[List[Message]] = None,
+        agent_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> str:
+        """Queue the run's messages; memories are extracted in the background with the user's next runs."""
+        return self._queue(message, messages, agent_id, team_id, user_id)
+
+    async def acreate_user_memories(
+        self,
+        message: Optional[str] = None,
+        messages: Optional[List[Message]] = None,
+        agent_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> str:
+        return self._queue(message, messages, agent_id, team_id, user_id)
+
+    def _extract(self, user_id: str) -> None:
+        """Extract the memories of a user's queued runs in one model call."""
+        with self._lock:
+            # Runs queued from here on start the next batch
+            pending = self._pending.pop(user_id, None)
+            if pending is None:
+                return
+            if pending.timer is not None:
+                pending.timer.cancel()
+        try:
+            start = time.perf_counter()
+            with self._extract_lock, model_priority(Priority.BACKGROUND):
+                super().create_user_memories(
+                    messages=pending.messages, agent_id=pending.agent_id, team_id=pending.team_id, user_id=user_id
+                )
+            elapsed = time.perf_counter() - start
+            with _stats_lock:
+                self.stats.extractions += 1
+                self.stats.background_seconds += elapsed
+            log_debug(f"Extracted memories of {pending.runs} runs of user {user_id} in {elapsed:.1f}s")
+        except Exception as e:
+            with _stats_lock:
+                self.stats.failures += 1
+            logger.warning(f"Memory extraction for user {user_id} failed: {e}")
+
+    def flush(self) -> None:
+        """Extract the memories of every queued run now."""
+        with self._lock:
+            user_ids = list(self._pending)
+            for pending in self._pending.values():
+                if pending.timer is not None:
+                    pending.timer.cancel()
+                    pending.timer = None
+        for user_id in user_ids:
+            self._extract(user_id)
+
+    def _get_db_tools(
+        self,
+        user_id: str,
+        db: BaseDb,
+        input_string: str,
+        enable_add_memory: bool = True,
+        enable_update_memory: bool = True,
+        enable_delete_memory: bool = True,
+        enable_clear_memory: bool = True,
+        agent_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+    ) -> List[Callable]:
+        functions = super()._get_db_tools(
+            user_id,
+            db,
+            input_string,
+            enable_add_memory=enable_add_memory,
+            enable_update_memory=enable_update_memory,
+            enable_delete_memory=enable_delete_memory,
+            enable_clear_memory=enable_clear_memory,
+            agent_id=agent_id,
+            team_id=team_id,
+        )
+        store_memory = next((function for function in functions if function.__name__ == "add_memory"), None)
+        if store_memory is None:
+            return functions
+
+        def add_memory(memory: str, topics: Optional[List[str]] = None) -> str:
+            """Use this function to add a memory to the database.
+            Args:
+                memory (str): The memory to be added.
+                topics (Optional[List[str]]): The topics of the memory (e.g. ["name", "hobbies", "location"]).
+            Returns:
+                str: A message indicating if the memory was added successfully or not.
+            """
+            existing = self.deduplicator.find(memory, db.get_user_memories(user_id=user_id) or [])
+            if existing is None:
+                with _stats_lock:
+                    self.stats.memories_added += 1
+                return store_memory(memory, topics)
+            try:
+                db.upsert_user_memory(_merge(existing, memory, topics))
+            except Exception as e:
+                log_warning(f"Error storing memory in db: {e}")
+                return f"Error adding memory: {e}"
+            with _stats_lock:
+                self.stats.duplicates_merged += 1
+            log_debug(f"Merged a duplicate memory into {existing.memory_id}")
+            return "Memory already existed and was updated"
+
+        return [add_memory if function is store_memory else function for function in functions]
+
+
+def deduplicate_user_memories(
+    db: Optional[BaseDb] = None, user_id: Optional[str] = None, deduplicator: Optional[MemoryDeduplicator] = None
+) -> int:
+    """Merge near-duplicate memories already stored, per user; returns how many memories were merged away."""
+    if db is None:
+        from .database import db
+    deduplicator = deduplicator or MemoryDeduplicator()
+    memories = db.get_user_memories(user_id=user_id) if user_id is not None else db.get_user_memories()
+    by_user: Dict[str, List[UserMemory]] = {}
+    for memory in memories or []:
+        if memory.user_id is not None and memory.memory_id is not None:
+            by_user.setdefault(memory.user_id, []).append(memory)
+
+    merged_away: List[str] = []
+    for user_memories in by_user.values():
+        kept: List[UserMemory] = []
+        # Oldest first, so the surviving memory keeps its id
+        for memory in sorted(user_memories, key=lambda memory: memory.updated_at.timestamp() if memory.updated_at else 0):
+            existing = deduplicator.find(memory.memory, kept)
+            if existing is None:
+                kept.append(memory)
+                continue
+            merged = _merge(existing, memory.memory, memory.topics)
+            db.upsert_user_memory(merged)
+            kept[kept.index(existing)] = merged
+            merged_away.append(memory.memory_id)
+    if merged_away:
+        db.delete_user_memories(memory_ids=merged_away)
+        with _stats_lock:
+            memory_stats.duplicates_merged += len(merged_away)
+        logger.info(f"Merged {len(merged_away)} duplicate user memories")
+    return len(merged_away)
+
+
+def flush_memory_extraction() -> None:
+    """Extract the queued runs of every manager, e.g. before the process exits."""
+    for manager in list(_managers.values()):
+        manager.flush()
+
+
+def memory_report() -> Dict[str, Any]:
+    """Runs queued, extraction calls made, duplicates merged and model time moved off the response path."""
+    with _stats_lock:
+        stats = copy.copy(memory_stats)
+    return {
+        "runs_queued": stats.runs_queued,
+        "pending_runs": sum(
+            pending.runs for manager in list(_managers.values()) for pending in list(manager._pending.values())
+        ),
+        "extractions": stats.extractions,
+        "runs_per_extraction": round(stats.runs_queued / stats.extractions, 2) if stats.extractions else 0.0,
+        "memories_added": stats.memories_added,
+        "duplicates_merged": stats.duplicates_merged,
+        "background_seconds": round(stats.background_seconds, 2),
+        "failures": stats.failures,
+    }
+
+
+def memory_extraction_lifespan():
+    """FastAPI lifespan that extracts the memories of the runs still queued on shutdown."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        try:
+            yield
+        finally:
+            await asyncio.to_thread(flush_memory_extraction)
+
+    return lifespan
+
+
+def get_memory_extraction_router() -> APIRouter:
+    """Endpoints to inspect memory extraction and deduplicate stored memories."""
+    router = APIRouter(prefix="/memory-extraction", tags=["Memory Extraction"])
+
+    @router.get("")
+    async def get_memory_extraction_stats() -> Dict[str, Any]:
+        return memory_report()
+
+    @router.post("")
+    async def deduplicate_memories(user_id: Optional[str] = None) -> Dict[str, Any]:
+        merged = await asyncio.to_thread(deduplicate_user_memories, user_id=user_id)
+        return {"merged": merged, **memory_report()}
+
+    return router
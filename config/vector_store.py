@@ -0,0 +1,627 @@
+"""
+In-process vector store for the shared knowledge base.
+
+Embeddings live in a memory-mapped float32 matrix (`vectors.f32`, one
+L2-normalised row per chunk) and chunk text/metadata in a small SQLite file
+next to it, so retrieval needs neither PostgreSQL/PgVector nor a server.
+
+- Search is a blocked matrix product over the mmap with a per-block
+  argpartition, so many queries can be scored in one pass (`search_batch`).
+- Inserts append rows to the end of the matrix; deletes are tombstones that
+  `optimize()` compacts away.
+- Metadata filters are resolved in SQLite first and only matching rows scored.
+- A SQLite FTS5 index over the chunk text is maintained alongside, giving BM25
+  keyword search; `SearchType.hybrid` fuses both rankings with reciprocal rank
+  fusion so exact product names and FAQ phrases are not lost to embeddings.
+- Several processes (AgentOS workers) may share one store directory: writers
+  hold an exclusive lock on `write.lock` and number new rows from `chunks.db`,
+  and every instance remaps once SQLite reports a commit by another connection.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from agno.knowledge.document import Document
+from agno.knowledge.embedder import Embedder
+from agno.utils.log import logger
+from agno.vectordb.base import VectorDb
+from agno.vectordb.search import SearchType
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes are only serialized within the process
+    fcntl = None
+
+from .database import db_file
+from .embedding_cache import embed_queries
+
+# Directory for the vector files, next to the AgentOS database by default
+VECTOR_STORE_DIR = os.getenv("VECTOR_STORE_DIR", os.path.splitext(db_file)[0] + "_vectors")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    row INTEGER PRIMARY KEY,
+    id TEXT,
+    name TEXT,
+    content TEXT,
+    meta_data TEXT,
+    content_id TEXT,
+    content_hash TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_id ON chunks(id);
+CREATE INDEX IF NOT EXISTS idx_chunks_name ON chunks(name);
+CREATE INDEX IF NOT EXISTS idx_chunks_content_id ON chunks(content_id);
+CREATE INDEX IF NOT EXISTS idx_chunks_content_hash ON chunks(content_hash);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(name, content, tokenize = 'porter unicode61');
+"""
+
+
+class LocalVectorDb(VectorDb):
+    """NumPy/mmap-backed VectorDb with cosine similarity search."""
+
+    def __init__(
+        self,
+        path: str = VECTOR_STORE_DIR,
+        embedder: Optional[Embedder] = None,
+        reranker: Optional[Any] = None,
+        search_type: SearchType = SearchType.vector,
+        block_size: int = 65536,
+        compact_ratio: float = 0.25,
+        rrf_k: int = 60,
+        hybrid_candidates: int = 4,
+    ):
+        if embedder is None:
+            from agno.knowledge.embedder.openai import OpenAIEmbedder
+
+            embedder = OpenAIEmbedder()
+            logger.info("Embedder not provided, using OpenAIEmbedder as default.")
+        self.embedder: Embedder = embedder
+        self.reranker = reranker
+        self.search_type = search_type
+        self.path = Path(path)
+        # Rows scored per matrix product; bounds the temporary score buffer
+        self.block_size = block_size
+        # Compact the matrix once this fraction of rows are tombstones
+        self.compact_ratio = compact_ratio
+        # Hybrid search: RRF damping constant and candidates fetched per retriever (x limit)
+        self.rrf_k = rrf_k
+        self.hybrid_candidates = hybrid_candidates
+
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._alive: np.ndarray = np.zeros(0, dtype=bool)
+        self._dimensions: Optional[int] = None
+        # PRAGMA data_version the mapping was loaded at; it changes when another connection commits
+        self._data_version: Optional[int] = None
+        # Nesting of _write_lock / _read_lock (e.g. optimize() runs inside _delete_where)
+        self._write_depth = 0
+        self._read_depth = 0
+
+    # Storage
+
+    @property
+    def vectors_file(self) -> Path:
+        return self.path / "vectors.f32"
+
+    @property
+    def chunks_file(self) -> Path:
+        return self.path / "chunks.db"
+
+    @property
+    def lock_file(self) -> Path:
+        return self.path / "write.lock"
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.create()
+        return self._conn  # type: ignore
+
+    @property
+    def count(self) -> int:
+        """Number of live (not deleted) chunks."""
+        with self._read_lock():
+            return int(self._alive.sum())
+
+    def _ensure_loaded(self) -> None:
+        if self._conn is None:
+            self.create()
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """flock on `write.lock`: exclusive for writers, shared for readers of the mapping."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    @contextmanager
+    def _write_lock(self):
+        """Serialize writes across threads and processes, on an up-to-date view of the store."""
+        with self._lock:
+            self._ensure_loaded()
+            if self._write_depth:
+                yield
+                return
+            with self._file_lock(exclusive=True):
+                self._write_depth += 1
+                try:
+                    self._refresh()
+                    yield
+                finally:
+                    self._write_depth -= 1
+
+    @contextmanager
+    def _read_lock(self):
+        """Hold a consistent view of the store; writers in other processes wait until it is released."""
+        with self._lock:
+            self._ensure_loaded()
+            if self._write_depth or self._read_depth:
+                yield
+                return
+            with self._file_lock(exclusive=False):
+                self._read_depth += 1
+                try:
+                    self._refresh()
+                    yield
+                finally:
+                    self._read_depth -= 1
+
+    def _refresh(self) -> None:
+        """Reload the mapping if another connection committed since it was loaded."""
+        if self._conn.execute("PRAGMA data_version").fetchone()[0] != self._data_version:  # type: ignore
+            self._load()
+
+    def _load(self) -> None:
+        """Map the vector file and rebuild the tombstone mask from SQLite."""
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]  # type: ignore
+        row = self._conn.execute("SELECT value FROM settings WHERE key = 'dimensions'").fetchone()  # type: ignore
+        self._dimensions = int(row[0]) if row else None
+        total = self._next_row()
+        # The file may run past `total` while a writer appends; the mapping stops at the committed rows
+        self._remap(total)
+
+        self._alive = np.ones(total, dtype=bool)
+        deleted = [r for (r,) in self._conn.execute("SELECT row FROM chunks WHERE deleted = 1")]  # type: ignore
+        if deleted:
+            self._alive[deleted] = False
+
+    def _next_row(self) -> int:
+        return self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM chunks").fetchone()[0]  # type: ignore
+
+    def _remap(self, total: int) -> None:
+        if total and self._dimensions:
+            self._matrix = np.memmap(self.vectors_file, dtype=np.float32, mode="r", shape=(total, self._dimensions))
+        else:
+            self._matrix = None
+
+    def create(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                return
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.chunks_file, timeout=30, check_same_thread=False)
+            with self._file_lock(exclusive=True):
+                self._conn.executescript(_SCHEMA)
+                # Stores written before the lexical index existed get it backfilled once
+                if self._conn.execute("SELECT NOT EXISTS (SELECT 1 FROM chunks_fts)").fetchone()[0]:
+                    self._rebuild_keyword_index()
+                self._conn.commit()
+                self._load()
+
+    def _rebuild_keyword_index(self) -> None:
+        self._conn.execute("DELETE FROM chunks_fts")  # type: ignore
+        self._conn.execute(  # type: ignore
+            "INSERT INTO chunks_fts (rowid, name, content) SELECT row, name, content FROM chunks WHERE deleted = 0"
+        )
+
+    async def async_create(self) -> None:
+        self.create()
+
+    def exists(self) -> bool:
+        return self.chunks_file.exists()
+
+    async def async_exists(self) -> bool:
+        return self.exists()
+
+    def drop(self) -> None:
+        with self._lock:
+            self._close()
+            if self.path.exists():
+                shutil.rmtree(self.path)
+
+    async def async_drop(self) -> None:
+        self.drop()
+
+    def delete(self) -> bool:
+        """Remove every chunk, keeping an empty store."""
+        self.drop()
+        self.create()
+        return True
+
+    def _close(self) -> None:
+        self._matrix = None
+        self._alive = np.zeros(0, dtype=bool)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # Writes
+
+    def _append(self, content_hash: str, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        """Append already embedded documents as new rows."""
+        documents = [doc for doc in documents if doc.embedding is not None]
+        if not documents:
+            return
+
+        vectors = np.asarray([doc.embedding for doc in documents], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        with self._write_lock():
+            if self._dimensions is None:
+                self._dimensions = vectors.shape[1]
+                self.conn.execute("INSERT OR REPLACE INTO settings VALUES ('dimensions', ?)", (str(self._dimensions),))
+            elif vectors.shape[1] != self._dimensions:
+                raise ValueError(f"Embedding has {vectors.shape[1]} dimensions, store expects {self._dimensions}")
+
+            # Number from the committed rows, not this instance's view, so workers never collide
+            start = self._next_row()
+            rows = []
+            for offset, doc in enumerate(documents):
+                meta_data = {**(doc.meta_data or {}), **(filters or {})}
+                rows.append(
+                    (
+                        start + offset,
+                        doc.id or hashlib.md5(doc.content.encode()).hexdigest(),
+                        doc.name,
+                        doc.content,
+                        json.dumps(meta_data, default=str),
+                        doc.content_id,
+                        content_hash,
+                    )
+                )
+
+            with open(self.vectors_file, "ab") as f:
+                # Vectors are written before their rows are committed: drop a failed writer's tail
+                f.truncate(start * self._dimensions * 4)
+                f.write(vectors.tobytes())
+            self.conn.executemany(
+                "INSERT INTO chunks (row, id, name, content, meta_data, content_id, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            # Keep the lexical index in step with the chunks, row for row
+            self.conn.executemany(
+                "INSERT INTO chunks_fts (rowid, name, content) VALUES (?, ?, ?)", [(r[0], r[2], r[3]) for r in rows]
+            )
+            self.conn.commit()
+
+            self._alive = np.concatenate([self._alive[:start], np.ones(len(rows), dtype=bool)])
+            self._remap(len(self._alive))
+
+    def _embed(self, documents: List[Document]) -> None:
+        # Embedders with a batch API (e.g. CachedEmbedder) embed all chunks in one call
+        if hasattr(self.embedder, "get_embeddings"):
+            for document, embedding in zip(documents, self.embedder.get_embeddings([d.content for d in documents])):
+                document.embedding = embedding or None
+        else:
+            for document in documents:
+                document.embed(embedder=self.embedder)
+
+    def insert(self, content_hash: str, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        self._embed(documents)
+        self._append(content_hash, documents, filters)
+
+    async def async_insert(
+        self, content_hash: str, documents: List[Document], filters: Optional[Dict[str, Any]] = None
+    ) -> None:
+        if hasattr(self.embedder, "get_embeddings"):
+            await asyncio.to_thread(self._embed, documents)
+        else:
+            await asyncio.gather(*[document.async_embed(embedder=self.embedder) for document in documents])
+        await asyncio.to_thread(self._append, content_hash, documents, filters)
+
+    def upsert_available(self) -> bool:
+        return True
+
+    def upsert(self, content_hash: str, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        self._delete_where("content_hash = ?", (content_hash,))
+        self.insert(content_hash, documents, filters)
+
+    async def async_upsert(
+        self, content_hash: str, documents: List[Document], filters: Optional[Dict[str, Any]] = None
+    ) -> None:
+        await asyncio.to_thread(self._delete_where, "content_hash = ?", (content_hash,))
+        await self.async_insert(content_hash, documents, filters)
+
+    def _delete_where(self, clause: str, params: Sequence[Any]) -> bool:
+        with self._write_lock():
+            rows = [r for (r,) in self.conn.execute(f"SELECT row FROM chunks WHERE deleted = 0 AND {clause}", params)]
+            if not rows:
+                return False
+            self.conn.executemany("UPDATE chunks SET deleted = 1 WHERE row = ?", [(r,) for r in rows])
+            self.conn.executemany("DELETE FROM chunks_fts WHERE rowid = ?", [(r,) for r in rows])
+            self.conn.commit()
+            self._alive[rows] = False
+            if len(self._alive) and 1 - self._alive.mean() >= self.compact_ratio:
+                self.optimize()
+            return True
+
+    def delete_by_id(self, id: str) -> bool:
+        return self._delete_where("id = ?", (id,))
+
+    def delete_by_name(self, name: str) -> bool:
+        return self._delete_where("name = ?", (name,))
+
+    def delete_by_content_id(self, content_id: str) -> bool:
+        return self._delete_where("content_id = ?", (content_id,))
+
+    def delete_by_metadata(self, metadata: Dict[str, Any]) -> bool:
+        clause, params = self._metadata_clause(metadata)
+        return self._delete_where(clause, params)
+
+    def update_metadata(self, content_id: str, metadata: Dict[str, Any]) -> None:
+        with self._write_lock():
+            rows = self.conn.execute(
+                "SELECT row, meta_data FROM chunks WHERE deleted = 0 AND content_id = ?", (content_id,)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE chunks SET meta_data = ? WHERE row = ?",
+                [(json.dumps({**json.loads(meta or "{}"), **metadata}, default=str), row) for row, meta in rows],
+            )
+            self.conn.commit()
+
+    def optimize(self) -> None:
+        """Rewrite the matrix and chunk rows without tombstones."""
+        with self._write_lock():
+            live = np.flatnonzero(self._alive)
+            if len(live) == len(self._alive):
+                return
+
+            tmp_file = self.vectors_file.with_suffix(".tmp")
+            if self._matrix is not None and len(live):
+                with open(tmp_file, "wb") as f:
+                    for start in range(0, len(live), self.block_size):
+                        f.write(np.ascontiguousarray(self._matrix[live[start : start + self.block_size]]).tobytes())
+            else:
+                tmp_file.write_bytes(b"")
+
+            self._matrix = None
+            self.conn.execute("DELETE FROM chunks WHERE deleted = 1")
+            # Renumber through negative values so the primary key never collides
+            old_rows = [r for (r,) in self.conn.execute("SELECT row FROM chunks ORDER BY row")]
+            self.conn.executemany(
+                "UPDATE chunks SET row = ? WHERE row = ?", [(-1 - new, old) for new, old in enumerate(old_rows)]
+            )
+            self.conn.execute("UPDATE chunks SET row = -1 - row")
+            self._rebuild_keyword_index()
+            os.replace(tmp_file, self.vectors_file)
+            self.conn.commit()
+            self._load()
+            logger.debug(f"Compacted vector store to {len(live)} rows")
+
+    # Reads
+
+    def _exists_where(self, clause: str, params: Sequence[Any]) -> bool:
+        with self._lock:
+            return (
+                self.conn.execute(f"SELECT 1 FROM chunks WHERE deleted = 0 AND {clause} LIMIT 1", params).fetchone()
+                is not None
+            )
+
+    def name_exists(self, name: str) -> bool:
+        return self._exists_where("name = ?", (name,))
+
+    async def async_name_exists(self, name: str) -> bool:
+        return self.name_exists(name)
+
+    def id_exists(self, id: str) -> bool:
+        return self._exists_where("id = ?", (id,))
+
+    def content_hash_exists(self, content_hash: str) -> bool:
+        return self._exists_where("content_hash = ?", (content_hash,))
+
+    @staticmethod
+    def _metadata_clause(filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """SQL matching chunks whose metadata equals every filter (lists match any value)."""
+        clauses, params = [], []
+        for key, value in filters.items():
+            path = '$."' + str(key).replace('"', '""') + '"'
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                clauses.append(f"json_extract(meta_data, ?) IN ({', '.join('?' * len(values))})")
+                params.extend([path, *values])
+            else:
+                clauses.append("json_extract(meta_data, ?) = ?")
+                params.extend([path, value])
+        return " AND ".join(clauses) or "1", params
+
+    def _top_k(self, queries: np.ndarray, limit: int, rows: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """Row ids and cosine scores of the best `limit` live rows for each query."""
+        matrix, alive = self._matrix, self._alive
+        if matrix is None or limit <= 0:
+            return [[] for _ in queries]
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+        # Without filters, scan contiguous blocks of the mmap and mask tombstones,
+        # which is much cheaper than gathering the live rows
+        total = len(matrix) if rows is None else len(rows)
+        has_tombstones = not alive.all()
+
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, total, self.block_size):
+            if rows is None:
+                block_rows = np.arange(start, min(start + self.block_size, total))
+                scores = queries @ matrix[start : start + self.block_size].T
+            else:
+                block_rows = rows[start : start + self.block_size]
+                scores = queries @ matrix[block_rows].T
+            if has_tombstones:
+                scores[:, ~alive[block_rows]] = -np.inf
+
+            k = min(limit, scores.shape[1])
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_rows = np.concatenate([best_rows, block_rows[top]], axis=1)
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            if best_rows.shape[1] > limit:
+                keep = np.argpartition(-best_scores, limit - 1, axis=1)[:, :limit]
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        return [
+            [(int(r), float(s)) for r, s in zip(query_rows, query_scores) if np.isfinite(s)]
+            for query_rows, query_scores in zip(best_rows, best_scores)
+        ]
+
+    def _documents(self, hits: List[Tuple[int, float]], score_key: str = "similarity") -> List[Document]:
+        if not hits:
+            return []
+        by_row = {
+            row: (id_, name, content, meta_data, content_id)
+            for row, id_, name, content, meta_data, content_id in self.conn.execute(
+                f"SELECT row, id, name, content, meta_data, content_id FROM chunks WHERE row IN ({', '.join('?' * len(hits))})",
+                [row for row, _ in hits],
+            )
+        }
+        documents = []
+        for row, score in hits:
+            id_, name, content, meta_data, content_id = by_row[row]
+            documents.append(
+                Document(
+                    id=id_,
+                    name=name,
+                    content=content,
+                    meta_data={**json.loads(meta_data or "{}"), score_key: score},
+                    content_id=content_id,
+                    embedder=self.embedder,
+                )
+            )
+        return documents
+
+    def _filtered_rows(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        if not filters:
+            return None
+        clause, params = self._metadata_clause(filters)
+        return np.fromiter(
+            (r for (r,) in self.conn.execute(f"SELECT row FROM chunks WHERE deleted = 0 AND {clause}", params)),
+            dtype=np.int64,
+        )
+
+    def _vector_hits(
+        self, embeddings: Sequence[Optional[Sequence[float]]], limit: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        valid = [i for i, embedding in enumerate(embeddings) if embedding is not None and len(embedding)]
+        hits: List[List[Tuple[int, float]]] = [[] for _ in embeddings]
+        with self._read_lock():
+            if self._dimensions is None or not valid:
+                return hits
+            queries = np.asarray([embeddings[i] for i in valid], dtype=np.float32)
+            found = self._top_k(queries, limit, self._filtered_rows(filters))
+        for i, query_hits in zip(valid, found):
+            hits[i] = query_hits
+        return hits
+
+    def _keyword_hits(self, query: str, limit: int, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[int, float]]:
+        """BM25 ranking of the chunks matching any term of the query."""
+        terms = dict.fromkeys(re.findall(r"\w+", query.lower()))
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        clause, params = self._metadata_clause(filters) if filters else ("1", [])
+        with self._read_lock():
+            rows = self.conn.execute(
+                "SELECT chunks.row, bm25(chunks_fts) AS score FROM chunks_fts JOIN chunks ON chunks.row = chunks_fts.rowid "
+                f"WHERE chunks_fts MATCH ? AND chunks.deleted = 0 AND {clause} ORDER BY score LIMIT ?",
+                [match, *params, limit],
+            ).fetchall()
+        # SQLite's bm25() is lower-is-better; negate it so higher scores rank first
+        return [(row, -score) for row, score in rows]
+
+    def _fuse(self, *rankings: List[Tuple[int, float]], limit: int) -> List[Tuple[int, float]]:
+        """Reciprocal rank fusion: every ranking adds 1 / (rrf_k + rank) to a row's score."""
+        scores: Dict[int, float] = {}
+        for ranking in rankings:
+            for rank, (row, _) in enumerate(ranking, start=1):
+                scores[row] = scores.get(row, 0.0) + 1.0 / (self.rrf_k + rank)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def _embed_queries(self, queries: List[str]) -> List[Optional[List[float]]]:
+        if self.search_type == SearchType.keyword:
+            return [None] * len(queries)
+        # Queries are not worth persisting; CachedEmbedder keeps them in an in-memory LRU
+        embeddings = embed_queries(self.embedder, queries)
+        for query, embedding in zip(queries, embeddings):
+            if not embedding:
+                logger.error(f"Error getting embedding for Query: {query}")
+        return embeddings
+
+    def _rerank(self, query: str, documents: List[Document]) -> List[Document]:
+        if self.reranker is not None and documents:
+            return self.reranker.rerank(query=query, documents=documents)
+        return documents
+
+    def search_by_embedding(
+        self, embeddings: Iterable[Sequence[float]], limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """Top-`limit` chunks for each query embedding, scored in a single pass over the store."""
+        with self._read_lock():
+            hits = self._vector_hits(list(embeddings), limit, filters)
+            return [self._documents(query_hits) for query_hits in hits]
+
+    def keyword_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        with self._read_lock():
+            hits = self._keyword_hits(query, limit, filters)
+            return self._documents(hits, score_key="bm25")
+
+    def search_batch(
+        self, queries: List[str], limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """Search several queries with the configured search type and one scan of the matrix."""
+        embeddings = self._embed_queries(queries)
+        # Row ids are only stable while no compaction runs, so rank and fetch under one view
+        with self._read_lock():
+            if self.search_type == SearchType.keyword:
+                hits = [self._keyword_hits(query, limit, filters) for query in queries]
+                score_key = "bm25"
+            elif self.search_type == SearchType.hybrid:
+                # Fuse deeper candidate lists so chunks ranked well by only one retriever still surface
+                candidates = limit * self.hybrid_candidates
+                vector_hits = self._vector_hits(embeddings, candidates, filters)
+                hits = [
+                    self._fuse(query_hits, self._keyword_hits(query, candidates, filters), limit=limit)
+                    for query, query_hits in zip(queries, vector_hits)
+                ]
+                score_key = "rrf_score"
+            else:
+                hits = self._vector_hits(embeddings, limit, filters)
+                score_key = "similarity"
+            results = [self._documents(query_hits, score_key) for query_hits in hits]
+        return [self._rerank(query, documents) for query, documents in zip(queries, results)]
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        return self.search_batch([query], limit, filters)[0]
+
+    async def async_search(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        return await asyncio.to_thread(self.search, query, limit, filters)
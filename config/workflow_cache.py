@@ -0,0 +1,169 @@
+"""
+Bounded result cache for workflows.
+
+Workflows used to cache search results, scraped articles and finished posts
+in `session_state`, which is serialized with the session on every run and
+grew without bound. `WorkflowCache` keeps those entries in a `workflow_cache`
+table of the AgentOS SQLite database instead, with a TTL per kind of entry,
+LRU eviction past `max_entries` per namespace, and keys normalized so
+"AI Trends 2025" and "ai trends  2025!" share an entry.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from agno.utils.log import log_debug
+
+from .database import db_file, storage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workflow_cache (
+    namespace TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, kind, key)
+);
+CREATE INDEX IF NOT EXISTS idx_workflow_cache_lru ON workflow_cache(namespace, accessed_at);
+"""
+
+
+def normalize_key(text: str) -> str:
+    """Case-, width- and punctuation-insensitive cache key."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+class WorkflowCache:
+    """SQLite-backed cache with per-kind TTLs and LRU eviction."""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: Optional[float] = 86400.0,
+        max_entries: int = 500,
+        db_file: str = db_file,
+    ):
+        self.namespace = namespace
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.db_file = db_file
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats: Dict[str, Counter] = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = storage.connect(self.db_file)
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def _count(self, kind: str, event: str, n: int = 1) -> None:
+        self._stats.setdefault(kind, Counter())[event] += n
+
+    def _load(self, kind: str, key: str, touch: bool) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, expires_at FROM workflow_cache WHERE namespace = ? AND kind = ? AND key = ?",
+                (self.namespace, kind, normalize_key(key)),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self.conn.execute(
+                    "DELETE FROM workflow_cache WHERE namespace = ? AND kind = ? AND key = ?",
+                    (self.namespace, kind, normalize_key(key)),
+                )
+                self.conn.commit()
+                self._count(kind, "expired")
+                return None
+            if touch:
+                self.conn.execute(
+                    "UPDATE workflow_cache SET accessed_at = ? WHERE namespace = ? AND kind = ? AND key = ?",
+                    (now, self.namespace, kind, normalize_key(key)),
+                )
+                self.conn.commit()
+        return json.loads(row[0])
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """Cached value, or None when missing or expired."""
+        value = self._load(kind, key, touch=True)
+        self._count(kind, "hits" if value is not None else "misses")
+        return value
+
+    def put(self, kind: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value, evicting the least recently used entries past max_entries."""
+        now = time.time()
+        ttl = ttl if ttl is not None else self.ttls.get(kind, self.default_ttl)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO workflow_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.namespace,
+                    kind,
+                    normalize_key(key),
+                    json.dumps(value, default=str),
+                    now,
+                    now + ttl if ttl else None,
+                    now,
+                ),
+            )
+            self.conn.execute(
+                "DELETE FROM workflow_cache WHERE namespace = ? AND expires_at <= ?", (self.namespace, now)
+            )
+            evicted = self.conn.execute(
+                """
+                DELETE FROM workflow_cache WHERE namespace = ? AND rowid IN (
+                    SELECT rowid FROM workflow_cache WHERE namespace = ?
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.namespace, self.namespace, self.max_entries),
+            ).rowcount
+            self.conn.commit()
+        if evicted:
+            self._count(kind, "evictions", evicted)
+            log_debug(f"Evicted {evicted} entries from the {self.namespace} cache")
+
+    def merge(self, kind: str, key: str, values: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Add items to a cached dict, e.g. one scraped article at a time."""
+        current = self._load(kind, key, touch=False)
+        self.put(kind, key, {**(current if isinstance(current, dict) else {}), **values}, ttl)
+
+    def invalidate(self, kind: Optional[str] = None, key: Optional[str] = None) -> int:
+        where, params = "namespace = ?", [self.namespace]
+        if kind is not None:
+            where, params = where + " AND kind = ?", params + [kind]
+        if key is not None:
+            where, params = where + " AND key = ?", params + [normalize_key(key)]
+        with self._lock:
+            deleted = self.conn.execute(f"DELETE FROM workflow_cache WHERE {where}", params).rowcount
+            self.conn.commit()
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/expiry/eviction counts per kind since startup, plus the current entry count."""
+        with self._lock:
+            entries = self.conn.execute(
+                "SELECT COUNT(*) FROM workflow_cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+        kinds = {}
+        for kind, counts in self._stats.items():
+            lookups = counts["hits"] + counts["misses"]
+            kinds[kind] = {**counts, "hit_rate": round(counts["hits"] / lookups, 4) if lookups else 0.0}
+        return {"namespace": self.namespace, "entries": entries, "max_entries": self.max_entries, "kinds": kinds}
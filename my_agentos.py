@@ -5,183 +5,91 @@ ETUGRAND Company Operations Manager - AI-powered business operations platform
 import os
 import signal
 import sys
+from contextlib import asynccontextmanager
 from typing import Any
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-from agno.os import AgentOS
-
-# Import all agents
-from agents.content_agent import content_agent
-from agents.engagement_agent import engagement_agent
-from agents.postiz_agent import postiz_agent
-from agents.image_agent import image_agent
-from agents.video_agent import video_agent
-from agents.audio_agent import audio_agent
-from agents.operations_manager_agent import operations_manager_agent
-from agents.research_agent import research_agent
-from agents.analytics_agent import analytics_agent
-from agents.twitter_agent import twitter_agent
-from agents.linkedin_agent import linkedin_agent
-from agents.youtube_agent import youtube_agent as youtube_platform_agent
-from agents.reddit_agent import reddit_agent
-from agents.s3_agent import s3_agent
-
-# Import existing agents from agents/ directory
-from agents.competitor_analysis_agent import *
-from agents.media_trend_analysis_agent import *
-from agents.startup_idea_validator import *
-from agents.web_extraction_agent import *
-from agents.youtube_agent import *  # This is the existing YouTube agent
-
-# Import all teams
-from teams.operations_team import operations_team
-from teams.platform_team import platform_team
-from teams.strategy_team import strategy_team
-
-# Import existing teams from teams/ directory
-from teams.ai_customer_support_team import *
-from teams.autonomous_startup_team import *
-from teams.content_team import *
-from teams.news_agency_team import *
-
-# Import all workflows
-from workflow.operations_workflow import operations_workflow
-from workflow.daily_operations_workflow import daily_operations_workflow
-from workflow.crisis_workflow import crisis_workflow
-from workflow.campaign_workflow import campaign_workflow
-
-# Import existing workflows from workflow/ directory
-from workflow.blog_post_generator import *
-from workflow.research_agent import *
-# from workflow.research_workflow import *
-
-def initialize_knowledge_base():
-    """Initialize knowledge base with content loading if embeddings are available."""
-    try:
-        # Try to import sentence transformers to check if embeddings are available
-        import sentence_transformers
-        embeddings_available = True
-        print("✅ Sentence transformers available - knowledge base will include semantic search")
-    except ImportError:
-        embeddings_available = False
-        print("⚠️  Sentence transformers not available - knowledge base disabled")
-
-    if embeddings_available:
-        try:
-            # Import shared knowledge and load content
-            from config.knowledge import knowledge
-            from agno.knowledge.reader.website_reader import WebsiteReader
-
-            print("📚 Loading knowledge base content...")
-            knowledge.add_content(
-                url="https://etugrand.com",
-                reader=WebsiteReader(max_links=10),
-            )
-            print("✅ Knowledge base content loaded successfully")
-        except Exception as e:
-            print(f"⚠️  Failed to load knowledge content: {e}")
-            print("   Continuing without knowledge content...")
-    else:
-        print("📚 Skipping knowledge content loading (no embeddings available)")
-
-# Initialize knowledge base conditionally
-initialize_knowledge_base()
-
-def collect_all_agents():
-    """Collect all agent objects from the global namespace."""
-    import sys
-    from agno.agent import Agent
-    agents = []
-
-    # Add explicitly imported agents
-    explicit_agents = [
-        content_agent, engagement_agent, image_agent, video_agent, audio_agent,
-        postiz_agent, operations_manager_agent, research_agent,
-        analytics_agent, twitter_agent, linkedin_agent, youtube_platform_agent, reddit_agent, s3_agent
-    ]
-    agents.extend(explicit_agents)
-
-    # Collect agents from wildcard imports by checking global namespace
-    current_module = sys.modules[__name__]
-    for attr_name in dir(current_module):
-        if not attr_name.startswith('_'):
-            attr = getattr(current_module, attr_name)
-            # Check if it's an Agent instance (proper type checking)
-            if (isinstance(attr, Agent) and
-                attr not in agents and
-                attr not in [content_agent, engagement_agent, image_agent,
-                video_agent, audio_agent, postiz_agent, operations_manager_agent,
-                research_agent, analytics_agent, twitter_agent, linkedin_agent, youtube_platform_agent, reddit_agent, s3_agent]):
-                agents.append(attr)
-
-    return agents
-
-def collect_all_teams():
-    """Collect all team objects from the global namespace."""
-    import sys
-    teams = []
-
-    # Add explicitly imported teams
-    explicit_teams = [operations_team, platform_team, strategy_team]
-    teams.extend(explicit_teams)
-
-    # Collect teams from wildcard imports by checking global namespace
-    current_module = sys.modules[__name__]
-    for attr_name in dir(current_module):
-        if not attr_name.startswith('_'):
-            attr = getattr(current_module, attr_name)
-            # Check if it's a Team instance
-            if (hasattr(attr, 'name') and hasattr(attr, 'members') and hasattr(attr, 'model') and
-                hasattr(attr, 'instructions') and attr not in teams and
-                attr not in [operations_team, platform_team, strategy_team]):
-                teams.append(attr)
-
-    return teams
-
-def collect_all_workflows():
-    """Collect all workflow objects from the global namespace."""
-    import sys
-    workflows = []
-
-    # Add explicitly imported workflows
-    explicit_workflows = [operations_workflow, daily_operations_workflow, crisis_workflow, campaign_workflow]
-    workflows.extend(explicit_workflows)
-
-    # Collect workflows from wildcard imports by checking global namespace
-    current_module = sys.modules[__name__]
-    for attr_name in dir(current_module):
-        if not attr_name.startswith('_'):
-            attr = getattr(current_module, attr_name)
-            # Check if it's a Workflow instance
-            if (hasattr(attr, 'name') and hasattr(attr, 'description') and hasattr(attr, 'steps') and
-                attr not in workflows and attr not in [operations_workflow, daily_operations_workflow,
-                crisis_workflow, campaign_workflow]):
-                workflows.append(attr)
-
-    return workflows
-
-# Collect all available agents, teams, and workflows
-all_agents = collect_all_agents()
-all_teams = collect_all_teams()
-all_workflows = collect_all_workflows()
+# Agents, teams and workflows are declared in config/registry.py and only
+# imported on their first request (set AGENTOS_LAZY_LOADING=false to disable)
+from config.registry import LazyAgentOS, registry
+
+# The shared knowledge base is filled by a background job started with the app,
+# which only re-embeds pages that changed since the last crawl
+from config.ingestion import KnowledgeIngestionJob, get_ingestion_router, ingestion_lifespan
+from config.knowledge import knowledge
+
+knowledge_ingestion = KnowledgeIngestionJob(knowledge)
+
+# Long-running OUINHI media jobs are polled by a tracker that resumes in-flight jobs on startup
+from config.jobs import get_jobs_router, job_tracker_lifespan
+
+# Agents built with CachedOpenRouter reuse responses to repeated prompts
+from config.response_cache import get_response_cache_router
+
+# Sessions, memories and the stores share one database that is indexed and vacuumed on a schedule
+from config.database import SessionHistoryMiddleware, get_storage_router, storage_maintenance_lifespan
+
+# OpenRouter calls share per-model rate budgets; workflow runs queue behind interactive chats
+from config.model_scheduler import ModelPriorityMiddleware, get_model_scheduler_router
+
+# Session summaries are folded in the background every few runs instead of after every run
+from config.session_summaries import get_session_summary_router
+
+# User memories are extracted in the background, several runs per call, and merged with near-duplicates;
+# runs still queued on shutdown are extracted before the app exits
+from config.user_memories import get_memory_extraction_router, memory_extraction_lifespan
+
+
+@asynccontextmanager
+async def background_services(app):
+    """Start and stop the background services that run alongside the app."""
+    async with (
+        ingestion_lifespan(knowledge_ingestion)(app),
+        job_tracker_lifespan()(app),
+        storage_maintenance_lifespan()(app),
+        memory_extraction_lifespan()(app),
+    ):
+        yield
+
+
+# Collect all available agents, teams, and workflows from the component registry
+all_agents = registry.build("agent")
+all_teams = registry.build("team")
+all_workflows = registry.build("workflow")
 
 print(f"📊 Registered {len(all_agents)} agents, {len(all_teams)} teams, {len(all_workflows)} workflows")
 
 # Main AgentOS application
-agent_os = AgentOS(
+agent_os = LazyAgentOS(
     os_id="etugrand-operations-manager",
     description="ETUGRAND Company Operations Manager - AI-powered business operations platform",
     agents=all_agents,
     teams=all_teams,
     workflows=all_workflows,
     enable_mcp=True,  # Enable MCP server at /mcp endpoint
+    lifespan=background_services,
+    # Knowledge ingestion progress at GET /knowledge/ingestion (POST to re-run), media jobs at /media-jobs,
+    # LLM response cache stats at GET /llm-cache (DELETE to clear), model call queues at GET /llm-scheduler,
+    # database status at GET /storage (POST to run maintenance), session summary stats at GET /session-summaries,
+    # memory extraction stats at GET /memory-extraction (POST to merge stored duplicates)
+    routers=[
+        get_ingestion_router(knowledge_ingestion),
+        get_jobs_router(),
+        get_response_cache_router(),
+        get_model_scheduler_router(),
+        get_storage_router(),
+        get_session_summary_router(),
+        get_memory_extraction_router(),
+    ],
 )
 
 # Get the FastAPI app
 app = agent_os.get_app()
+app.add_middleware(ModelPriorityMiddleware)
+app.add_middleware(SessionHistoryMiddleware)
 
 def signal_handler(signum: int, frame: Any) -> None:
     """Handle shutdown signals gracefully"""
@@ -1,11 +1,14 @@
 from agno.agent import Agent
 from agno.knowledge.reader.website_reader import WebsiteReader
-from agno.models.openrouter import OpenRouter
 from agno.team.team import Team
 from agno.tools.duckduckgo import DuckDuckGoTools
 from agno.tools.exa import ExaTools
 from agno.tools.slack import SlackTools
 
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import REASONING_MODEL
+from config.response_cache import CachedOpenRouter
+
 # Import shared knowledge from config
 from config.knowledge import knowledge
 
@@ -19,7 +22,7 @@ feedback_channel = "testing"
 doc_researcher_agent = Agent(
     name="Doc researcher Agent",
     role="Search the knowledge base for information",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=CachedOpenRouter(REASONING_MODEL),
     tools=[DuckDuckGoTools(), ExaTools()],
     knowledge=knowledge,
     search_knowledge=True,
@@ -39,7 +42,7 @@ doc_researcher_agent = Agent(
 escalation_manager_agent = Agent(
     name="Escalation Manager Agent",
     role="Escalate the issue to the slack channel",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     tools=[SlackTools()],
     instructions=[
         "You are an escalation manager responsible for routing critical issues to the support team.",
@@ -55,7 +58,7 @@ escalation_manager_agent = Agent(
 feedback_collector_agent = Agent(
     name="Feedback Collector Agent",
     role="Collect feedback from the user",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     tools=[SlackTools()],
     description="You are an AI agent that can collect feedback from the user.",
     instructions=[
@@ -72,7 +75,7 @@ feedback_collector_agent = Agent(
 
 customer_support_team = Team(
     name="Customer Support Team",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=CachedOpenRouter(REASONING_MODEL),
     members=[doc_researcher_agent, escalation_manager_agent, feedback_collector_agent],
     determine_input_for_members=False,
     respond_directly=True,
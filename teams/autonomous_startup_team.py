@@ -9,7 +9,6 @@
 from agno.agent import Agent
 from agno.knowledge.knowledge import Knowledge
 from agno.knowledge.reader.pdf_reader import PDFReader
-from agno.models.openrouter import OpenRouter
 from agno.team.team import Team
 from agno.tools.duckduckgo import DuckDuckGoTools
 from agno.tools.exa import ExaTools
@@ -25,6 +24,8 @@ except ImportError:
 
 # Import shared knowledge from config
 from config.knowledge import knowledge
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import REASONING_MODEL
 
 # Note: Content loading is handled by AgentOS startup, not at module import time
 # knowledge.add_content(...) - moved to AgentOS initialization
@@ -37,7 +38,7 @@ sales_channel = "sales"
 legal_compliance_agent = Agent(
     name="Legal Compliance Agent",
     role="Legal Compliance",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     tools=[ExaTools()],
     knowledge=knowledge,
     instructions=[
@@ -59,7 +60,7 @@ legal_compliance_agent = Agent(
 product_manager_agent = Agent(
     name="Product Manager Agent",
     role="Product Manager",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     knowledge=knowledge,
     instructions=[
         "You are the Product Manager of a startup, responsible for product strategy and execution.",
@@ -82,7 +83,7 @@ product_manager_agent = Agent(
 market_research_agent = Agent(
     name="Market Research Agent",
     role="Market Research",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     tools=[DuckDuckGoTools(), ExaTools()],
     knowledge=knowledge,
     instructions=[
@@ -104,7 +105,7 @@ market_research_agent = Agent(
 sales_agent = Agent(
     name="Sales Agent",
     role="Sales",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     tools=[SlackTools()],
     knowledge=knowledge,
     instructions=[
@@ -132,7 +133,7 @@ sales_agent = Agent(
 financial_analyst_agent = Agent(
     name="Financial Analyst Agent",
     role="Financial Analyst",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     knowledge=knowledge,
     tools=[YFinanceTools()] if YFINANCE_AVAILABLE else [],
     instructions=[
@@ -155,7 +156,7 @@ financial_analyst_agent = Agent(
 customer_support_agent = Agent(
     name="Customer Support Agent",
     role="Customer Support",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     knowledge=knowledge,
     tools=[SlackTools()],
     instructions=[
@@ -170,7 +171,7 @@ customer_support_agent = Agent(
 
 autonomous_startup_team = Team(
     name="CEO Agent",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     instructions=[
         "You are the CEO of a startup, responsible for overall leadership and success.",
         " Always delegate task to product manager agent so it can search the knowledge base.",
@@ -2,13 +2,15 @@ from agno.agent import Agent
 from agno.team import Team
 from agno.tools.duckduckgo import DuckDuckGoTools
 
+from config.models import GEMINI_MODEL, REASONING_MODEL
+
 # Optional Gemini model - fallback to DeepSeek if not available
 try:
     from agno.models.google.gemini import Gemini
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
-    from agno.models.openrouter import OpenRouter
+    from config.model_scheduler import ScheduledOpenRouter
     print("⚠️  Gemini model not available - using DeepSeek fallback")
 
 # Create individual specialized agents
@@ -16,19 +18,19 @@ researcher = Agent(
     name="Researcher",
     role="Expert at finding information",
     tools=[DuckDuckGoTools()],
-    model=Gemini("gemini-2.0-flash-001") if GEMINI_AVAILABLE else OpenRouter("deepseek/deepseek-r1"),
+    model=Gemini("gemini-2.0-flash-001") if GEMINI_AVAILABLE else ScheduledOpenRouter(REASONING_MODEL),
 )
 
 writer = Agent(
     name="Writer",
     role="Expert at writing clear, engaging content",
-    model=Gemini("gemini-2.0-flash-001") if GEMINI_AVAILABLE else OpenRouter("deepseek/deepseek-r1"),
+    model=Gemini("gemini-2.0-flash-001") if GEMINI_AVAILABLE else ScheduledOpenRouter(REASONING_MODEL),
 )
 
 # Create a team with these agents
 content_team = Team(
     name="Content Team",
-    model=Gemini("gemini-2.5-flash") if GEMINI_AVAILABLE else OpenRouter("deepseek/deepseek-r1"),
+    model=Gemini(GEMINI_MODEL) if GEMINI_AVAILABLE else ScheduledOpenRouter(REASONING_MODEL),
     # model=Gemini("gemini-2.0-flash-lite"),  # Try a small model for faster response
     members=[researcher, writer],
     instructions="You are a team of researchers and writers that work together to create high-quality content.",
@@ -7,13 +7,16 @@
 from pathlib import Path
 
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
 from agno.team.team import Team
 from agno.tools.duckduckgo import DuckDuckGoTools
 
-# Optional Newspaper4k tools - skip if not installed
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import REASONING_MODEL
+from tools.article_tools import ArticleReaderTools
+
+# Article extraction needs Newspaper4k - skip the tool if not installed
 try:
-    from agno.tools.newspaper4k import Newspaper4kTools
+    import newspaper  # noqa: F401
     NEWSPAPER_AVAILABLE = True
 except ImportError:
     NEWSPAPER_AVAILABLE = False
@@ -51,13 +54,13 @@ writer = Agent(
         "Never make up facts or plagiarize. Always provide proper attribution.",
         "Remember: you are writing for the New York Times, so the quality of the article is important.",
     ],
-    tools=[Newspaper4kTools()] if NEWSPAPER_AVAILABLE else [],
+    tools=[ArticleReaderTools()] if NEWSPAPER_AVAILABLE else [],
     add_datetime_to_context=True,
 )
 
 editor = Team(
     name="Editor",
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     members=[searcher, writer],
     description="You are a senior NYT editor. Given a topic, your goal is to write a NYT worthy article.",
     instructions=[
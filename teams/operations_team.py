@@ -1,9 +1,11 @@
 import os
 from agno.team import Team
-from agno.models.openrouter import OpenRouter
 
 # Import shared config
 from config.database import db
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import FAST_MODEL
+from config.user_memories import BatchedMemoryManager
 
 # Import agents
 from agents.content_agent import content_agent
@@ -16,13 +18,14 @@ from agents.postiz_agent import postiz_agent
 operations_team = Team(
     id="operations-team",
     name="ETUGRAND Operations Team",
-    model=OpenRouter(
-        id=os.getenv("OPENROUTER_MODEL_NAME", "anthropic/claude-3-haiku"),
+    model=ScheduledOpenRouter(
+        id=FAST_MODEL,
         api_key=os.getenv("OPENROUTER_API_KEY")
     ),
     db=db,
     members=[content_agent, engagement_agent, image_agent, video_agent, audio_agent, postiz_agent],
     enable_user_memories=True,
+    memory_manager=BatchedMemoryManager(),
     add_datetime_to_context=True,
     markdown=True,
     instructions="""
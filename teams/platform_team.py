@@ -1,9 +1,11 @@
 import os
 from agno.team import Team
-from agno.models.openrouter import OpenRouter
 
 # Import shared config
 from config.database import db
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import FAST_MODEL
+from config.user_memories import BatchedMemoryManager
 
 # Import agents
 from agents.twitter_agent import twitter_agent
@@ -13,13 +15,14 @@ from agents.reddit_agent import reddit_agent
 
 platform_team = Team(
     name="Platform Management Team",
-    model=OpenRouter(
-        id=os.getenv("OPENROUTER_MODEL_NAME", "anthropic/claude-3-haiku"),
+    model=ScheduledOpenRouter(
+        id=FAST_MODEL,
         api_key=os.getenv("OPENROUTER_API_KEY")
     ),
     db=db,
     members=[twitter_agent, linkedin_agent, youtube_agent, reddit_agent],
     enable_user_memories=True,
+    memory_manager=BatchedMemoryManager(),
     add_datetime_to_context=True,
     markdown=True,
     instructions="""
@@ -1,9 +1,11 @@
 import os
 from agno.team import Team
-from agno.models.openrouter import OpenRouter
 
 # Import shared config
 from config.database import db
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import FAST_MODEL
+from config.user_memories import BatchedMemoryManager
 
 # Import agents
 from agents.operations_manager_agent import operations_manager_agent
@@ -12,13 +14,14 @@ from agents.research_agent import research_agent
 
 strategy_team = Team(
     name="Strategy Team",
-    model=OpenRouter(
-        id=os.getenv("OPENROUTER_MODEL_NAME", "anthropic/claude-3-haiku"),
+    model=ScheduledOpenRouter(
+        id=FAST_MODEL,
         api_key=os.getenv("OPENROUTER_API_KEY")
     ),
     db=db,
     members=[operations_manager_agent, analytics_agent, research_agent],
     enable_user_memories=True,
+    memory_manager=BatchedMemoryManager(),
     add_datetime_to_context=True,
     markdown=True,
     instructions="""
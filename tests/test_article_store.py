@@ -0,0 +1,77 @@
+"""Derived article results survive markup-only changes and old pages are pruned by storage maintenance."""
+
+import sqlite3
+import time
+import zlib
+
+import httpx
+import pytest
+
+from config.article_store import ArticleStore, text_hash
+from config.database import StorageManager
+
+PAGE = "<html><head><script>var nonce = '{nonce}';</script></head><body><p>{text}</p></body></html>"
+
+
+@pytest.fixture
+def served(tmp_path):
+    """A store that fetches on every call, served the page described by the returned dict."""
+    page = {"nonce": "a", "text": "Tariffs rose again."}
+    store = ArticleStore(db_file=str(tmp_path / "articles.db"), fresh_seconds=0)
+    store._client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=PAGE.format(**page))))
+    yield store, page
+    store.conn.close()
+
+
+def test_derived_results_follow_the_visible_text(served):
+    store, page = served
+    first = store.fetch("https://news.example/a")
+    store.put_derived(first.text_hash, "scrape", {"title": "Tariffs"})
+
+    page["nonce"] = "b"
+    second = store.fetch("https://news.example/a")
+    assert second.content_hash != first.content_hash
+    assert store.get_derived(second.text_hash, "scrape") == {"title": "Tariffs"}
+
+    page["text"] = "Tariffs fell."
+    third = store.fetch("https://news.example/a")
+    assert store.get_derived(third.text_hash, "scrape") is None
+
+
+def test_storage_maintenance_prunes_old_pages(served, tmp_path):
+    store, _ = served
+    page = store.fetch("https://news.example/old")
+    store.put_derived(page.text_hash, "scrape", {"title": "Old"})
+    store.conn.execute("UPDATE article_pages SET checked_at = ?", (time.time() - 90 * 86400,))
+    store.conn.commit()
+
+    manager = StorageManager(sqlite_file=str(tmp_path / "articles.db"))
+    manager.register_maintenance("article_store", store.prune)
+    report = manager.maintain()
+
+    assert report.state == "completed"
+    assert report.pruned == {"article_store": 1}
+    assert store.lookup("https://news.example/old") is None
+    assert store.stats()["bodies"] == 0
+    assert store.get_derived(page.text_hash, "scrape") is None
+
+
+def test_text_hashes_are_added_to_an_existing_store(tmp_path):
+    path = str(tmp_path / "articles.db")
+    body = PAGE.format(nonce="a", text="Kept").encode()
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE article_pages (url_key TEXT PRIMARY KEY, url TEXT NOT NULL, content_hash TEXT NOT NULL, etag TEXT,
+            last_modified TEXT, content_type TEXT, fetched_at REAL NOT NULL, checked_at REAL NOT NULL);
+        CREATE TABLE article_bodies (content_hash TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL,
+            created_at REAL NOT NULL);
+        """
+    )
+    conn.execute("INSERT INTO article_bodies VALUES ('raw', ?, ?, 0)", (zlib.compress(body), len(body)))
+    conn.execute("INSERT INTO article_pages VALUES ('https://news.example/', 'https://news.example/', 'raw', NULL, NULL, NULL, 0, 0)")
+    conn.commit()
+    conn.close()
+
+    store = ArticleStore(db_file=path)
+    assert store.lookup("https://news.example/").text_hash == text_hash(body)
@@ -0,0 +1,93 @@
+"""The persistent embedding cache stays bounded and one-off texts never reach it."""
+
+import sqlite3
+import time
+
+import pytest
+from agno.knowledge.embedder.base import Embedder
+
+from config.embedding_cache import CachedEmbedder
+
+
+class CountingEmbedder(Embedder):
+    def __init__(self):
+        super().__init__(dimensions=2)
+        self.calls = []
+
+    def get_embedding(self, text: str):
+        self.calls.append(text)
+        return [float(len(text)), 1.0]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+def cached(tmp_path, **kwargs):
+    return CachedEmbedder(embedder=CountingEmbedder(), db_file=str(tmp_path / "cache.db"), **kwargs)
+
+
+def stored(embedder):
+    return {text_hash for (text_hash,) in embedder.conn.execute("SELECT text_hash FROM embedding_cache")}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    embedder = cached(tmp_path, max_entries=2)
+    embedder.get_embeddings(["alpha"])
+    clock[0] += 10
+    embedder.get_embeddings(["beta"])
+    clock[0] += 10
+    embedder.get_embeddings(["alpha"])  # a hit makes alpha the most recently used
+    clock[0] += 10
+    embedder.get_embeddings(["gamma"])
+
+    assert len(stored(embedder)) == 2
+    assert embedder.evicted == 1
+    embedder.embedder.calls.clear()
+    embedder.get_embeddings(["alpha", "gamma", "beta"])
+    assert embedder.embedder.calls == ["beta"]
+
+
+def test_entries_unused_past_the_ttl_are_dropped(tmp_path, clock):
+    embedder = cached(tmp_path, ttl_days=1)
+    embedder.get_embeddings(["old"])
+    clock[0] += 2 * 86400
+    embedder.get_embeddings(["new"])
+
+    assert len(stored(embedder)) == 1
+    embedder.embedder.calls.clear()
+    embedder.get_embeddings(["new", "old"])
+    assert embedder.embedder.calls == ["old"]
+
+
+def test_query_embeddings_stay_in_a_bounded_memory_lru(tmp_path):
+    embedder = cached(tmp_path, query_cache_size=2)
+    assert embedder.get_query_embeddings(["q1", "q2", "q1"]) == [[2.0, 1.0], [2.0, 1.0], [2.0, 1.0]]
+    embedder.get_query_embedding("q1")
+    embedder.get_query_embedding("q3")
+
+    assert stored(embedder) == set()
+    assert len(embedder._queries) == 2
+    embedder.embedder.calls.clear()
+    embedder.get_query_embeddings(["q1", "q3", "q2"])
+    assert embedder.embedder.calls == ["q2"]
+
+
+def test_caches_from_before_eviction_are_migrated(tmp_path):
+    conn = sqlite3.connect(tmp_path / "cache.db")
+    conn.execute(
+        "CREATE TABLE embedding_cache (model TEXT NOT NULL, text_hash TEXT NOT NULL, embedding BLOB NOT NULL, "
+        "created_at INTEGER NOT NULL, PRIMARY KEY (model, text_hash))"
+    )
+    created_at = int(time.time())
+    conn.execute("INSERT INTO embedding_cache VALUES ('CountingEmbedder', 'h', x'00000000', ?)", (created_at,))
+    conn.commit()
+    conn.close()
+
+    embedder = cached(tmp_path)
+    assert embedder.conn.execute("SELECT accessed_at FROM embedding_cache").fetchone() == (created_at,)
+    embedder.get_embeddings(["fresh"])
+    assert len(stored(embedder)) == 2
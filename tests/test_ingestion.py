@@ -0,0 +1,27 @@
+"""Knowledge ingestion runs in one worker only."""
+
+import asyncio
+from types import SimpleNamespace
+
+from config.ingestion import KnowledgeIngestionJob
+
+
+def job(lock_file):
+    return KnowledgeIngestionJob(SimpleNamespace(vector_db=object(), contents_db=None), lock_file=str(lock_file))
+
+
+def test_only_one_worker_is_leader(tmp_path):
+    lock_file = tmp_path / "ingestion.lock"
+    first, second = job(lock_file), job(lock_file)
+
+    assert first.is_leader()
+    assert first.is_leader()
+    assert not second.is_leader()
+
+    progress = asyncio.run(second.run())
+    assert progress.state == "skipped"
+
+    # The lock is released on shutdown so another worker can take over
+    asyncio.run(first.stop())
+    assert second.is_leader()
+    asyncio.run(second.stop())
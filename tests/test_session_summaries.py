@@ -0,0 +1,92 @@
+"""Background session summaries write only the summary and measure against the whole conversation."""
+
+import copy
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from agno.agent import Agent
+from agno.db.base import SessionType
+from agno.models.base import Model
+from agno.models.response import ModelResponse
+from agno.session.summary import SessionSummary
+
+from config.database import TunedSqliteDb, full_session_history
+from config.prompt_budget import estimate_tokens
+from config.session_summaries import SUMMARY_CURSOR_KEY, IncrementalSessionSummaryManager, SummaryStats, _Pending
+
+
+@dataclass
+class OfflineModel(Model):
+    id: str = "offline"
+    name: str = "Offline"
+    provider: str = "Offline"
+
+    def invoke(self, *args, **kwargs) -> ModelResponse:
+        return ModelResponse(role="assistant", content="an answer")
+
+    async def ainvoke(self, *args, **kwargs) -> ModelResponse:
+        return self.invoke()
+
+    def invoke_stream(self, *args, **kwargs):
+        yield self.invoke()
+
+    async def ainvoke_stream(self, *args, **kwargs):
+        yield self.invoke()
+
+    def _parse_provider_response(self, response, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response) -> ModelResponse:
+        return response
+
+
+def setup(tmp_path, runs: int):
+    db = TunedSqliteDb(db_file=str(tmp_path / "agentos.db"), hot_runs=2)
+    agent = Agent(model=OfflineModel(), db=db, session_state={"visits": 0}, telemetry=False)
+    for number in range(runs):
+        agent.run(f"question {number}", session_id="s")
+    manager = IncrementalSessionSummaryManager(model=OfflineModel(), db=db, stats=SummaryStats())
+    return db, manager
+
+
+def test_save_keeps_runs_and_state_written_by_the_session(tmp_path):
+    db, manager = setup(tmp_path, runs=3)
+    # The session's own run saves new state while the summary is being folded
+    session = db.get_session("s", SessionType.AGENT)
+    session.session_data["session_state"]["visits"] = 5
+    db.upsert_session(session)
+
+    summary = SessionSummary(summary="talked", topics=["questions"], updated_at=datetime.now())
+    manager._save("s", SessionType.AGENT, summary, cursor=session.runs[-1].run_id)
+
+    stored = db.get_session("s", SessionType.AGENT)
+    assert stored.summary.summary == "talked"
+    assert stored.session_data[SUMMARY_CURSOR_KEY] == session.runs[-1].run_id
+    assert stored.session_data["session_state"]["visits"] == 5
+    assert [run.run_id for run in stored.runs] == [run.run_id for run in session.runs]
+
+    # An older summary never replaces a newer one
+    older = SessionSummary(summary="stale", updated_at=summary.updated_at - timedelta(minutes=1))
+    manager._save("s", SessionType.AGENT, older, cursor="other")
+    stored = db.get_session("s", SessionType.AGENT)
+    assert stored.summary.summary == "talked"
+    assert stored.session_data[SUMMARY_CURSOR_KEY] == session.runs[-1].run_id
+
+
+def test_full_resummary_tokens_cover_runs_outside_the_hot_window(tmp_path):
+    db, manager = setup(tmp_path, runs=6)
+    with full_session_history():
+        session = db.get_session("s", SessionType.AGENT)
+    assert len(session.runs) == 6
+    pending = _Pending(
+        session_type=SessionType.AGENT,
+        summary=None,
+        runs=[(run.run_id, manager._messages(session, run)) for run in session.runs[3:]],
+    )
+
+    expected = 0
+    for end in range(4, 7):
+        partial = copy.copy(session)
+        partial.runs = session.runs[:end]
+        expected += sum(estimate_tokens(m.get_content_string()) for m in manager._prepare_summary_messages(partial))
+    assert manager._full_resummary_tokens("s", pending) == expected
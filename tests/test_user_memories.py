@@ -0,0 +1,30 @@
+"""Queued memory extraction is not lost when the app shuts down."""
+
+import asyncio
+
+from agno.memory import MemoryManager
+
+from config.user_memories import BatchedMemoryManager, MemoryStats, memory_extraction_lifespan
+
+
+def test_lifespan_shutdown_extracts_queued_runs(monkeypatch):
+    extracted = []
+    monkeypatch.setattr(
+        MemoryManager, "create_user_memories", lambda self, messages, user_id, **kwargs: extracted.append((user_id, messages))
+    )
+    manager = BatchedMemoryManager(db=object(), batch_runs=10, idle_seconds=60, stats=MemoryStats())
+    manager.create_user_memories(message="I live in Izmir", user_id="ada")
+    manager.create_user_memories(message="I prefer short answers", user_id="ada")
+    timer = manager._pending["ada"].timer
+    assert not extracted
+
+    async def serve():
+        async with memory_extraction_lifespan()(app=None):
+            pass
+
+    asyncio.run(serve())
+    assert [(user_id, [m.content for m in messages]) for user_id, messages in extracted] == [
+        ("ada", ["I live in Izmir", "I prefer short answers"])
+    ]
+    assert not manager._pending
+    assert timer.finished.is_set()
@@ -0,0 +1,97 @@
+"""Several LocalVectorDb instances (one per AgentOS worker) sharing one store directory."""
+
+import hashlib
+import threading
+
+import numpy as np
+import pytest
+from agno.knowledge.document import Document
+from agno.knowledge.embedder.base import Embedder
+
+from config.vector_store import LocalVectorDb
+
+DIMENSIONS = 16
+
+
+class HashEmbedder(Embedder):
+    """Deterministic offline embeddings: the same text always maps to the same vector."""
+
+    def __init__(self):
+        super().__init__(dimensions=DIMENSIONS)
+
+    def get_embedding(self, text: str):
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+        return np.random.default_rng(seed).standard_normal(DIMENSIONS).tolist()
+
+    def get_embedding_and_usage(self, text: str):
+        return self.get_embedding(text), None
+
+
+def documents(prefix: str, count: int):
+    return [Document(id=f"{prefix}-{i}", name=prefix, content=f"{prefix} chunk number {i}") for i in range(count)]
+
+
+@pytest.fixture
+def stores(tmp_path):
+    first = LocalVectorDb(path=str(tmp_path), embedder=HashEmbedder())
+    second = LocalVectorDb(path=str(tmp_path), embedder=HashEmbedder())
+    yield first, second
+    first._close()
+    second._close()
+
+
+def test_two_instances_append_without_row_collisions(stores):
+    first, second = stores
+    first.insert("a", documents("alpha", 5))
+    second.insert("b", documents("beta", 7))
+    first.insert("c", documents("gamma", 3))
+
+    assert first.count == second.count == 15
+    rows = [row for (row,) in first.conn.execute("SELECT row FROM chunks ORDER BY row")]
+    assert rows == list(range(15))
+
+
+def test_instance_sees_inserts_and_deletes_of_the_other(stores):
+    first, second = stores
+    first.insert("a", documents("alpha", 4))
+    second.insert("b", documents("beta", 4))
+
+    hit = first.search("beta chunk number 2", limit=1)[0]
+    assert hit.id == "beta-2"
+    assert hit.meta_data["similarity"] == pytest.approx(1.0, abs=1e-5)
+
+    second.delete_by_name("alpha")
+    assert first.count == 4
+    assert not first.name_exists("alpha")
+    assert first.search("alpha chunk number 1", limit=1)[0].name == "beta"
+
+
+def test_compaction_by_one_instance_is_picked_up_by_the_other(stores):
+    first, second = stores
+    first.insert("a", documents("alpha", 6))
+    second.insert("b", documents("beta", 6))
+    second.delete_by_name("alpha")  # half the rows are tombstones, so this compacts
+
+    assert first.search("beta chunk number 5", limit=1)[0].id == "beta-5"
+    first.insert("c", documents("gamma", 2))
+    assert second.search("gamma chunk number 1", limit=1)[0].id == "gamma-1"
+    assert first.count == second.count == 8
+
+
+def test_concurrent_appends_from_two_instances(stores):
+    first, second = stores
+
+    def ingest(store, prefix):
+        for batch in range(20):
+            store.insert(f"{prefix}-{batch}", documents(f"{prefix}{batch}", 5))
+
+    threads = [threading.Thread(target=ingest, args=(store, name)) for store, name in ((first, "x"), (second, "y"))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert first.count == second.count == 200
+    for store in stores:
+        assert store.search("y7 chunk number 3", limit=1)[0].id == "y7-3"
+        assert store.search("x19 chunk number 0", limit=1)[0].id == "x19-0"
@@ -0,0 +1,71 @@
+"""
+Article reading tools backed by the shared article store (config/article_store.py).
+
+`ArticleReaderTools` is a drop-in for Newspaper4kTools' `read_article` and
+`CachedFirecrawlTools` for FirecrawlTools; both reuse pages (and their
+extractions) already fetched by any other agent or workflow, and only go to
+the network when the stored copy is stale and the page has actually changed.
+"""
+
+import json
+from typing import Optional
+
+from agno.tools import Toolkit
+from agno.tools.firecrawl import FirecrawlTools
+
+from config.article_store import ArticleStore, article_store
+
+
+class ArticleReaderTools(Toolkit):
+    """Read the text of an article from a URL."""
+
+    def __init__(self, store: ArticleStore = article_store, article_length: Optional[int] = None, **kwargs):
+        self.store = store
+        self.article_length = article_length
+        super().__init__(name="article_reader_tools", tools=[self.read_article], **kwargs)
+
+    def read_article(self, url: str) -> str:
+        """Use this function to read an article from a URL.
+
+        Args:
+            url (str): The URL of the article.
+
+        Returns:
+            str: JSON containing the article title, authors, publish date, and text.
+        """
+        page = self.store.fetch(url)
+        article = self.store.extract(page) if page is not None else None
+        if not article or not article.get("text"):
+            return f"Error reading article from {url}: could not download or extract the article."
+
+        article = {key: value for key, value in article.items() if value}
+        if self.article_length:
+            article["text"] = article["text"][: self.article_length]
+        return json.dumps(article)
+
+
+class CachedFirecrawlTools(FirecrawlTools):
+    """FirecrawlTools whose scrapes are reused until the text of the scraped page changes."""
+
+    def __init__(self, store: ArticleStore = article_store, **kwargs):
+        self.store = store
+        super().__init__(**kwargs)
+
+    def scrape_website(self, url: str) -> str:
+        """Use this function to scrape a website using Firecrawl.
+
+        Args:
+            url (str): The URL to scrape.
+        """
+        # Pages that block plain requests are scraped every time, without caching
+        page = self.store.fetch(url)
+        kind = "firecrawl:" + ",".join(self.formats or [])
+        if page is not None:
+            cached = self.store.get_derived(page.text_hash, kind)
+            if cached is not None:
+                return cached
+
+        result = super().scrape_website(url)
+        if page is not None:
+            self.store.put_derived(page.text_hash, kind, result)
+        return result
@@ -19,18 +19,31 @@ Key capabilities:
 import asyncio
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from textwrap import dedent
-from typing import Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Union
+from uuid import uuid4
 
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-from agno.models.openrouter import OpenRouter
+from agno.run.agent import RunContentEvent, RunEvent
+from agno.run.workflow import CustomEvent
 from agno.tools.googlesearch import GoogleSearchTools
 from agno.utils.log import logger
 from agno.utils.pprint import pprint_run_response
+from agno.workflow.types import WorkflowExecutionInput
 from agno.workflow.workflow import Workflow
 from pydantic import BaseModel, Field
 
+from config.article_store import StoredPage, article_store
+from config.checkpoints import CheckpointStore
+from config.database import db
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import DEFAULT_MODEL
+from config.prompt_budget import compact_json, compact_sources, estimate_tokens, log_prompt_size
+from config.response_cache import CachedOpenRouter
+from config.workflow_cache import WorkflowCache
+
 # Optional Newspaper4k tools - skip if not installed
 try:
     from agno.tools.newspaper4k import Newspaper4kTools
@@ -39,6 +52,25 @@ except ImportError:
     NEWSPAPER_AVAILABLE = False
     print("⚠️  Newspaper4k tools not available - install with: pip install newspaper4k lxml_html_clean")
 
+# Articles scraped at once, and the longest a single article may take
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "4"))
+SCRAPE_TIMEOUT_SECONDS = float(os.getenv("SCRAPE_TIMEOUT_SECONDS", "90"))
+# Start writing once this many articles are scraped (0 waits for all of them)
+SCRAPE_QUORUM = int(os.getenv("SCRAPE_QUORUM", "0"))
+SCRAPE_QUORUM_GRACE_SECONDS = float(os.getenv("SCRAPE_QUORUM_GRACE_SECONDS", "10"))
+# Extract articles with Newspaper4k directly and only ask the scraper agent when
+# the extracted text is shorter than SCRAPE_MIN_CHARS (paywalls, JS-rendered pages)
+SCRAPE_DIRECT_EXTRACTION = os.getenv("SCRAPE_DIRECT_EXTRACTION", "true").lower() == "true"
+SCRAPE_MIN_CHARS = int(os.getenv("SCRAPE_MIN_CHARS", "500"))
+SCRAPE_EXTRACTION_WORKERS = int(os.getenv("SCRAPE_EXTRACTION_WORKERS", "8"))
+
+# Page downloads and Newspaper4k/lxml parsing happen off the event loop
+_extraction_pool = ThreadPoolExecutor(max_workers=SCRAPE_EXTRACTION_WORKERS, thread_name_prefix="article-extract")
+
+# Search results, scraped articles and the post of each run, so a run whose writer
+# failed can be resumed without searching and scraping again
+checkpoints = CheckpointStore(workflow="blog_generator")
+
 
 # --- Response Models ---
 class NewsArticle(BaseModel):
@@ -65,10 +97,22 @@ class ScrapedArticle(BaseModel):
     )
 
 
+@dataclass
+class BlogPhaseEvent(CustomEvent):
+    """Progress of the blog generator, streamed to the client between phases."""
+
+    phase: str = ""
+    message: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)
+    # Only the final text (cached post or error) has content; the workflow appends
+    # every streamed event's content to the run output
+    content: str = ""
+
+
 # --- Agents ---
 research_agent = Agent(
     name="Blog Research Agent",
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
+    model=CachedOpenRouter(id=DEFAULT_MODEL),
     tools=[GoogleSearchTools()],
     description=dedent("""\
     You are BlogResearch-X, an elite research assistant specializing in discovering
@@ -99,7 +143,7 @@ research_agent = Agent(
 
 content_scraper_agent = Agent(
     name="Content Scraper Agent",
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
+    model=ScheduledOpenRouter(id=DEFAULT_MODEL),
     tools=[Newspaper4kTools()] if NEWSPAPER_AVAILABLE else [],
     description=dedent("""\
     You are ContentBot-X, a specialist in extracting and processing digital content
@@ -131,7 +175,7 @@ content_scraper_agent = Agent(
 
 blog_writer_agent = Agent(
     name="Blog Writer Agent",
-    model=OpenRouter(id=os.getenv("OPENROUTER_MODEL_NAME", "deepseek/deepseek-r1")),
+    model=ScheduledOpenRouter(id=DEFAULT_MODEL),
     description=dedent("""\
     You are BlogMaster-X, an elite content creator combining journalistic excellence
     with digital marketing expertise. Your strengths include:
@@ -194,78 +238,61 @@ blog_writer_agent = Agent(
 )
 
 
+# --- Cache ---
+# Search results go stale within hours, finished posts last longer. Scraped articles
+# live in the shared, URL-keyed article store and are reused across topics.
+blog_cache = WorkflowCache(
+    namespace="blog_generator",
+    ttls={"search_results": 6 * 3600, "blog_post": 7 * 86400},
+    max_entries=int(os.getenv("BLOG_CACHE_MAX_ENTRIES", "500")),
+)
+
+# Structured scrapes by the scraper agent, stored per page content in the article store
+AGENT_SCRAPE_KIND = "blog_scraped_article"
+
+# Keys older versions kept in session_state; dropped so the session row stays small
+LEGACY_SESSION_CACHE_KEYS = ("blog_posts", "search_results", "scraped_articles")
+
+
 # --- Helper Functions ---
-def get_cached_blog_post(session_state, topic: str) -> Optional[str]:
-    """Get cached blog post from workflow session state"""
+def get_cached_blog_post(topic: str) -> Optional[str]:
+    """Get cached blog post from the workflow cache"""
     logger.info("Checking if cached blog post exists")
-    return session_state.get("blog_posts", {}).get(topic)
+    return blog_cache.get("blog_post", topic)
 
 
-def cache_blog_post(session_state, topic: str, blog_post: str):
-    """Cache blog post in workflow session state"""
+def cache_blog_post(topic: str, blog_post: str):
+    """Cache blog post in the workflow cache"""
     logger.info(f"Saving blog post for topic: {topic}")
-    if "blog_posts" not in session_state:
-        session_state["blog_posts"] = {}
-    session_state["blog_posts"][topic] = blog_post
+    blog_cache.put("blog_post", topic, blog_post)
 
 
-def get_cached_search_results(session_state, topic: str) -> Optional[SearchResults]:
-    """Get cached search results from workflow session state"""
+def get_cached_search_results(topic: str) -> Optional[SearchResults]:
+    """Get cached search results from the workflow cache"""
     logger.info("Checking if cached search results exist")
-    search_results = session_state.get("search_results", {}).get(topic)
+    search_results = blog_cache.get("search_results", topic)
     if search_results and isinstance(search_results, dict):
         try:
             return SearchResults.model_validate(search_results)
         except Exception as e:
             logger.warning(f"Could not validate cached search results: {e}")
-    return search_results if isinstance(search_results, SearchResults) else None
+    return None
 
 
-def cache_search_results(session_state, topic: str, search_results: SearchResults):
-    """Cache search results in workflow session state"""
+def cache_search_results(topic: str, search_results: SearchResults):
+    """Cache search results in the workflow cache"""
     logger.info(f"Saving search results for topic: {topic}")
-    if "search_results" not in session_state:
-        session_state["search_results"] = {}
-    session_state["search_results"][topic] = search_results.model_dump()
-
-
-def get_cached_scraped_articles(
-    session_state, topic: str
-) -> Optional[Dict[str, ScrapedArticle]]:
-    """Get cached scraped articles from workflow session state"""
-    logger.info("Checking if cached scraped articles exist")
-    scraped_articles = session_state.get("scraped_articles", {}).get(topic)
-    if scraped_articles and isinstance(scraped_articles, dict):
-        try:
-            return {
-                url: ScrapedArticle.model_validate(article)
-                for url, article in scraped_articles.items()
-            }
-        except Exception as e:
-            logger.warning(f"Could not validate cached scraped articles: {e}")
-    return scraped_articles if isinstance(scraped_articles, dict) else None
-
-
-def cache_scraped_articles(
-    session_state, topic: str, scraped_articles: Dict[str, ScrapedArticle]
-):
-    """Cache scraped articles in workflow session state"""
-    logger.info(f"Saving scraped articles for topic: {topic}")
-    if "scraped_articles" not in session_state:
-        session_state["scraped_articles"] = {}
-    session_state["scraped_articles"][topic] = {
-        url: article.model_dump() for url, article in scraped_articles.items()
-    }
+    blog_cache.put("search_results", topic, search_results.model_dump())
 
 
 async def get_search_results(
-    session_state, topic: str, use_cache: bool = True, num_attempts: int = 3
+    topic: str, use_cache: bool = True, num_attempts: int = 3
 ) -> Optional[SearchResults]:
     """Get search results with caching support"""
 
     # Check cache first
     if use_cache:
-        cached_results = get_cached_search_results(session_state, topic)
+        cached_results = get_cached_search_results(topic)
         if cached_results:
             logger.info(f"Found {len(cached_results.articles)} articles in cache.")
             return cached_results
@@ -288,7 +315,7 @@ async def get_search_results(
                 print(f"✅ Found {article_count} relevant articles")
 
                 # Cache the results
-                cache_search_results(session_state, topic, response.content)
+                cache_search_results(topic, response.content)
                 return response.content
             else:
                 logger.warning(
@@ -302,155 +329,339 @@ async def get_search_results(
     return None
 
 
-async def scrape_articles(
-    session_state,
-    topic: str,
-    search_results: SearchResults,
-    use_cache: bool = True,
-) -> Dict[str, ScrapedArticle]:
-    """Scrape articles with caching support"""
+def extract_article(article: NewsArticle, page: Optional[StoredPage] = None) -> Optional[ScrapedArticle]:
+    """Build a ScrapedArticle from the page's Newspaper4k extraction, without a model call
 
-    # Check cache first
-    if use_cache:
-        cached_articles = get_cached_scraped_articles(session_state, topic)
-        if cached_articles:
-            logger.info(f"Found {len(cached_articles)} scraped articles in cache.")
-            return cached_articles
+    Returns None when the page can't be fetched or yields less than SCRAPE_MIN_CHARS of text.
+    """
+    page = page or article_store.fetch(article.url)
+    extracted = article_store.extract(page) if page is not None else None
+    text = ((extracted or {}).get("text") or "").strip()
+    if len(text) < SCRAPE_MIN_CHARS:
+        logger.debug(f"Extracted only {len(text)} characters from {article.url}")
+        return None
+    return ScrapedArticle(
+        title=extracted.get("title") or article.title,
+        url=article.url,
+        summary=article.summary,
+        content=text,
+    )
 
-    scraped_articles: Dict[str, ScrapedArticle] = {}
 
-    print(f"📄 Scraping {len(search_results.articles)} articles...")
+async def scrape_article_with_agent(article: NewsArticle, timeout: float) -> Optional[ScrapedArticle]:
+    """Scrape an article through the content scraper agent"""
+    try:
+        response = await asyncio.wait_for(content_scraper_agent.arun(article.url), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Timed out scraping {article.url} after {timeout:.0f}s")
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to scrape {article.url}: {str(e)}")
+        return None
 
-    for i, article in enumerate(search_results.articles, 1):
+    if response and response.content and isinstance(response.content, ScrapedArticle):
+        return response.content
+    return None
+
+
+async def scrape_article(
+    article: NewsArticle,
+    semaphore: asyncio.Semaphore,
+    use_cache: bool = True,
+    timeout: float = SCRAPE_TIMEOUT_SECONDS,
+) -> Optional[ScrapedArticle]:
+    """Scrape one article, bounded by the shared semaphore and a per-URL timeout
+
+    The page comes from the shared article store (revalidated when stale). Direct extraction
+    is tried first; the scraper agent is the fallback for low-quality extractions, and its
+    result is stored against the page content so it is reused until the page changes.
+    """
+    async with semaphore:
+        print(f"📖 Scraping article: {article.title[:50]}...")
+        loop = asyncio.get_running_loop()
+        max_age = None if use_cache else 0
         try:
+            page = await asyncio.wait_for(
+                loop.run_in_executor(_extraction_pool, article_store.fetch, article.url, max_age), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out fetching {article.url} after {timeout:.0f}s")
+            page = None
+
+        scraped = None
+        if page is not None and SCRAPE_DIRECT_EXTRACTION:
+            scraped = await loop.run_in_executor(_extraction_pool, extract_article, article, page)
+            if scraped is None:
+                logger.info(f"Direct extraction failed for {article.url}, falling back to the scraper agent")
+        if scraped is None and page is not None and use_cache:
+            cached = article_store.get_derived(page.text_hash, AGENT_SCRAPE_KIND)
+            scraped = ScrapedArticle.model_validate(cached) if cached else None
+        if scraped is None:
+            scraped = await scrape_article_with_agent(article, timeout)
+            if scraped is not None and page is not None:
+                article_store.put_derived(page.text_hash, AGENT_SCRAPE_KIND, scraped.model_dump())
+
+    if scraped is not None:
+        logger.info(f"Scraped article: {scraped.url}")
+        print(f"✅ Successfully scraped: {scraped.title[:50]}...")
+        return scraped
+
+    print(f"❌ Failed to scrape: {article.title[:50]}...")
+    return None
+
+
+async def iter_scraped_articles(
+    search_results: SearchResults,
+    use_cache: bool = True,
+    concurrency: int = SCRAPE_CONCURRENCY,
+    quorum: int = SCRAPE_QUORUM,
+) -> AsyncIterator[ScrapedArticle]:
+    """Scrape articles concurrently, yielding each one as soon as it is scraped
+
+    Pages already in the article store (fetched for any topic or agent) are reused. Once
+    `quorum` articles are in (0 waits for all of them), the remaining ones get
+    SCRAPE_QUORUM_GRACE_SECONDS to finish and are then dropped, so the writer can start.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [
+        asyncio.create_task(scrape_article(article, semaphore, use_cache))
+        for article in search_results.articles
+    ]
+    yielded = set()
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            scraped = await next_done
+            if scraped:
+                yielded.add(scraped.url)
+                yield scraped
+            if quorum and len(yielded) >= quorum:
+                break
+
+        stragglers = [task for task in tasks if not task.done()]
+        if stragglers:
             print(
-                f"📖 Scraping article {i}/{len(search_results.articles)}: {article.title[:50]}..."
+                f"📚 {len(yielded)} articles in, giving {len(stragglers)} more articles "
+                f"{SCRAPE_QUORUM_GRACE_SECONDS:.0f}s to finish"
             )
-            response = await content_scraper_agent.arun(article.url)
+            await asyncio.wait(stragglers, timeout=SCRAPE_QUORUM_GRACE_SECONDS)
 
-            if (
-                response
-                and response.content
-                and isinstance(response.content, ScrapedArticle)
-            ):
-                scraped_articles[response.content.url] = response.content
-                logger.info(f"Scraped article: {response.content.url}")
-                print(f"✅ Successfully scraped: {response.content.title[:50]}...")
-            else:
-                print(f"❌ Failed to scrape: {article.title[:50]}...")
+        for task in tasks:
+            if task.done() and not task.cancelled() and task.result() and task.result().url not in yielded:
+                yielded.add(task.result().url)
+                yield task.result()
+    finally:
+        stragglers = [task for task in tasks if not task.done()]
+        for task in stragglers:
+            task.cancel()
+        await asyncio.gather(*stragglers, return_exceptions=True)
 
-        except Exception as e:
-            logger.warning(f"Failed to scrape {article.url}: {str(e)}")
-            print(f"❌ Error scraping: {article.title[:50]}...")
 
-    # Cache the scraped articles
-    cache_scraped_articles(session_state, topic, scraped_articles)
-    return scraped_articles
+async def scrape_articles(
+    topic: str,
+    search_results: SearchResults,
+    use_cache: bool = True,
+    concurrency: int = SCRAPE_CONCURRENCY,
+    quorum: int = SCRAPE_QUORUM,
+) -> Dict[str, ScrapedArticle]:
+    """Scrape articles concurrently with caching support"""
+    print(f"📄 Scraping {len(search_results.articles)} articles for {topic}, {concurrency} at a time...")
+    return {
+        article.url: article
+        async for article in iter_scraped_articles(search_results, use_cache, concurrency, quorum)
+    }
 
 
 # --- Main Execution Function ---
 async def blog_generation_execution(
     session_state,
+    execution_input: WorkflowExecutionInput = None,
     topic: str = None,
     use_search_cache: bool = True,
     use_scrape_cache: bool = True,
     use_blog_cache: bool = True,
-) -> str:
+    scrape_quorum: int = SCRAPE_QUORUM,
+    resume_run_id: Optional[str] = None,
+) -> AsyncIterator[Union[BlogPhaseEvent, RunContentEvent]]:
     """
     Blog post generation workflow execution function.
 
+    Streams a BlogPhaseEvent as each phase starts and finishes (and for every scraped
+    article), then the writer's content events token by token. Phase events carry no
+    content, so the run's final content is just the blog post.
+
     Args:
         session_state: The shared session state
+        execution_input: The workflow input; its message is the topic when `topic` is not given
         topic: Blog post topic (if not provided, uses execution_input.input)
         use_search_cache: Whether to use cached search results
         use_scrape_cache: Whether to use cached scraped articles
         use_blog_cache: Whether to use cached blog posts
+        scrape_quorum: Start writing once this many articles are scraped (0 waits for all)
+        resume_run_id: Continue a failed run (its id is in the "failed" event's data),
+            reusing its search results and scraped articles
     """
 
-    blog_topic = topic
+    # AgentOS passes extra form fields through as strings
+    scrape_quorum = int(scrape_quorum)
+
+    blog_topic = topic or (execution_input.input if execution_input and isinstance(execution_input.input, str) else None)
+    run_id = resume_run_id or str(uuid4())
+
+    for key in LEGACY_SESSION_CACHE_KEYS:
+        session_state.pop(key, None)
+
+    saved_input = checkpoints.load(resume_run_id, "input")
+    if saved_input is not None:
+        blog_topic = saved_input["topic"]
+        print(f"♻️ Resuming run {resume_run_id} after: {', '.join(checkpoints.phases(resume_run_id))}")
 
     if not blog_topic:
-        return "❌ No blog topic provided. Please specify a topic."
+        message = "❌ No blog topic provided. Please specify a topic."
+        yield BlogPhaseEvent(phase="failed", message=message, content=message)
+        return
+
+    if saved_input is None:
+        checkpoints.prune()
+        checkpoints.save(run_id, "input", {"topic": blog_topic})
 
     print(f"🎨 Generating blog post about: {blog_topic}")
     print("=" * 60)
 
     # Check for cached blog post first
     if use_blog_cache:
-        cached_blog = get_cached_blog_post(session_state, blog_topic)
+        cached_blog = checkpoints.load(resume_run_id, "blog_post") or get_cached_blog_post(blog_topic)
         if cached_blog:
             print("📋 Found cached blog post!")
-            return cached_blog
+            yield BlogPhaseEvent(phase="cached", message="Found cached blog post", content=cached_blog)
+            return
 
     # Phase 1: Research and gather sources
     print("\n🔍 PHASE 1: RESEARCH & SOURCE GATHERING")
     print("=" * 50)
+    yield BlogPhaseEvent(phase="research", message=f"Searching for sources about: {blog_topic}")
 
-    search_results = await get_search_results(
-        session_state, blog_topic, use_search_cache
-    )
+    search_results = checkpoints.load(run_id, "search_results", SearchResults)
+    if search_results is None:
+        search_results = await get_search_results(
+            blog_topic, use_search_cache
+        )
+        if search_results:
+            checkpoints.save(run_id, "search_results", search_results)
 
     if not search_results or len(search_results.articles) == 0:
-        return f"❌ Sorry, could not find any articles on the topic: {blog_topic}"
+        message = f"❌ Sorry, could not find any articles on the topic: {blog_topic}"
+        yield BlogPhaseEvent(phase="failed", message=message, content=message)
+        return
 
     print(f"📊 Found {len(search_results.articles)} relevant sources:")
     for i, article in enumerate(search_results.articles, 1):
         print(f"   {i}. {article.title[:60]}...")
+    yield BlogPhaseEvent(
+        phase="research_completed",
+        message=f"Found {len(search_results.articles)} relevant sources",
+        data={"sources": [article.model_dump() for article in search_results.articles]},
+    )
 
     # Phase 2: Content extraction
     print("\n📄 PHASE 2: CONTENT EXTRACTION")
     print("=" * 50)
+    yield BlogPhaseEvent(phase="extraction", message=f"Scraping {len(search_results.articles)} articles")
 
-    scraped_articles = await scrape_articles(
-        session_state, blog_topic, search_results, use_scrape_cache
+    scraped_articles: Dict[str, ScrapedArticle] = {
+        url: ScrapedArticle.model_validate(article)
+        for url, article in (checkpoints.load(run_id, "scraped_articles") or {}).items()
+    }
+    remaining = SearchResults(
+        articles=[article for article in search_results.articles if article.url not in scraped_articles]
     )
+    if scraped_articles:
+        print(f"♻️ Reusing {len(scraped_articles)} articles scraped by the previous attempt")
+    if remaining.articles and not (scrape_quorum and len(scraped_articles) >= scrape_quorum):
+        quorum = max(scrape_quorum - len(scraped_articles), 1) if scrape_quorum else 0
+        async for scraped in iter_scraped_articles(remaining, use_scrape_cache, quorum=quorum):
+            scraped_articles[scraped.url] = scraped
+            checkpoints.save(
+                run_id, "scraped_articles", {url: article.model_dump() for url, article in scraped_articles.items()}
+            )
+            yield BlogPhaseEvent(
+                phase="article_scraped",
+                message=f"Scraped {scraped.title}",
+                data={"url": scraped.url, "title": scraped.title, "scraped": len(scraped_articles)},
+            )
 
     if not scraped_articles:
-        return f"❌ Could not extract content from any articles for topic: {blog_topic}"
+        message = f"❌ Could not extract content from any articles for topic: {blog_topic}"
+        yield BlogPhaseEvent(phase="failed", message=message, data={"resume_run_id": run_id}, content=message)
+        return
 
     print(f"📖 Successfully extracted content from {len(scraped_articles)} articles")
 
     # Phase 3: Blog post writing
     print("\n✍️ PHASE 3: BLOG POST CREATION")
     print("=" * 50)
+    yield BlogPhaseEvent(phase="writing", message=f"Writing the post from {len(scraped_articles)} articles")
 
-    # Prepare input for the writer
-    writer_input = {
-        "topic": blog_topic,
-        "articles": [article.model_dump() for article in scraped_articles.values()],
-    }
+    # Prepare input for the writer: only the relevant, non-repeated paragraphs of each
+    # article, within WRITER_SOURCE_TOKEN_BUDGET, as compact JSON
+    articles = [article.model_dump() for article in scraped_articles.values()]
+    writer_input = {"topic": blog_topic, "articles": compact_sources(articles, blog_topic)}
+    writer_prompt = compact_json(writer_input)
+    log_prompt_size("Blog writer", writer_prompt, before=estimate_tokens(json.dumps(articles, indent=2)))
 
     print("🤖 AI is crafting your blog post...")
-    writer_response = await blog_writer_agent.arun(json.dumps(writer_input, indent=2))
-
-    if not writer_response or not writer_response.content:
-        return f"❌ Failed to generate blog post for topic: {blog_topic}"
-
-    blog_post = writer_response.content
+    blog_post = ""
+    error = None
+    try:
+        async for event in blog_writer_agent.arun(writer_prompt, stream=True):
+            if event.event == RunEvent.run_content and isinstance(event.content, str):
+                blog_post += event.content
+                yield event
+    except Exception as e:
+        logger.error(f"Blog writer failed for {blog_topic}: {e}")
+        error = e
+
+    if error is not None or not blog_post:
+        message = (
+            f"❌ Failed to generate blog post for topic: {blog_topic}\n\n"
+            f"♻️ Sources were saved. Retry with resume_run_id={run_id} to write without searching again."
+        )
+        yield BlogPhaseEvent(phase="failed", message=message, data={"resume_run_id": run_id}, content=message)
+        return
 
     # Cache the blog post
-    cache_blog_post(session_state, blog_topic, blog_post)
+    cache_blog_post(blog_topic, blog_post)
+    checkpoints.save(run_id, "blog_post", blog_post)
 
     print("✅ Blog post generated successfully!")
     print(f"📝 Length: {len(blog_post)} characters")
     print(f"📚 Sources: {len(scraped_articles)} articles")
-
-    return blog_post
+    logger.info(f"Blog cache stats: {blog_cache.stats()}")
+    logger.info(f"Article store stats: {article_store.stats()}")
+    yield BlogPhaseEvent(
+        phase="completed",
+        message="Blog post generated",
+        data={"characters": len(blog_post), "sources": len(scraped_articles)},
+    )
 
 
 # --- Workflow Definition ---
 blog_generator_workflow = Workflow(
     name="Blog Post Generator",
     description="Advanced blog post generator with research and content creation capabilities",
-    db=SqliteDb(
-        session_table="workflow_session",
-        db_file="tmp/blog_generator.db",
-    ),
+    db=db,
     steps=blog_generation_execution,
-    session_state={},  # Initialize empty session state for caching
+    session_state={},
 )
 
 
+async def resume_blog_generation(run_id: str, **kwargs: Any):
+    """Re-run a failed blog generation, reusing the sources it already found and scraped"""
+    saved_input = checkpoints.load(run_id, "input")
+    if saved_input is None:
+        raise ValueError(f"No checkpoints found for blog generation run {run_id}")
+    return await blog_generator_workflow.arun(input=saved_input["topic"], resume_run_id=run_id, **kwargs)
+
+
 if __name__ == "__main__":
     import random
 
@@ -0,0 +1,108 @@
+"""
+Dependency-driven step layout for workflows.
+
+agno runs `Workflow.steps` strictly in order and hands each step the output
+of the one before it. `dag_steps` takes the same Steps plus the names each
+one depends on and groups steps whose dependencies are all satisfied into
+`Parallel` blocks (run with `asyncio.gather` under `Workflow.arun`, a thread
+pool under `Workflow.run`). Whenever a step needs more than the output of
+the single step right before it - the branches of a parallel block, or an
+earlier step - a merge step in front of it combines the outputs of exactly
+the steps it depends on. A parallel block that ends the workflow is merged
+too, so the run's output has every branch.
+"""
+
+from typing import Dict, List, Optional, Sequence, Union
+
+from agno.workflow.parallel import Parallel
+from agno.workflow.step import Step
+from agno.workflow.types import StepInput, StepOutput
+
+
+def find_step_output(step_input: StepInput, step_name: str) -> Optional[StepOutput]:
+    """Output of an earlier step by name, including the branches of parallel blocks."""
+    output = step_input.get_step_output(step_name)
+    if output is not None:
+        return output
+    for block in (step_input.previous_step_outputs or {}).values():
+        for branch in block.steps or []:
+            if branch.step_name == step_name:
+                return branch
+    return None
+
+
+def merge_outputs(step_names: Sequence[str]):
+    """Step executor combining the outputs of earlier steps into one message."""
+
+    def merge(step_input: StepInput) -> StepOutput:
+        outputs = {name: find_step_output(step_input, name) for name in step_names}
+        if not any(outputs.values()):
+            return StepOutput(content=step_input.previous_step_content)
+
+        sections = [
+            f"## {name}\n\n{(output.content if output else None) or '*(no output)*'}" for name, output in outputs.items()
+        ]
+        found = [output for output in outputs.values() if output is not None]
+        # agno already hands every earlier step's images, videos and audio to later steps
+        return StepOutput(
+            content="\n\n".join(sections),
+            success=all(output.success for output in found),
+        )
+
+    return merge
+
+
+def dag_steps(
+    steps: Sequence[Step],
+    depends_on: Dict[str, Sequence[str]],
+    names: Optional[Dict[str, str]] = None,
+) -> List[Union[Step, Parallel]]:
+    """Steps ordered by their dependencies, with independent steps grouped to run concurrently.
+
+    Args:
+        steps: The workflow steps, each with a unique name.
+        depends_on: Step name -> names of the steps it needs. Steps missing here have no dependencies.
+        names: Optional names for parallel blocks, keyed by any step in the block.
+    """
+    by_name = {step.name: step for step in steps}
+    if len(by_name) != len(steps) or None in by_name:
+        raise ValueError("dag_steps needs steps with unique names")
+    for name, requirements in depends_on.items():
+        unknown = [dep for dep in [name, *requirements] if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown step(s) in dependencies: {', '.join(unknown)}")
+
+    def merge_step(name: str, inputs: List[str]) -> Step:
+        return Step(name=name, description=f"Combine the outputs of {', '.join(inputs)}", executor=merge_outputs(inputs))
+
+    layout: List[Union[Step, Parallel]] = []
+    done: set = set()
+    previous: List[str] = []  # the steps whose outputs the next step receives
+    remaining = [step.name for step in steps]
+    while remaining:
+        ready = [name for name in remaining if set(depends_on.get(name, ())) <= done]
+        if not ready:
+            raise ValueError(f"Dependency cycle between steps: {', '.join(remaining)}")
+
+        block_name = ready[0]
+        if len(ready) > 1:
+            block_name = next((names[name] for name in ready if names and name in names), " + ".join(ready))
+
+        # Steps of one parallel block share their input, so it covers all their dependencies
+        required = {dep for name in ready for dep in depends_on.get(name, ())}
+        if required and (len(previous) > 1 or required != set(previous)):
+            inputs = [step.name for step in steps if step.name in required]
+            layout.append(merge_step(f"{block_name}_inputs", inputs))
+
+        if len(ready) == 1:
+            layout.append(by_name[ready[0]])
+        else:
+            layout.append(Parallel(*[by_name[name] for name in ready], name=block_name))
+        done.update(ready)
+        previous = ready
+        remaining = [name for name in remaining if name not in done]
+
+    if len(previous) > 1:
+        layout.append(merge_step(f"{block_name}_merge", previous))
+
+    return layout
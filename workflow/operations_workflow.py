@@ -1,6 +1,8 @@
 from agno.workflow.workflow import Workflow
 from agno.workflow.step import Step
 
+from workflow.dag import dag_steps
+
 # Import shared config
 from config.database import db
 
@@ -17,36 +19,48 @@ operations_workflow = Workflow(
     name="ETUGRAND Operations Workflow",
     description="End-to-end business operations and content management workflow",
     db=db,
-    steps=[
-        Step(
-            name="research_topic",
-            description="Research trending topics and audience interests",
-            agent=engagement_agent,
-        ),
-        Step(
-            name="create_text_content",
-            description="Create engaging text content, captions, and scripts",
-            agent=content_agent,
-        ),
-        Step(
-            name="generate_images",
-            description="Generate images for the content using AI",
-            agent=image_agent,
-        ),
-        Step(
-            name="generate_videos",
-            description="Generate videos for the content using AI",
-            agent=video_agent,
-        ),
-        Step(
-            name="generate_audio",
-            description="Generate audio for the content using TTS",
-            agent=audio_agent,
-        ),
-        Step(
-            name="publish_content",
-            description="Publish the created content to social media platforms",
-            agent=publisher_scheduler_agent,
-        ),
-    ],
-)
\ No newline at end of file
+    # Images, videos and audio only need the text content, so they run concurrently;
+    # the publisher gets the text content and every media output
+    steps=dag_steps(
+        [
+            Step(
+                name="research_topic",
+                description="Research trending topics and audience interests",
+                agent=engagement_agent,
+            ),
+            Step(
+                name="create_text_content",
+                description="Create engaging text content, captions, and scripts",
+                agent=content_agent,
+            ),
+            Step(
+                name="generate_images",
+                description="Generate images for the content using AI",
+                agent=image_agent,
+            ),
+            Step(
+                name="generate_videos",
+                description="Generate videos for the content using AI",
+                agent=video_agent,
+            ),
+            Step(
+                name="generate_audio",
+                description="Generate audio for the content using TTS",
+                agent=audio_agent,
+            ),
+            Step(
+                name="publish_content",
+                description="Publish the created content to social media platforms",
+                agent=publisher_scheduler_agent,
+            ),
+        ],
+        depends_on={
+            "create_text_content": ["research_topic"],
+            "generate_images": ["create_text_content"],
+            "generate_videos": ["create_text_content"],
+            "generate_audio": ["create_text_content"],
+            "publish_content": ["create_text_content", "generate_images", "generate_videos", "generate_audio"],
+        },
+        names={"generate_images": "generate_media"},
+    ),
+)
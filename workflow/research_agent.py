@@ -25,9 +25,11 @@ Dependencies: `pip install openai ddgs newspaper4k lxml_html_clean agno`
 from textwrap import dedent
 
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
 from agno.tools.duckduckgo import DuckDuckGoTools
 
+from config.model_scheduler import ScheduledOpenRouter
+from config.models import REASONING_MODEL
+
 # Optional Newspaper4k tools - skip if not installed
 try:
     from agno.tools.newspaper4k import Newspaper4kTools
@@ -38,7 +40,7 @@ except ImportError:
 
 # Initialize the research agent with advanced journalistic capabilities
 research_agent = Agent(
-    model=OpenRouter("deepseek/deepseek-r1"),
+    model=ScheduledOpenRouter(REASONING_MODEL),
     tools=[DuckDuckGoTools()] + ([Newspaper4kTools()] if NEWSPAPER_AVAILABLE else []),
     description=dedent("""\
         You are an elite investigative journalist with decades of experience at the New York Times.
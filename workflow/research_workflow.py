@@ -1,7 +1,6 @@
 from typing import List
 
 from agno.agent.agent import Agent
-from agno.db.postgres import PostgresDb
 from agno.models.anthropic import Claude
 from agno.team.team import Team
 from agno.tools.firecrawl import FirecrawlTools
@@ -10,10 +9,8 @@ from agno.workflow.step import Step
 from agno.workflow.workflow import Workflow
 from pydantic import BaseModel, Field
 
-# ************* Database Setup *************
-db_url = "postgresql+psycopg://ai:ai@localhost:5532/ai"
-db = PostgresDb(db_url, id="agno_assist_db")
-# *******************************
+# Shared storage: Postgres when DATABASE_URL is set, the AgentOS SQLite file otherwise
+from config.database import db
 
 
 # ************* Input Schema *************